@@ -0,0 +1,226 @@
+"""Benchmark every conversion path on a synthetic corpus.
+
+Usage::
+
+    python -m benchmarks.bench_conversions --size medium --json bench.json
+    python -m benchmarks.bench_conversions --size medium --baseline bench.json --tolerance 20
+    python -m benchmarks.bench_conversions --cases csv2xlsx csv2xlsx-stream --rows 500000
+
+Inputs come from ``benchmarks.corpus`` (kept in ``--corpus`` to reuse them
+between runs). Each run converts in a fresh process, so the report gives
+latency (min/median/max), throughput in pages or rows per second and MB/s,
+and the peak RSS of that process. With ``--baseline`` the run fails if a case
+got slower, or needed more memory, than the baseline by more than
+``--tolerance`` percent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+# case -> (converter function, corpus kind, output extension, options, throughput unit)
+CASES = {
+    "pdf2word": ("pdf_to_word", "pdf", ".docx", {}, "pages"),
+    "pdf2word-text": ("pdf_to_word", "pdf", ".docx", {"text_only": True}, "pages"),
+    "word2pdf": ("word_to_pdf", "docx", ".pdf", {}, "files"),
+    "xlsx2csv": ("xlsx_to_csv", "xlsx", ".csv", {}, "rows"),
+    "xlsx2csv-stream": ("xlsx_to_csv", "xlsx", ".csv", {"streaming": True}, "rows"),
+    "xlsx2csv-openpyxl": ("xlsx_to_csv", "xlsx", ".csv", {"engine": "openpyxl"}, "rows"),
+    "csv2xlsx": ("csv_to_xlsx", "csv", ".xlsx", {}, "rows"),
+    "csv2xlsx-stream": ("csv_to_xlsx", "csv", ".xlsx", {"streaming": True}, "rows"),
+    "csv2xlsx-pyarrow": ("csv_to_xlsx", "csv", ".xlsx", {"engine": "pyarrow"}, "rows"),
+    "csv2xlsx-schema": ("csv_to_xlsx", "csv", ".xlsx", {"infer_schema": True}, "rows"),
+}
+
+# backends imported before the clock starts, so latency is conversion work only
+BACKENDS = {
+    "pdf_to_word": ["pdf2docx", "pdfplumber", "docx"],
+    "word_to_pdf": ["docx2pdf"],
+    "xlsx_to_csv": ["pandas", "openpyxl"],
+    "csv_to_xlsx": ["pandas", "openpyxl"],
+}
+
+SIZES = {
+    "small": {"pages": 5, "paragraphs": 50, "rows": 5_000, "cols": 8},
+    "medium": {"pages": 20, "paragraphs": 200, "rows": 50_000, "cols": 10},
+    "large": {"pages": 100, "paragraphs": 1_000, "rows": 500_000, "cols": 12},
+}
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_case(conn: Any, func_name: str, input_file: str, output_file: str, options: dict) -> None:
+    """Child process: convert once and send back ``(seconds, peak RSS MB)`` or an error."""
+    logging.disable(logging.CRITICAL)
+    try:
+        for name in BACKENDS.get(func_name, []):
+            importlib.import_module(name)
+        from docify import converters
+
+        func = getattr(converters, func_name)
+        t0 = time.perf_counter()
+        func(input_file, output_file, **options)
+        conn.send((time.perf_counter() - t0, peak_rss_mb()))
+    except Exception as exc:
+        conn.send(f"{exc.__class__.__name__}: {exc}")
+    finally:
+        conn.close()
+
+
+def run_once(func_name: str, input_file: str, output_file: str, options: dict) -> tuple[float, float | None]:
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_case, args=(child_conn, func_name, input_file, output_file, options))
+    proc.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = f"process exited with code {proc.exitcode}"
+    proc.join()
+    if isinstance(result, str):
+        raise RuntimeError(result)
+    return result
+
+
+def measure(cases: list[str], corpus: dict[str, str], sizes: dict[str, int], repeat: int, tmp: str) -> dict[str, dict]:
+    units = {"pages": sizes["pages"], "rows": sizes["rows"], "files": 1}
+    results = {}
+    for case in cases:
+        func_name, kind, ext, options, unit = CASES[case]
+        input_file = corpus[kind]
+        output_file = os.path.join(tmp, f"{case}{ext}")
+        try:
+            samples = [run_once(func_name, input_file, output_file, options) for _ in range(repeat)]
+        except RuntimeError as exc:
+            results[case] = {"error": str(exc)}
+            continue
+        latencies = [s[0] for s in samples]
+        rss = [s[1] for s in samples if s[1] is not None]
+        median = statistics.median(latencies)
+        input_mb = os.path.getsize(input_file) / 1e6
+        results[case] = {
+            "runs": repeat,
+            "latency_s": {
+                "min": round(min(latencies), 4),
+                "median": round(median, 4),
+                "max": round(max(latencies), 4),
+            },
+            "throughput": round(units[unit] / median, 2),
+            "unit": f"{unit}/s",
+            "mb_per_s": round(input_mb / median, 3),
+            "input_mb": round(input_mb, 3),
+            "output_mb": round(os.path.getsize(output_file) / 1e6, 3) if os.path.exists(output_file) else None,
+            "peak_rss_mb": max(rss) if rss else None,
+        }
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Return a line per case that got slower or hungrier than ``baseline`` beyond ``tolerance`` %."""
+    failures = []
+    factor = 1 + tolerance / 100
+    for case, r in results.items():
+        base = baseline.get(case)
+        if not base or "error" in base:
+            continue
+        if "error" in r:
+            failures.append(f"{case}: failed ({r['error']})")
+            continue
+        limit = base["latency_s"]["median"] * factor
+        if r["latency_s"]["median"] > limit:
+            failures.append(f"{case}: median {r['latency_s']['median']:.3f}s > {limit:.3f}s")
+        if r["peak_rss_mb"] and base.get("peak_rss_mb"):
+            limit = base["peak_rss_mb"] * factor
+            if r["peak_rss_mb"] > limit:
+                failures.append(f"{case}: peak RSS {r['peak_rss_mb']} MB > {limit:.1f} MB")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--pages", type=int, help="Override the corpus PDF page count")
+    parser.add_argument("--paragraphs", type=int, help="Override the corpus DOCX paragraph count")
+    parser.add_argument("--rows", type=int, help="Override the corpus CSV/XLSX row count")
+    parser.add_argument("--cols", type=int, help="Override the corpus CSV/XLSX column count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", help="Folder to keep (and reuse) generated inputs in")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --json")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed slowdown / memory growth in percent")
+    args = parser.parse_args()
+
+    from benchmarks.corpus import build_corpus
+
+    sizes = dict(SIZES[args.size])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = build_corpus(args.corpus or os.path.join(tmp, "corpus"), **sizes)
+        results = measure(args.cases, corpus, sizes, max(1, args.repeat), tmp)
+
+    print(f"{'case':>16} {'median s':>9} {'min s':>8} {'throughput':>18} {'MB/s':>8} {'peak MB':>8}")
+    for case, r in results.items():
+        if "error" in r:
+            print(f"{case:>16}  skipped: {r['error']}")
+            continue
+        throughput = f"{r['throughput']:,.1f} {r['unit']}"
+        print(
+            f"{case:>16} {r['latency_s']['median']:>9.3f} {r['latency_s']['min']:>8.3f} "
+            f"{throughput:>18} {r['mb_per_s']:>8.2f} {r['peak_rss_mb'] or 0:>8.1f}"
+        )
+
+    if args.json:
+        report = {
+            "meta": {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "sizes": sizes,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["sizes"] != sizes:
+            print(f"\nWarning: baseline corpus sizes differ: {baseline['meta']['sizes']}")
+        failures = compare(results, baseline["results"], args.tolerance)
+        if failures:
+            print("\nConversion regressions:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("\nNo conversion regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark parallel page-range PDF -> Word conversion against page count.
+
+Usage::
+
+    python -m benchmarks.bench_pdf_to_word --pages 50 200 500 --workers 1 2 4
+
+Synthetic text PDFs are generated in a temporary folder, so no sample files
+are required.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import make_pdf
+from docify import converters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workers_list = sorted(set(args.workers))
+    print(f"{'pages':>6} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf = os.path.join(tmp, f"bench_{pages}.pdf")
+            make_pdf(pdf, pages, tables=False, images=False)
+            baseline = None
+            for workers in workers_list:
+                out = os.path.join(tmp, f"bench_{pages}_{workers}.docx")
+                t0 = time.perf_counter()
+                converters.pdf_to_word(pdf, out, workers=workers)
+                elapsed = time.perf_counter() - t0
+                baseline = baseline or elapsed
+                print(f"{pages:>6} {workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
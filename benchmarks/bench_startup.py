@@ -0,0 +1,116 @@
+"""Benchmark CLI startup time per subcommand.
+
+Usage::
+
+    python -m benchmarks.bench_startup [--runs 5] [--json startup.json]
+    python -m benchmarks.bench_startup --baseline startup.json --tolerance 25
+
+Each subcommand is started with ``--help`` in a fresh interpreter. The report lists the best wall-clock time, the cumulative
+import time of ``docify.cli`` (from ``python -X importtime``) and any heavy
+conversion backend that was imported even though nothing was converted.
+With ``--baseline`` the run fails if a subcommand got slower than the
+baseline by more than ``--tolerance`` percent, or started loading a backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+COMMANDS = ["--help", "word2pdf", "pdf2word", "xlsx2csv", "csv2xlsx", "cache"]
+
+# Modules that only the converters themselves should import.
+HEAVY_MODULES = ["pandas", "numpy", "pdf2docx", "fitz", "pymupdf", "pdfplumber", "docx", "docx2pdf", "openpyxl"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def command_argv(command: str) -> list[str]:
+    args = [command] if command == "--help" else [command, "--help"]
+    # import docify.cli (rather than running it with -m) so it shows up in -X importtime
+    code = f"import sys; sys.argv = ['docify'] + {args!r}; from docify.cli import main; main()"
+    return [sys.executable, "-X", "importtime", "-c", code]
+
+
+def run_once(command: str) -> tuple[float, int, list[str]]:
+    """Return (wall seconds, docify.cli cumulative import µs, heavy modules imported)."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        command_argv(command), cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - t0
+    cli_us = 0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        # "import time:      self [us] |   cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        name = parts[2].strip()
+        if name == "docify.cli":
+            cli_us = int(parts[1])
+        top = name.split(".")[0]
+        if top in HEAVY_MODULES:
+            loaded.add(top)
+    return elapsed, cli_us, sorted(loaded)
+
+
+def measure(runs: int) -> dict[str, dict]:
+    results = {}
+    for command in COMMANDS:
+        samples = [run_once(command) for _ in range(runs)]
+        results[command] = {
+            "wall_ms": round(min(s[0] for s in samples) * 1000, 1),
+            "import_ms": round(min(s[1] for s in samples) / 1000, 1),
+            "heavy_modules": samples[0][2],
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --json")
+    parser.add_argument("--tolerance", type=float, default=25.0, help="Allowed slowdown in percent")
+    args = parser.parse_args()
+
+    results = measure(max(1, args.runs))
+    print(f"{'command':>10} {'wall ms':>9} {'import ms':>10}  heavy modules")
+    for command, r in results.items():
+        print(f"{command:>10} {r['wall_ms']:>9.1f} {r['import_ms']:>10.1f}  {', '.join(r['heavy_modules']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = []
+        for command, r in results.items():
+            base = baseline.get(command)
+            if not base:
+                continue
+            limit = base["import_ms"] * (1 + args.tolerance / 100)
+            if r["import_ms"] > limit:
+                failures.append(f"{command}: import {r['import_ms']} ms > {limit:.1f} ms")
+            new_modules = set(r["heavy_modules"]) - set(base["heavy_modules"])
+            if new_modules:
+                failures.append(f"{command}: now imports {', '.join(sorted(new_modules))}")
+        if failures:
+            print("\nStartup regressions:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("\nNo startup regressions.")
+
+
+if __name__ == "__main__":
+    main()
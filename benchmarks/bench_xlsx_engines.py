@@ -0,0 +1,57 @@
+"""Benchmark the XLSX reader engines of xlsx_to_csv against workbook size.
+
+Usage::
+
+    python -m benchmarks.bench_xlsx_engines --rows 10000 100000 500000 --cols 12
+
+Synthetic workbooks are generated in a temporary folder. Each engine that is
+available converts every workbook; the report gives seconds, speedup over
+openpyxl and whether the CSV is byte-identical to openpyxl's.
+"""
+
+import argparse
+import filecmp
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import make_xlsx
+from docify import converters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    engines = ["openpyxl"]
+    if converters._calamine_available():
+        engines.append("calamine")
+    else:
+        print("python-calamine is not installed; timing openpyxl only\n")
+    print(f"{'rows':>8} {'MB':>7} {'engine':>9} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            xlsx = os.path.join(tmp, f"bench_{rows}.xlsx")
+            make_xlsx(xlsx, rows, args.cols)
+            size_mb = os.path.getsize(xlsx) / 1e6
+            baseline = reference = None
+            for engine in engines:
+                out = os.path.join(tmp, f"bench_{rows}_{engine}.csv")
+                t0 = time.perf_counter()
+                converters.xlsx_to_csv(xlsx, out, engine=engine)
+                elapsed = time.perf_counter() - t0
+                baseline = baseline or elapsed
+                reference = reference or out
+                identical = filecmp.cmp(reference, out, shallow=False)
+                print(
+                    f"{rows:>8} {size_mb:>7.1f} {engine:>9} {elapsed:>9.2f} "
+                    f"{baseline / elapsed:>7.2f}x {'yes' if identical else 'NO':>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
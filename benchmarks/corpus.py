@@ -0,0 +1,206 @@
+"""Generate a synthetic document corpus for the benchmarks.
+
+Usage::
+
+    python -m benchmarks.corpus out/ --pages 50 --rows 100000 --cols 12
+
+Everything is built locally and deterministically (seeded), so runs on
+different machines convert the same documents: PDFs with text, ruled tables
+and images, DOCX files, and CSV/XLSX tables of ``rows`` x ``cols`` cells.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import io
+import os
+import random
+from typing import Any, Iterator
+
+import fitz
+
+SEED = 1040
+
+WORDS = (
+    "agreement party term notice payment invoice schedule delivery service "
+    "period clause annex total amount balance report quarter region account"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _image(width: int, height: int, colour: tuple[int, int, int]) -> Any:
+    """Return an RGB pixmap with horizontal bars in ``colour`` (a tiny synthetic chart)."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.clear_with(255)
+    bars = 6
+    bar_height = height // (bars * 2)
+    for i in range(bars):
+        length = width * (i + 2) // (bars + 2)
+        top = (2 * i + 1) * bar_height
+        pix.set_rect(fitz.IRect(0, top, length, top + bar_height), colour)
+    return pix
+
+
+def make_pdf(
+    path: str,
+    pages: int,
+    lines_per_page: int = 40,
+    tables: bool = True,
+    images: bool = True,
+) -> None:
+    """Write a PDF with ``pages`` pages of text, plus a ruled table and images on every page.
+
+    Each page repeats the same logo (as real reports do) and carries its own chart.
+    """
+    rng = random.Random(SEED)
+    logo = _image(120, 40, (30, 90, 160))
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        if images:
+            page.insert_image(fitz.Rect(430, 30, 550, 70), pixmap=logo)
+        page.insert_text((72, 60), f"Page {page_no + 1}", fontsize=18)
+        y = 90
+        lines = lines_per_page // 2 if tables or images else lines_per_page
+        for line_no in range(lines):
+            page.insert_text(
+                (72, y),
+                f"Clause {page_no + 1}.{line_no + 1}: {_sentence(rng, 9)}",
+                fontsize=10,
+            )
+            y += 17
+        if tables:
+            y = _draw_table(page, rng, top=y + 10, rows=6, cols=4)
+        if images:
+            colour = (rng.randrange(40, 220), rng.randrange(40, 220), rng.randrange(40, 220))
+            page.insert_image(fitz.Rect(72, y + 15, 272, y + 115), pixmap=_image(200, 100, colour))
+    doc.save(path)
+    doc.close()
+
+
+def _draw_table(page: Any, rng: random.Random, top: float, rows: int, cols: int) -> float:
+    """Draw a ruled ``rows`` x ``cols`` table starting at ``top``; return its bottom edge."""
+    left, width, row_height = 72.0, 450.0, 18.0
+    col_width = width / cols
+    bottom = top + rows * row_height
+    for r in range(rows + 1):
+        page.draw_line((left, top + r * row_height), (left + width, top + r * row_height))
+    for c in range(cols + 1):
+        page.draw_line((left + c * col_width, top), (left + c * col_width, bottom))
+    for r in range(rows):
+        for c in range(cols):
+            text = f"Item {c + 1}" if r == 0 else f"{rng.randrange(100, 99999):,}"
+            page.insert_text((left + c * col_width + 4, top + r * row_height + 13), text, fontsize=9)
+    return bottom
+
+
+def make_docx(path: str, paragraphs: int, table_every: int = 20, images: bool = True) -> None:
+    """Write a DOCX with ``paragraphs`` paragraphs, a table (and an image) every ``table_every``."""
+    from docx import Document
+    from docx.shared import Inches
+
+    rng = random.Random(SEED)
+    doc = Document()
+    doc.add_heading("Synthetic report", level=1)
+    for i in range(paragraphs):
+        doc.add_paragraph(_sentence(rng, 30))
+        if table_every and (i + 1) % table_every == 0:
+            table = doc.add_table(rows=5, cols=4)
+            table.style = "Table Grid"
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"Item {c + 1}" if r == 0 else f"{rng.randrange(100, 99999):,}"
+            if images:
+                colour = (rng.randrange(40, 220), rng.randrange(40, 220), rng.randrange(40, 220))
+                png = io.BytesIO(_image(200, 100, colour).tobytes("png"))
+                doc.add_picture(png, width=Inches(2.5))
+    doc.save(path)
+
+
+def iter_rows(rows: int, cols: int) -> Iterator[list[Any]]:
+    """Yield a header and ``rows`` rows cycling through int, float, text, date and category columns."""
+    rng = random.Random(SEED)
+    kinds = ["int", "float", "text", "date", "category"]
+    yield [f"{kinds[c % len(kinds)]}_{c}" for c in range(cols)]
+    start = datetime.date(2020, 1, 1)
+    regions = ["north", "south", "east", "west"]
+    for _ in range(rows):
+        row: list[Any] = []
+        for c in range(cols):
+            kind = kinds[c % len(kinds)]
+            if kind == "int":
+                row.append(rng.randrange(1_000_000))
+            elif kind == "float":
+                row.append(round(rng.uniform(-1000, 1000), 4))
+            elif kind == "text":
+                row.append(_sentence(rng, 4))
+            elif kind == "date":
+                row.append((start + datetime.timedelta(days=rng.randrange(2000))).isoformat())
+            else:
+                row.append(rng.choice(regions))
+        yield row
+
+
+def make_csv(path: str, rows: int, cols: int) -> None:
+    """Write a CSV with a header and ``rows`` x ``cols`` cells."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(iter_rows(rows, cols))
+
+
+def make_xlsx(path: str, rows: int, cols: int, sheets: int = 1) -> None:
+    """Write an XLSX with ``sheets`` sheets of ``rows`` x ``cols`` cells (streamed, write-only)."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for sheet_no in range(sheets):
+        ws = wb.create_sheet(f"Sheet{sheet_no + 1}")
+        for row in iter_rows(rows, cols):
+            ws.append(row)
+    wb.save(path)
+
+
+def build_corpus(
+    folder: str,
+    pages: int = 20,
+    paragraphs: int = 200,
+    rows: int = 20_000,
+    cols: int = 10,
+) -> dict[str, str]:
+    """Generate one file of each kind in ``folder`` (reused if present); return kind -> path."""
+    os.makedirs(folder, exist_ok=True)
+    builders = {
+        "pdf": (f"corpus_{pages}p.pdf", lambda p: make_pdf(p, pages)),
+        "docx": (f"corpus_{paragraphs}para.docx", lambda p: make_docx(p, paragraphs)),
+        "csv": (f"corpus_{rows}x{cols}.csv", lambda p: make_csv(p, rows, cols)),
+        "xlsx": (f"corpus_{rows}x{cols}.xlsx", lambda p: make_xlsx(p, rows, cols)),
+    }
+    paths = {}
+    for kind, (name, build) in builders.items():
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            build(path)
+        paths[kind] = path
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args()
+
+    paths = build_corpus(args.folder, args.pages, args.paragraphs, args.rows, args.cols)
+    for kind, path in paths.items():
+        print(f"{kind:>5} {os.path.getsize(path) / 1e6:>8.2f} MB  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.connection
+import time
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from . import converters
+
+
+def _resolve(conversion: str | Callable[..., Any]) -> str:
+    """Return the converters function name for a command, function name or function."""
+    if callable(conversion):
+        conversion = conversion.__name__
+    if conversion in converters.CONVERSIONS:
+        return converters.CONVERSIONS[conversion][0]
+    if any(conversion == name for name, _, _ in converters.CONVERSIONS.values()):
+        return conversion
+    raise ValueError(f"Unknown conversion: {conversion}")
+
+
+def _child(conn: Any, func_name: str, input_file: str, output_file: str, options: dict[str, Any]) -> None:
+    """Run one conversion in a child process and send ``(ok, result or error)`` back."""
+    try:
+        result = getattr(converters, func_name)(input_file, output_file, **options)
+        conn.send((True, result))
+    except BaseException as exc:
+        try:
+            conn.send((False, exc))
+        except Exception:
+            # the exception itself could not be pickled
+            conn.send((False, RuntimeError(str(exc))))
+    finally:
+        conn.close()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+async def _wait_ready(handles: list[Any], timeout: float | None = None) -> bool:
+    """Wait until a connection or process sentinel in ``handles`` is ready; False if ``timeout`` passes first.
+
+    The loop watches the handles itself, so no executor thread is held while
+    a conversion runs (the host's default executor is left alone).
+    """
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+    watched = []
+    try:
+        try:
+            for handle in handles:
+                fd = handle if isinstance(handle, int) else handle.fileno()
+                loop.add_reader(fd, _wake, waiter)
+                watched.append(fd)
+        except NotImplementedError:
+            # e.g. the proactor loop on Windows, which cannot watch pipes: poll them instead
+            deadline = None if timeout is None else loop.time() + timeout
+            while not multiprocessing.connection.wait(handles, 0):
+                if deadline is not None and loop.time() >= deadline:
+                    return False
+                await asyncio.sleep(0.05)
+            return True
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+    finally:
+        for fd in watched:
+            loop.remove_reader(fd)
+
+
+async def _join(proc: Any, timeout: float | None = None) -> bool:
+    """Reap a conversion process once it exits; False if it is still running after ``timeout``."""
+    if not await _wait_ready([proc.sentinel], timeout):
+        return False
+    proc.join()
+    return True
+
+
+async def _stop(proc: Any, grace: float = 2.0) -> None:
+    """Terminate a conversion process, killing it if it ignores SIGTERM for ``grace`` seconds."""
+    if proc.is_alive():
+        proc.terminate()
+        if await _join(proc, grace):
+            return
+        proc.kill()
+    await _join(proc)
+
+
+async def convert_async(
+    conversion: str | Callable[..., Any],
+    input_file: str,
+    output_file: str,
+    job_timeout: float | None = None,
+    **options: Any,
+) -> dict[str, Any]:
+    """Run a conversion in its own process without blocking the event loop.
+
+    ``conversion`` is a CLI command (``"pdf2word"``), a converters function
+    name or the function itself, called with ``options`` (pdf2word's own
+    ``timeout`` included). Cancelling the task or exceeding ``job_timeout``
+    terminates the process, so the work really stops. Conversion errors are
+    re-raised; on success a result dict with the output path and duration (and,
+    for pdf2word, any ``degraded_pages`` written as plain text) is returned.
+    """
+    return await _convert(conversion, input_file, output_file, options, job_timeout)
+
+
+async def _convert(
+    conversion: str | Callable[..., Any],
+    input_file: str,
+    output_file: str,
+    options: dict[str, Any],
+    job_timeout: float | None,
+) -> dict[str, Any]:
+    func_name = _resolve(conversion)
+    # spawned, not forked: forking a process that runs an event loop (and its threads) is unsafe
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_child,
+        args=(child_conn, func_name, input_file, output_file, options),
+        name=f"docify-{func_name}",
+    )
+    t0 = time.perf_counter()
+    proc.start()
+    child_conn.close()
+    try:
+        # the child answers, or exits without answering (a crash)
+        if not await _wait_ready([parent_conn, proc.sentinel], job_timeout):
+            raise asyncio.TimeoutError()
+        try:
+            ok, payload = parent_conn.recv()
+        except EOFError:
+            ok, payload = False, None
+    except BaseException:
+        # cancelled or timed out: stop the child from here
+        await _stop(proc)
+        logging.warning(f"Async conversion stopped: {input_file} -> {output_file}")
+        raise
+    finally:
+        parent_conn.close()
+    await _join(proc)
+    if not ok:
+        raise payload or RuntimeError(f"Conversion process exited with code {proc.exitcode}")
+    result = {
+        "ok": True,
+        "input": input_file,
+        "output": output_file,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    if payload:
+        result["degraded_pages"] = payload
+    return result
+
+
+async def convert_many_async(
+    jobs: Iterable[tuple[Any, ...] | dict[str, Any]],
+    concurrency: int = 4,
+    job_timeout: float | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Run many conversions, at most ``concurrency`` at a time, yielding results as they complete.
+
+    Each job is ``(conversion, input_file, output_file[, options])`` or a dict
+    with those keys; ``options`` go to the converter as they are. A failed
+    job yields ``{"ok": False, "error": ...}`` instead of stopping the others. Closing or cancelling the iterator stops
+    every conversion still running.
+    """
+    jobs = iter(jobs)
+    in_flight: dict[asyncio.Task, tuple[str, str]] = {}
+
+    def start_more() -> None:
+        while len(in_flight) < max(1, concurrency):
+            job = next(jobs, None)
+            if job is None:
+                return
+            if isinstance(job, dict):
+                conversion, inp, out = job["conversion"], job["input"], job["output"]
+                options = job.get("options") or {}
+            else:
+                conversion, inp, out, *rest = job
+                options = rest[0] if rest else {}
+            task = asyncio.ensure_future(_convert(conversion, inp, out, options, job_timeout))
+            in_flight[task] = (inp, out)
+
+    try:
+        start_more()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                inp, out = in_flight.pop(task)
+                try:
+                    result = task.result()
+                except converters.ConversionTimeout as exc:
+                    # the converter's own budget, which is a TimeoutError as well
+                    result = {"ok": False, "input": inp, "output": out, "error": str(exc)}
+                except asyncio.TimeoutError:
+                    result = {"ok": False, "input": inp, "output": out, "error": f"Timed out after {job_timeout}s"}
+                except Exception as exc:
+                    result = {"ok": False, "input": inp, "output": out, "error": str(exc) or exc.__class__.__name__}
+                yield result
+            start_more()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Callable
+
+from . import metrics
+
+
+# Options that change how a conversion runs but not what it produces.
+IGNORED_OPTIONS = {"workers", "chunksize", "progress"}
+
+# Option values under which a conversion writes files besides output_file (one
+# .xlsx per shard). An entry holds a single file, so such runs skip the cache.
+UNCACHED_OPTIONS = {"shard": "files"}
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+# Bump when stored outputs are no longer compatible with older entries.
+CACHE_VERSION = 2
+
+# after an eviction the cache is trimmed to this fraction of its budget, so the
+# next few stores don't each walk the directory again
+EVICT_TO = 0.9
+
+
+def default_cache_dir() -> str:
+    """Return ``$DOCIFY_CACHE_DIR`` or ``~/.cache/docify``."""
+    return os.environ.get("DOCIFY_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "docify"
+    )
+
+
+def file_digest(path: str, block_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ConversionCache:
+    """On-disk, content-addressed store of conversion outputs.
+
+    Entries are keyed by the input bytes, the conversion function and the
+    options that affect its output. The cache is bounded by ``max_bytes``;
+    the least recently used entries are evicted first. Hit/miss counters and
+    the running total of stored bytes are kept in ``stats.json`` so they add
+    up across processes and runs; the entries are only walked once that total
+    goes over the budget. A conversion's return value (e.g. the degraded pages
+    of ``pdf_to_word``) is stored next to its output and returned on a hit.
+
+    With ``link`` a hit hard-links the output to the stored entry, so the two
+    share their bytes: edit such an output in place and every later hit gets
+    the edited file. Replacing the output (as most editors do on save) is safe.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        link: bool = False,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        # hard-link hits instead of copying (outputs then share the stored inode, see above)
+        self.link = link
+        self.entries_dir = os.path.join(self.cache_dir, "entries")
+        self.stats_file = os.path.join(self.cache_dir, "stats.json")
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def key(self, func: Callable[..., Any] | str, input_file: str, **options: Any) -> str:
+        """Return the cache key for converting ``input_file`` with ``func``."""
+        name = func if isinstance(func, str) else f"{func.__module__}.{func.__name__}"
+        relevant = {k: v for k, v in options.items() if k not in IGNORED_OPTIONS}
+        h = hashlib.sha256()
+        h.update(
+            json.dumps(
+                {"version": CACHE_VERSION, "func": name, "options": relevant},
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        )
+        h.update(file_digest(input_file).encode("ascii"))
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.entries_dir, key[:2], key)
+
+    @staticmethod
+    def _result_path(entry: str) -> str:
+        return entry + ".json"
+
+    def get(self, key: str, output_file: str) -> bool:
+        """Materialise the cached output for ``key`` at ``output_file``; return True on a hit."""
+        entry = self._entry_path(key)
+        if not os.path.exists(entry):
+            self._record("misses")
+            return False
+        try:
+            self._materialise(entry, output_file)
+            # touching the entry keeps it at the young end of the LRU order
+            os.utime(entry, None)
+        except OSError as exc:
+            logging.warning(f"Conversion cache entry unreadable, ignoring: {exc}")
+            self._record("misses")
+            return False
+        self._record("hits")
+        return True
+
+    def result(self, key: str) -> Any:
+        """Return the stored return value of the conversion cached under ``key`` (None if there was none)."""
+        try:
+            with open(self._result_path(self._entry_path(key)), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, output_file: str, result: Any = None) -> None:
+        """Store ``output_file`` (and the conversion's ``result``) under ``key``, evicting old entries if over budget."""
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        replaced = _size(entry)
+        # the result goes first, so whoever sees the entry sees its result too
+        if result is not None:
+            try:
+                self._write(self._result_path(entry), json.dumps(result).encode("utf-8"))
+            except TypeError as exc:
+                logging.debug(f"Conversion result not stored, not JSON serialisable: {exc}")
+        elif os.path.exists(self._result_path(entry)):
+            os.unlink(self._result_path(entry))
+        self._write(entry, output_file)
+        total = self._update_stats(stores=1, bytes=_size(entry) - replaced)["bytes"]
+        if total > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_TO))
+
+    def _write(self, path: str, source: str | bytes) -> None:
+        """Write a file's contents (or ``bytes``) to ``path`` through a temp file, so readers never see it partial."""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            if isinstance(source, bytes):
+                with os.fdopen(fd, "wb") as f:
+                    f.write(source)
+            else:
+                os.close(fd)
+                shutil.copyfile(source, tmp)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def run(self, func: Callable[..., Any], input_file: str, output_file: str, **options: Any) -> Any:
+        """Call ``func(input_file, output_file, **options)`` unless the output is cached."""
+        if any(options.get(name) == value for name, value in UNCACHED_OPTIONS.items()):
+            return func(input_file, output_file, **options)
+        key = self.key(func, input_file, **options)
+        if self.get(key, output_file):
+            logging.info(f"Conversion cache hit: {input_file} -> {output_file}")
+            metrics.event("cache_hit")
+            return self.result(key)
+        metrics.event("cache_miss")
+        before = _mtime_ns(output_file)
+        result = func(input_file, output_file, **options)
+        # only store outputs this call actually wrote (multi-file modes leave it untouched)
+        after = _mtime_ns(output_file)
+        if after is not None and after != before:
+            try:
+                self.put(key, output_file, result)
+            except OSError as exc:
+                logging.warning(f"Could not store conversion in cache: {exc}")
+        return result
+
+    def wrap(self, func: Callable[..., Any]) -> "CachedConversion":
+        """Return a callable with ``func``'s signature that goes through the cache."""
+        return CachedConversion(self, func)
+
+    def _materialise(self, entry: str, output_file: str) -> None:
+        if os.path.lexists(output_file):
+            os.unlink(output_file)
+        if self.link:
+            try:
+                os.link(entry, output_file)
+                return
+            except OSError:
+                # e.g. cache and output on different filesystems
+                pass
+        shutil.copyfile(entry, output_file)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.entries_dir):
+            for name in files:
+                if name.endswith((".tmp", ".json")):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self, target: int | None = None) -> int:
+        """Remove least recently used entries until the cache fits ``max_bytes``.
+
+        When it does not, entries are removed down to ``target`` bytes (default
+        ``max_bytes``). The recorded byte total is reset to what is left.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes and target is not None:
+            target = min(target, self.max_bytes)
+        else:
+            target = self.max_bytes
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            for name in (path, self._result_path(path)):
+                try:
+                    os.unlink(name)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            evicted += 1
+        self._update_stats(evictions=evicted, set_bytes=total)
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters plus the current entry count and size."""
+        data = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        entries = self._entries()
+        data["entries"] = len(entries)
+        data["bytes"] = sum(size for _, size, _ in entries)
+        return data
+
+    def _record(self, counter: str, amount: int = 1) -> None:
+        self._update_stats(**{counter: amount})
+
+    def _update_stats(self, set_bytes: int | None = None, **amounts: int) -> dict[str, int]:
+        """Add ``amounts`` to the counters in ``stats.json`` (and reset ``bytes``); return them."""
+        # best effort: concurrent writers may lose an increment, never the file;
+        # eviction re-counts the bytes, so a lost one is corrected there
+        data = {}
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if set_bytes is None and "bytes" not in data:
+            # first store since the total was tracked: count what is already there
+            set_bytes = sum(size for _, size, _ in self._entries())
+            amounts.pop("bytes", None)
+        for counter, amount in amounts.items():
+            data[counter] = data.get(counter, 0) + amount
+        if set_bytes is not None:
+            data["bytes"] = set_bytes
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.stats_file)
+        except OSError as exc:
+            logging.debug(f"Could not update cache statistics: {exc}")
+        return data
+
+
+class CachedConversion:
+    """Picklable ``func(input_file, output_file, **options)`` wrapper backed by a cache."""
+
+    def __init__(self, cache: ConversionCache, func: Callable[..., Any]) -> None:
+        self.cache = cache
+        self.func = func
+        self.__name__ = getattr(func, "__name__", "conversion")
+        self.__doc__ = getattr(func, "__doc__", None)
+
+    def __call__(self, input_file: str, output_file: str, **options: Any) -> Any:
+        return self.cache.run(self.func, input_file, output_file, **options)
@@ -1,18 +1,24 @@
+from __future__ import annotations
 
 import argparse
 import os
 import sys
 import contextlib
-import time
+import glob
+import itertools
+import json
 import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from tqdm import tqdm
-from . import converters
+from . import cache, converters, manifest, metrics, server
 
 
 # =========================================
 # 🔇 Utility: Suppress unwanted console output
 # =========================================
-from typing import Generator, Any
+from typing import Generator, Any, Iterable
 
 @contextlib.contextmanager
 def suppress_output() -> contextlib._GeneratorContextManager:
@@ -29,8 +35,11 @@ def suppress_output() -> contextlib._GeneratorContextManager:
 # =========================================
 # 📊 Utility: Progress bar
 # =========================================
-def show_progress(task_name: str, func: Any, *args: Any, **kwargs: Any) -> None:
-    """Display a single, smooth progress bar."""
+def show_progress(task_name: str, func: Any, *args: Any, **kwargs: Any) -> bool:
+    """Display a progress bar driven by the converter's progress callback.
+
+    Return True if the conversion succeeded.
+    """
     print(f"\n🔄 Starting {task_name} conversion...\n")
     with tqdm(
         total=100,
@@ -40,19 +49,28 @@ def show_progress(task_name: str, func: Any, *args: Any, **kwargs: Any) -> None:
         ascii=("=", " "),
         leave=False,
     ) as pbar:
-        for _ in range(20):
-            time.sleep(0.05)
-            pbar.update(5)
+
+        def update(done: int, total: int | None) -> None:
+            # an unknown total (streamed CSV) leaves the bar where it is
+            if total:
+                pbar.n = min(100, done * 100 // total)
+                pbar.refresh()
+
         try:
             with suppress_output():
-                func(*args, **kwargs)
+                result = func(*args, progress=update, **kwargs)
             pbar.n = 100
             pbar.refresh()
             print(f"\n✅ Conversion complete! Saved to: {args[1]}\n")
+            if result:
+                # pdf_to_word returns the pages it could only write as plain text
+                print(f"⚠️ Pages written as plain text: {', '.join(map(str, result))}\n")
             logging.info(f"Conversion complete: {args[0]} -> {args[1]}")
+            return True
         except Exception as e:
             print(f"\n❌ Conversion failed: {e}\n")
             logging.error(f"Conversion failed: {args[0]} -> {args[1]} | Error: {e}")
+            return False
 
 
 # =========================================
@@ -77,6 +95,78 @@ def get_input_output_paths(default_ext: str, input_prompt: str, output_prompt: s
     return inp, out
 
 
+# =========================================
+# 🔎 Utility: Lazy input discovery
+# =========================================
+def scan_folder(folder: str, extension: str | tuple[str, ...], recursive: bool = False) -> Generator[str, None, None]:
+    """Yield files in ``folder`` ending with ``extension`` (or one of several) as soon as they are found.
+
+    Uses ``os.scandir`` and walks sub-folders depth-first when ``recursive``,
+    so callers can start converting before the whole tree has been listed.
+    """
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and entry.name.lower().endswith(extension):
+                            yield entry.path
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                    except OSError as e:
+                        logging.warning(f"Skipping unreadable entry {entry.path}: {e}")
+        except OSError as e:
+            logging.warning(f"Skipping unreadable folder {current}: {e}")
+        stack.extend(reversed(sorted(subdirs)))
+
+
+def _has_wildcards(path: str) -> bool:
+    return any(ch in path for ch in "*?[")
+
+
+def iter_inputs(paths: Iterable[str], extension: str, recursive: bool = False) -> Generator[tuple[str, str], None, None]:
+    """Yield ``(input_file, root)`` for files, folders, globs and ``-`` (paths read from stdin).
+
+    ``root`` is the folder outputs are placed relative to when ``--output-dir`` is used.
+    """
+    for path in paths:
+        if path == "-":
+            for line in sys.stdin:
+                line = line.strip()
+                if line:
+                    yield from iter_inputs([line], extension, recursive)
+        elif _has_wildcards(path):
+            # outputs mirror the paths below the pattern's fixed part, not each match's folder
+            root = path
+            while _has_wildcards(root):
+                root = os.path.dirname(root)
+            for match in glob.iglob(path, recursive=recursive):
+                if os.path.isdir(match):
+                    yield from ((f, root) for f in scan_folder(match, extension, recursive))
+                elif match.lower().endswith(extension):
+                    yield match, root
+        elif os.path.isdir(path):
+            yield from ((f, path) for f in scan_folder(path, extension, recursive))
+        elif os.path.isfile(path):
+            yield path, os.path.dirname(path)
+        else:
+            print(f"⚠️ Input not found: {path}")
+            logging.warning(f"Input not found: {path}")
+
+
+def output_path_for(inp: str, root: str, output_ext: str, output_dir: str | None = None) -> str:
+    """Return the output path for ``inp``: next to it, or mirrored under ``output_dir``."""
+    if not output_dir:
+        return os.path.splitext(inp)[0] + output_ext
+    rel = os.path.relpath(inp, root or ".")
+    out = os.path.join(output_dir, os.path.splitext(rel)[0] + output_ext)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    return out
+
+
 # =========================================
 # 📁 Utility: Get folder for batch conversion
 # =========================================
@@ -87,7 +177,7 @@ def get_folder_and_files(extension: str) -> tuple[str, list[str]]:
         print("❌ Error: Invalid folder path.")
         sys.exit(1)
 
-    files = [f for f in os.listdir(folder) if f.lower().endswith(extension)]
+    files = [os.path.basename(f) for f in scan_folder(folder, extension)]
     if not files:
         print(f"⚠️ No {extension} files found in the specified folder.")
         sys.exit(0)
@@ -99,29 +189,253 @@ def get_folder_and_files(extension: str) -> tuple[str, list[str]]:
 # =========================================
 # 🧠 Generic batch converter
 # =========================================
-def batch_convert(task_name: str, extension: str, output_ext: str, func: Any, **kwargs: Any) -> None:
+def convert_file(func: Any, inp: str, out: str, kwargs: dict[str, Any]) -> str | None:
+    """Run one conversion quietly; return the error message, or None on success.
+
+    Module-level so it can be sent to worker processes.
+    """
+    try:
+        with suppress_output():
+            func(inp, out, **kwargs)
+        logging.info(f"Conversion complete: {inp} -> {out}")
+        return None
+    except Exception as e:
+        logging.error(f"Conversion failed: {inp} -> {out} | Error: {e}")
+        return str(e) or e.__class__.__name__
+
+
+def batch_convert(
+    task_name: str,
+    extension: str,
+    output_ext: str,
+    func: Any,
+    incremental: bool = False,
+    jobs: int = 1,
+    **kwargs: Any,
+) -> None:
     folder, files = get_folder_and_files(extension)
     print(f"🔄 Starting batch {task_name} conversion...\n")
-    errors = []
-    for f in files:
-        inp = os.path.join(folder, f)
-        out = os.path.join(folder, os.path.splitext(f)[0] + output_ext)
-        try:
-            show_progress(f"{f[:25]} → {output_ext}", func, inp, out, **kwargs)
-        except Exception as e:
-            errors.append((f, str(e)))
+    items = ((os.path.join(folder, f), folder) for f in files)
+    convert_many(
+        task_name, output_ext, func, items,
+        incremental=incremental, jobs=jobs, total=len(files), **kwargs
+    )
+    print(f"\n✅ Batch conversion complete! Files saved in: {folder}\n")
+
+
+def convert_many(
+    task_name: str,
+    output_ext: str,
+    func: Any,
+    items: Iterable[tuple[str, str]],
+    output_dir: str | None = None,
+    incremental: bool = False,
+    jobs: int = 1,
+    total: int | None = None,
+    **kwargs: Any,
+) -> list[tuple[str, str]]:
+    """Convert every ``(input_file, root)`` in ``items``; return the ``(file, error)`` failures.
+
+    ``items`` is consumed lazily, so conversions start while discovery is
+    still running. With ``incremental`` a manifest is kept in each output
+    root and unchanged files are skipped.
+    """
+    conversion = getattr(func, "__name__", task_name)
+    manifests: dict[str, manifest.BatchManifest] = {}
+    errors: list[tuple[str, str]] = []
+    skipped = 0
+    # output path -> the input converted to it, so two inputs never write one file
+    claimed: dict[str, str] = {}
+
+    def manifest_for(root: str) -> manifest.BatchManifest | None:
+        if not incremental:
+            return None
+        folder = output_dir or root or "."
+        if folder not in manifests:
+            manifests[folder] = manifest.BatchManifest(folder)
+        return manifests[folder]
+
+    def pending() -> Generator[tuple[str, str, str, str], None, None]:
+        nonlocal skipped
+        for inp, root in items:
+            out = output_path_for(inp, root, output_ext, output_dir)
+            key = os.path.normcase(os.path.abspath(out))
+            if key in claimed:
+                message = f"output {out} is already written by {claimed[key]}"
+                print(f"⚠️ Not converting {inp}: {message}")
+                errors.append((os.path.relpath(inp, root or "."), message))
+                continue
+            claimed[key] = inp
+            batch_manifest = manifest_for(root)
+            if batch_manifest and batch_manifest.is_up_to_date(inp, out, conversion, kwargs):
+                skipped += 1
+                continue
+            yield os.path.relpath(inp, root or "."), inp, out, root
+
+    def on_success(inp: str, out: str, root: str) -> None:
+        batch_manifest = manifest_for(root)
+        if batch_manifest and os.path.exists(out):
+            batch_manifest.record(inp, out, conversion, kwargs)
+
+    def checkpoint() -> None:
+        # so an interrupted run keeps its progress
+        for batch_manifest in manifests.values():
+            batch_manifest.save()
+
+    try:
+        work = pending()
+        # peek: a lone PDF keeps its page-level workers instead of a file pool
+        head = list(itertools.islice(work, 2))
+        work = itertools.chain(head, work)
+        if jobs > 1 and len(head) > 1:
+            if "workers" in kwargs:
+                # files already run in parallel; don't nest a page-level pool in each worker
+                kwargs = dict(kwargs, workers=1)
+            run_parallel_batch(task_name, func, work, jobs, kwargs, errors, on_success, checkpoint, total)
+        else:
+            for i, (name, inp, out, root) in enumerate(work, start=1):
+                try:
+                    if show_progress(f"{name[:25]} → {output_ext}", func, inp, out, **kwargs):
+                        on_success(inp, out, root)
+                    else:
+                        errors.append((name, "conversion failed (see convertor.log)"))
+                except Exception as e:
+                    errors.append((name, str(e)))
+                if i % 50 == 0:
+                    checkpoint()
+    finally:
+        checkpoint()
+    if skipped:
+        print(f"\n⏭️ Skipped {skipped} unchanged file(s) already converted.")
     if errors:
         print("\n❌ Some files failed to convert:")
         for fname, err in errors:
             print(f"  - {fname}: {err}")
-    print(f"\n✅ Batch conversion complete! Files saved in: {folder}\n")
+    return errors
+
+
+def run_parallel_batch(
+    task_name: str,
+    func: Any,
+    pending: Iterable[tuple[str, str, str, str]],
+    jobs: int,
+    kwargs: dict[str, Any],
+    errors: list[tuple[str, str]],
+    on_success: Any,
+    checkpoint: Any = None,
+    total: int | None = None,
+) -> None:
+    """Convert ``pending`` files in a process pool behind one aggregate progress bar.
+
+    At most ``2 * jobs`` files are in flight, so a lazily discovered tree is
+    never fully listed in memory. A failing file is recorded in ``errors`` and
+    the rest of the batch carries on. A worker that dies (segfault, OOM kill)
+    breaks the whole pool, and every file in flight with it: the pool is
+    replaced and those files are retried one at a time, so a file that kills
+    its worker again fails alone.
+    """
+    print(f"⚙️ Using {jobs} worker processes\n")
+    pending = iter(pending)
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    retry: deque[tuple[str, str, str, str]] = deque()
+    retried: set[tuple[str, str, str, str]] = set()
+    in_flight: dict[Any, tuple[str, str, str, str]] = {}
+
+    def restart() -> None:
+        nonlocal pool
+        pool.shutdown(wait=False)
+        pool = ProcessPoolExecutor(max_workers=jobs)
+
+    def submit(item: tuple[str, str, str, str]) -> None:
+        try:
+            future = pool.submit(convert_file, func, item[1], item[2], kwargs)
+        except BrokenProcessPool:
+            restart()
+            future = pool.submit(convert_file, func, item[1], item[2], kwargs)
+        in_flight[future] = item
+
+    def submit_more() -> None:
+        if retry:
+            # a retried file runs alone, so a second crash is its own
+            if not in_flight:
+                item = retry.popleft()
+                retried.add(item)
+                submit(item)
+            return
+        for item in itertools.islice(pending, 2 * jobs - len(in_flight)):
+            submit(item)
+
+    try:
+        with tqdm(
+            total=total,
+            desc=f"Batch {task_name}",
+            ncols=70,
+            unit="file",
+            bar_format="{desc}: [{bar}] {n_fmt}/{total_fmt}" if total else "{desc}: {n_fmt} files [{elapsed}]",
+            ascii=("=", " "),
+        ) as pbar:
+            submit_more()
+            done_count = 0
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finished, crashed = [], []
+                for future in done:
+                    item = in_flight.pop(future)
+                    try:
+                        finished.append((item, future.result()))
+                    except BrokenProcessPool:
+                        crashed.append(item)
+                    except Exception as e:
+                        finished.append((item, str(e) or e.__class__.__name__))
+                if crashed:
+                    # the pool is gone: whatever else was in flight went down with it
+                    crashed.extend(in_flight.values())
+                    in_flight.clear()
+                    restart()
+                    for item in crashed:
+                        if item in retried:
+                            finished.append((item, "worker process crashed"))
+                        else:
+                            retry.append(item)
+                for (name, inp, out, root), error in finished:
+                    if error is None:
+                        on_success(inp, out, root)
+                    else:
+                        errors.append((name, error))
+                    pbar.update(1)
+                    done_count += 1
+                    if checkpoint and done_count % 50 == 0:
+                        checkpoint()
+                submit_more()
+    finally:
+        pool.shutdown()
 
 
 # =========================================
 # 🚀 Unified conversion handler
 # =========================================
-def handle_conversion(task_name: str, input_ext: str, output_ext: str, func: Any, **kwargs: Any) -> None:
-    """Ask user for mode: single or batch."""
+def handle_conversion(
+    task_name: str,
+    input_ext: str,
+    output_ext: str,
+    func: Any,
+    incremental: bool = False,
+    jobs: int = 1,
+    inputs: list[str] | None = None,
+    output_dir: str | None = None,
+    recursive: bool = False,
+    **kwargs: Any,
+) -> None:
+    """Convert the given inputs, or ask the user for mode: single or batch."""
+    if inputs:
+        # non-interactive: paths/globs/folders/stdin, no prompts
+        errors = convert_many(
+            task_name, output_ext, func,
+            iter_inputs(inputs, input_ext, recursive),
+            output_dir=output_dir, incremental=incremental, jobs=jobs, **kwargs
+        )
+        sys.exit(1 if errors else 0)
+
     print("\n🔢 Select conversion mode:")
     print("1️⃣  Single file conversion")
     print("2️⃣  Batch folder conversion\n")
@@ -137,13 +451,113 @@ def handle_conversion(task_name: str, input_ext: str, output_ext: str, func: Any
         show_progress(task_name, func, inp, out, **kwargs)
 
     elif choice == "2":
-        batch_convert(task_name, input_ext, output_ext, func, **kwargs)
+        batch_convert(task_name, input_ext, output_ext, func, incremental=incremental, jobs=jobs, **kwargs)
 
     else:
         print("❌ Invalid choice. Exiting.")
         sys.exit(1)
 
 
+# =========================================
+# 🗄️ Utility: Conversion cache
+# =========================================
+def with_cache(args: argparse.Namespace, func: Any) -> Any:
+    """Route ``func`` through the conversion cache when ``--cache`` is given."""
+    if not getattr(args, "cache", False):
+        return func
+    conversion_cache = cache.ConversionCache(
+        args.cache_dir,
+        max_bytes=max(1, args.cache_size) * 1024 * 1024,
+        link=args.cache_link,
+    )
+    return conversion_cache.wrap(func)
+
+
+def metrics_exporter(args: argparse.Namespace) -> metrics.MetricsExporter | None:
+    """Return an exporter for ``--metrics`` / ``--metrics-prom``, or None when neither is given."""
+    jsonl = getattr(args, "metrics", None)
+    prom = getattr(args, "metrics_prom", None)
+    if not (jsonl or prom):
+        return None
+    return metrics.MetricsExporter(jsonl, prom)
+
+
+def show_cache(cache_dir: str | None, clear: bool = False) -> None:
+    """Print cache statistics, optionally clearing the cache first."""
+    conversion_cache = cache.ConversionCache(cache_dir)
+    if clear:
+        conversion_cache.clear()
+        print(f"🧹 Cleared conversion cache: {conversion_cache.cache_dir}")
+    stats = conversion_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+    print(f"🗄️ Cache: {conversion_cache.cache_dir}")
+    print(f"  entries: {stats['entries']} ({stats['bytes'] / (1024 * 1024):.1f} MB)")
+    print(f"  hits: {stats['hits']}  misses: {stats['misses']}  hit rate: {hit_rate:.1f}%")
+    print(f"  stores: {stats['stores']}  evictions: {stats['evictions']}")
+
+
+# =========================================
+# 🛰️ Utility: Thin client for 'serve'
+# =========================================
+def parse_options(pairs: list[str]) -> dict[str, Any]:
+    """Turn ``KEY=VALUE`` pairs into converter options; values are read as JSON when possible."""
+    options = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"❌ Invalid option (expected KEY=VALUE): {pair}")
+        try:
+            options[key] = json.loads(value)
+        except ValueError:
+            options[key] = value
+    return options
+
+
+def run_client(args: argparse.Namespace) -> int:
+    """Send every input to the server; return the process exit status."""
+    _, input_ext, output_ext = converters.CONVERSIONS[args.conversion]
+    options = parse_options(args.option)
+    errors = []
+
+    def send(item: tuple[str, str]) -> tuple[str, str, dict[str, Any]]:
+        inp, root = item
+        out = output_path_for(inp, root, output_ext, args.output_dir)
+        try:
+            return inp, out, server.request_conversion(args.url, args.conversion, inp, out, options)
+        except OSError as e:
+            return inp, out, {"ok": False, "error": f"Server unreachable: {e}"}
+
+    items = iter_inputs(args.inputs, input_ext, args.recursive)
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for inp, out, result in pool.map(send, items):
+            if result.get("ok"):
+                print(f"✅ {inp} -> {out} ({result.get('seconds', 0):.2f}s)")
+            else:
+                print(f"❌ {inp}: {result.get('error')}")
+                errors.append(inp)
+    return 1 if errors else 0
+
+
+# =========================================
+# 🔢 Utility: Argument types
+# =========================================
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """argparse type for sizes that must be greater than 0."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 # =========================================
 # 🧩 CLI main
 # =========================================
@@ -162,37 +576,158 @@ def main() -> None:
 
     subparsers = parser.add_subparsers(dest="command", help="Choose conversion type")
 
+    # Options shared by every conversion command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--cache", action="store_true", help="Reuse outputs of identical earlier conversions (content-addressed cache)")
+    common.add_argument("--cache-dir", default=None, help="Cache folder (default: $DOCIFY_CACHE_DIR or ~/.cache/docify)")
+    common.add_argument("--cache-size", type=int, default=1024, help="Cache size limit in MB; least recently used entries are evicted")
+    common.add_argument("--cache-link", action="store_true", help="Hard-link cached outputs instead of copying them; such outputs share bytes with the cache, so do not edit them in place")
+    common.add_argument("--jobs", type=int, default=1, help="Worker processes: files converted in parallel in batch mode (single file: pdf2word page ranges, xlsx2csv sheets, csv2xlsx --shard files)")
+    common.add_argument("inputs", nargs="*", metavar="INPUT", help="Files, folders or glob patterns to convert ('-' reads paths from stdin); prompts interactively when omitted")
+    common.add_argument("--output-dir", default=None, help="Write outputs here (mirroring input sub-folders) instead of next to each input")
+    common.add_argument("-r", "--recursive", action="store_true", help="Descend into sub-folders of folder inputs (and '**' in globs)")
+    common.add_argument("--incremental", action="store_true", help="Batch mode: skip files unchanged since the last run (tracked in .docify-manifest.json)")
+
+    # Metrics export, shared by the conversion commands and the server
+    metrics_options = argparse.ArgumentParser(add_help=False)
+    metrics_options.add_argument("--metrics", default=None, metavar="FILE", help="Append one JSON line per conversion (stage timings, fallbacks, bytes, peak memory) to FILE")
+    metrics_options.add_argument("--metrics-prom", default=None, metavar="FILE", help="Write aggregated metrics to FILE in Prometheus textfile format")
+
     # Add format options for pdf2word
-    pdf2word_parser = subparsers.add_parser("pdf2word", help="Convert PDF → Word (.docx)")
+    pdf2word_parser = subparsers.add_parser("pdf2word", parents=[common, metrics_options], help="Convert PDF → Word (.docx)")
     pdf2word_parser.add_argument("--no-images", action="store_true", help="Do not preserve images in PDF to Word conversion")
     pdf2word_parser.add_argument("--no-tables", action="store_true", help="Do not preserve tables in PDF to Word conversion")
-
-    subparsers.add_parser("word2pdf", help="Convert Word (.docx) → PDF")
-    subparsers.add_parser("xlsx2csv", help="Convert Excel (.xlsx) → CSV")
-    subparsers.add_parser("csv2xlsx", help="Convert CSV → Excel (.xlsx)")
+    pdf2word_parser.add_argument("--text-only", action="store_true", help="Extract searchable text only, skipping layout reconstruction (much faster)")
+    pdf2word_parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS", help="Give up on a file after this many seconds")
+    pdf2word_parser.add_argument("--page-timeout", type=float, default=None, metavar="SECONDS", help="Write a page as plain text when its layout takes longer than this")
+    pdf2word_parser.add_argument("--no-preflight", action="store_true", help="Skip sampling the PDF to choose the conversion route up front")
+
+    subparsers.add_parser("word2pdf", parents=[common, metrics_options], help="Convert Word (.docx) → PDF")
+    xlsx2csv_parser = subparsers.add_parser("xlsx2csv", parents=[common, metrics_options], help="Convert Excel (.xlsx) → CSV")
+    xlsx2csv_parser.add_argument("--stream", action="store_true", help="Stream rows from a read-only workbook instead of loading the sheet into memory")
+    xlsx2csv_parser.add_argument("--all-sheets", action="store_true", help="Export every sheet to its own CSV file (<output>_<sheet>.csv)")
+    xlsx2csv_parser.add_argument("--sheet", action="append", dest="sheets", metavar="NAME", help="Export the named sheet to its own CSV file (repeatable)")
+    xlsx2csv_parser.add_argument("--engine", choices=converters.XLSX_ENGINES, default="auto", help="Workbook reader; auto uses calamine when installed, openpyxl otherwise")
+    csv2xlsx_parser = subparsers.add_parser("csv2xlsx", parents=[common, metrics_options], help="Convert CSV → Excel (.xlsx)")
+    csv2xlsx_parser.add_argument("--stream", action="store_true", help="Stream rows in chunks through a write-only workbook (constant memory)")
+    csv2xlsx_parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows read per chunk when streaming")
+    csv2xlsx_parser.add_argument("--engine", choices=converters.CSV_ENGINES, default="c", help="CSV parser; pyarrow is multithreaded (falls back to c when not installed)")
+    schema_group = csv2xlsx_parser.add_mutually_exclusive_group()
+    schema_group.add_argument("--schema", metavar="FILE", help="JSON file mapping column names to dtypes (skips type inference)")
+    schema_group.add_argument("--infer-schema", action="store_true", help="Infer dtypes from a sample once and reuse them for CSVs with the same header")
+    csv2xlsx_parser.add_argument("--shard", choices=converters.SHARD_MODES, help="Split rows beyond Excel's limit across sheets (with an Index sheet) or .xlsx files (listed in the output and a JSON manifest; not cached by --cache)")
+    csv2xlsx_parser.add_argument("--shard-rows", type=positive_int, metavar="N", help="Data rows per shard (default and maximum: 1,048,575)")
+    csv2xlsx_parser.add_argument("--shard-mb", type=positive_float, metavar="MB", help="Also start a new shard after about this much CSV input")
+
+    serve_parser = subparsers.add_parser("serve", parents=[metrics_options], help="Run a conversion server with warm worker processes")
+    serve_parser.add_argument("--host", default=server.DEFAULT_HOST, help="Interface to bind (default: localhost only)")
+    serve_parser.add_argument("--port", type=int, default=server.DEFAULT_PORT, help="Port to listen on")
+    serve_parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Conversions run at the same time")
+    serve_parser.add_argument("--max-queue", type=int, default=16, help="Jobs allowed to wait for a worker before new ones are rejected")
+
+    client_parser = subparsers.add_parser("client", help="Send conversions to a running 'serve' process")
+    client_parser.add_argument("conversion", choices=sorted(converters.CONVERSIONS), help="Conversion to run")
+    client_parser.add_argument("inputs", nargs="+", metavar="INPUT", help="Files, folders or glob patterns ('-' reads paths from stdin)")
+    client_parser.add_argument("--url", default=f"http://{server.DEFAULT_HOST}:{server.DEFAULT_PORT}", help="Server address")
+    client_parser.add_argument("--output-dir", default=None, help="Write outputs here instead of next to each input")
+    client_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into sub-folders of folder inputs")
+    client_parser.add_argument("--jobs", type=int, default=1, help="Requests sent at the same time")
+    client_parser.add_argument("--option", action="append", default=[], metavar="KEY=VALUE", help="Converter option, e.g. streaming=true (repeatable)")
+
+    cache_parser = subparsers.add_parser("cache", help="Show or clear the conversion cache")
+    cache_parser.add_argument("--cache-dir", default=None, help="Cache folder (default: $DOCIFY_CACHE_DIR or ~/.cache/docify)")
+    cache_parser.add_argument("--clear", action="store_true", help="Remove every cached output")
 
     args = parser.parse_args()
 
-    if args.command == "word2pdf":
-        handle_conversion("Word → PDF", ".docx", ".pdf", converters.word_to_pdf)
+    if args.command == "cache":
+        show_cache(args.cache_dir, clear=args.clear)
+        return
 
-    elif args.command == "pdf2word":
-        preserve_images = not getattr(args, "no_images", False)
-        preserve_tables = not getattr(args, "no_tables", False)
-        handle_conversion(
-            "PDF → Word", ".pdf", ".docx",
-            lambda inp, out: converters.pdf_to_word(inp, out, preserve_images=preserve_images, preserve_tables=preserve_tables)
+    if args.command == "serve":
+        server.serve(
+            args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+            exporter=metrics_exporter(args),
         )
-
-    elif args.command == "xlsx2csv":
-        handle_conversion("Excel → CSV", ".xlsx", ".csv", converters.xlsx_to_csv)
-
-    elif args.command == "csv2xlsx":
-        handle_conversion("CSV → Excel", ".csv", ".xlsx", converters.csv_to_xlsx)
-
-    else:
-        parser.print_help()
-
+        return
+
+    if args.command == "client":
+        sys.exit(run_client(args))
+
+    exporter = metrics_exporter(args)
+
+    def conversion(func: Any) -> Any:
+        func = with_cache(args, func)
+        return exporter.wrap(func) if exporter else func
+
+    try:
+        if args.command == "word2pdf":
+            handle_conversion(
+                "Word → PDF", ".docx", ".pdf", conversion(converters.word_to_pdf),
+                incremental=args.incremental,
+                inputs=args.inputs,
+                output_dir=args.output_dir,
+                recursive=args.recursive,
+                jobs=max(1, args.jobs),
+            )
+
+        elif args.command == "pdf2word":
+            handle_conversion(
+                "PDF → Word", ".pdf", ".docx", conversion(converters.pdf_to_word),
+                incremental=args.incremental,
+                inputs=args.inputs,
+                output_dir=args.output_dir,
+                recursive=args.recursive,
+                jobs=max(1, args.jobs),
+                preserve_images=not getattr(args, "no_images", False),
+                preserve_tables=not getattr(args, "no_tables", False),
+                workers=max(1, args.jobs),
+                text_only=args.text_only,
+                timeout=args.timeout,
+                page_timeout=args.page_timeout,
+                preflight=not args.no_preflight,
+            )
+
+        elif args.command == "xlsx2csv":
+            handle_conversion(
+                "Excel → CSV", ".xlsx", ".csv", conversion(converters.xlsx_to_csv),
+                incremental=args.incremental,
+                inputs=args.inputs,
+                output_dir=args.output_dir,
+                recursive=args.recursive,
+                jobs=max(1, args.jobs),
+                streaming=getattr(args, "stream", False),
+                sheets=getattr(args, "sheets", None),
+                all_sheets=getattr(args, "all_sheets", False),
+                engine=args.engine,
+                workers=max(1, args.jobs),
+            )
+
+        elif args.command == "csv2xlsx":
+            handle_conversion(
+                "CSV → Excel", ".csv", ".xlsx", conversion(converters.csv_to_xlsx),
+                incremental=args.incremental,
+                inputs=args.inputs,
+                output_dir=args.output_dir,
+                recursive=args.recursive,
+                jobs=max(1, args.jobs),
+                streaming=getattr(args, "stream", False),
+                chunksize=max(1, args.chunk_size),
+                engine=args.engine,
+                schema=args.schema,
+                infer_schema=args.infer_schema,
+                shard=args.shard,
+                shard_rows=args.shard_rows,
+                shard_mb=args.shard_mb,
+                workers=max(1, args.jobs),
+            )
+
+        else:
+            parser.print_help()
+
+    finally:
+        if exporter:
+            exporter.close()
 
 if __name__ == "__main__":
     main()
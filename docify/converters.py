@@ -1,35 +1,1031 @@
-import pandas as pd
-from docx2pdf import convert
-from pdf2docx import Converter
-import pdfplumber
-from docx import Document
-import tempfile
-from copy import deepcopy
+# Conversion backends (pandas, pdf2docx, pdfplumber, python-docx, docx2pdf,
+# openpyxl) are imported inside the converter that needs them, so importing
+# this module - and starting the CLI - stays cheap.
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
+import csv
+import hashlib
+import io
+import itertools
+import json
 import logging
 import os
+import re
+import signal
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from . import cache, metrics
+
+if TYPE_CHECKING:
+    from pdf2docx import Converter
+
+# progress(done, total): units of real work finished so far; total is None when unknown
+ProgressCallback = Callable[[int, "int | None"], None]
+
+# streaming paths report progress every PROGRESS_ROWS rows
+PROGRESS_ROWS = 1000
+
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_WP_DOCPR = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}docPr"
+_STYLE_REFS = {f"{{{_NS_W}}}pStyle", f"{{{_NS_W}}}rStyle", f"{{{_NS_W}}}tblStyle"}
+_NUM_ID = f"{{{_NS_W}}}numId"
+
+# characters python-docx/lxml refuse in text (XML 1.0 control characters)
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# command -> (converter function name, input extension, output extension)
+CONVERSIONS = {
+    "word2pdf": ("word_to_pdf", ".docx", ".pdf"),
+    "pdf2word": ("pdf_to_word", ".pdf", ".docx"),
+    "xlsx2csv": ("xlsx_to_csv", ".xlsx", ".csv"),
+    "csv2xlsx": ("csv_to_xlsx", ".csv", ".xlsx"),
+}
 
 
-def word_to_pdf(input_file: str, output_file: str) -> None:
+def word_to_pdf(
+    input_file: str,
+    output_file: str,
+    progress: ProgressCallback | None = None,
+) -> None:
     try:
         if not input_file.lower().endswith(".docx"):
             raise ValueError("Input file must be a .docx file")
-        convert(input_file, output_file)
+        from docx2pdf import convert
+
+        if progress:
+            progress(0, 1)
+        with metrics.span("docx2pdf"):
+            convert(input_file, output_file)
+        if progress:
+            progress(1, 1)
         logging.info(f"Converted Word to PDF: {input_file} -> {output_file}")
     except Exception as e:
         logging.error(f"Error converting Word to PDF: {e}")
         raise
 
 
+class ConversionTimeout(TimeoutError):
+    """A conversion ran past its whole-job ``timeout``."""
+
+
+class PageTimeout(TimeoutError):
+    """A single page ran past its ``page_timeout``."""
+
+    def __init__(self, page: int, seconds: float) -> None:
+        super().__init__(f"Page {page + 1} exceeded its {seconds:g}s budget")
+        self.page = page
+
+
+class _BudgetAlarm(BaseException):
+    # a BaseException so `except Exception` blocks inside the backends can't swallow it
+    pass
+
+
+def _raise_alarm(signum: int, frame: Any) -> None:
+    raise _BudgetAlarm()
+
+
+class _Budget:
+    """Wall-clock budgets for one conversion (``timeout``) and each page (``page_timeout``).
+
+    Where ``SIGALRM`` is usable (POSIX, main thread - which includes batch and
+    server worker processes) an overrun interrupts pdf2docx mid-page. Elsewhere,
+    e.g. the GUI's worker thread, budgets are only checked between pages.
+    """
+
+    def __init__(self, timeout: float | None = None, page_timeout: float | None = None) -> None:
+        self.timeout = timeout
+        self.page_timeout = page_timeout
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.preemptive = (
+            bool(timeout or page_timeout)
+            and hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+        self._previous_handler: Any = None
+
+    def remaining(self) -> float | None:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def check(self) -> None:
+        """Raise ConversionTimeout once the job budget is spent."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise self.expired()
+
+    def expired(self) -> ConversionTimeout:
+        if self.timeout:
+            return ConversionTimeout(f"Conversion exceeded its {self.timeout:g}s budget")
+        return ConversionTimeout("Conversion ran out of time")
+
+    def start(self) -> None:
+        self.check()
+        if self.preemptive:
+            self._previous_handler = signal.signal(signal.SIGALRM, _raise_alarm)
+            self._arm(self.remaining())
+
+    def stop(self) -> None:
+        if self.preemptive and self._previous_handler is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+            self._previous_handler = None
+
+    def _arm(self, seconds: float | None) -> None:
+        # a spent budget disarms the timer; the next check() reports it
+        signal.setitimer(signal.ITIMER_REAL, seconds if seconds and seconds > 0 else 0)
+
+    @contextlib.contextmanager
+    def page(self, page: int) -> Iterator[None]:
+        """Run one page's work within ``page_timeout`` (and what is left of the job)."""
+        self.check()
+        if not self.page_timeout:
+            yield
+            return
+        t0 = time.monotonic()
+        if self.preemptive:
+            remaining = self.remaining()
+            self._arm(self.page_timeout if remaining is None else min(self.page_timeout, remaining))
+        try:
+            yield
+        except _BudgetAlarm:
+            self.check()
+            raise PageTimeout(page, self.page_timeout) from None
+        finally:
+            if self.preemptive:
+                self._arm(self.remaining())
+        if not self.preemptive and time.monotonic() - t0 > self.page_timeout:
+            # too late to save the time, so keep the page
+            logging.warning(f"Page {page} took {time.monotonic() - t0:.1f}s (budget {self.page_timeout:g}s)")
+
+
+def _parse_document(
+    cv: "Converter",
+    settings: dict,
+    budget: _Budget,
+    degraded: list[int] | None = None,
+) -> None:
+    """pdf2docx's ``parse_document``, with each page's raw extraction within the page budget.
+
+    Follows ``Pages.parse``: fonts for the whole file, then each page's
+    ``restore``/``clean_up``/``process_font`` (where a pathological page can
+    stall), header and footer, then each page's margin and sections. A page
+    over budget is recorded in ``degraded`` and skipped from then on; without
+    ``degraded`` its PageTimeout is raised.
+    """
+    from pdf2docx.font.Fonts import Fonts
+    from pdf2docx.page.Pages import Pages
+    from pdf2docx.page.RawPageFactory import RawPageFactory
+
+    def over_budget(page: Any, exc: PageTimeout) -> None:
+        if degraded is None:
+            raise exc
+        logging.warning(f"{exc}; using the text fallback for this page.")
+        metrics.event("page_timeout")
+        degraded.append(page.id)
+        page.skip_parsing = True
+
+    fonts = Fonts.extract(cv.fitz_doc)
+    extracted = []
+    words_found = False
+    for page in cv.pages:
+        if page.skip_parsing:
+            continue
+        try:
+            with metrics.span("extract", page=page.id + 1), budget.page(page.id):
+                raw_page = RawPageFactory.create(page_engine=cv.fitz_doc[page.id], backend="PyMuPDF")
+                raw_page.restore(**settings)
+                words_found = words_found or bool(raw_page.raw_text.strip())
+                raw_page.clean_up(**settings)
+                raw_page.process_font(fonts)
+        except PageTimeout as e:
+            over_budget(page, e)
+            continue
+        page.width = raw_page.width
+        page.height = raw_page.height
+        page.float_images.reset().extend(raw_page.blocks.floating_image_blocks)
+        extracted.append((page, raw_page))
+    if not words_found:
+        logging.warning("Words count: 0. It might be a scanned pdf, which is not supported yet.")
+
+    Pages._parse_document([raw_page for _, raw_page in extracted])
+    for page, raw_page in extracted:
+        try:
+            with budget.page(page.id):
+                raw_page.margin = page.margin = raw_page.calculate_margin(**settings)
+                page.sections.extend(raw_page.parse_section(**settings))
+        except PageTimeout as e:
+            over_budget(page, e)
+
+
+def _parse_pages(
+    cv: "Converter",
+    settings: dict,
+    budget: _Budget,
+    degraded: list[int],
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Parse the loaded pages one at a time, each within the page budget.
+
+    A page over budget is left unparsed and recorded in ``degraded``; a page
+    that fails is left out, as ``Converter.parse_pages`` does.
+    """
+    pages = [page for page in cv.pages if not page.skip_parsing]
+    total = len(pages)
+    for done, page in enumerate(pages, start=1):
+        try:
+            with metrics.span("page", page=page.id + 1), budget.page(page.id):
+                page.parse(**settings)
+        except PageTimeout as e:
+            logging.warning(f"{e}; using the text fallback for this page.")
+            metrics.event("page_timeout")
+            degraded.append(page.id)
+        except ConversionTimeout:
+            raise
+        except Exception as e:
+            logging.error(f"Ignore page {page.id + 1} due to parsing page error: {e}")
+        if progress:
+            progress(done, total)
+
+
+def _convert_page_range_docx(
+    input_file: str,
+    start: int,
+    end: int,
+    page_timeout: float | None = None,
+    timeout: float | None = None,
+    preserve_images: bool = True,
+) -> tuple[bytes | None, list[int], list[dict], float]:
+    """Convert pages ``[start, end)`` to a .docx fragment with pdf2docx.
+
+    Pages over budget are written as plain text. Returns the fragment (None
+    when no page of the range could be converted), the pages over budget,
+    and the timing spans recorded in this worker with the time they are
+    relative to.
+    """
+    from pdf2docx import Converter
+
+    cv = Converter(input_file)
+    budget = _Budget(timeout, page_timeout)
+    degraded: list[int] = []
+    stream = None
+    with metrics.recording("pdf_to_word") as recorder:
+        try:
+            budget.start()
+            settings = cv.default_settings
+            with metrics.span("parse_document", first=start + 1, last=end):
+                _parse_document(cv.load_pages(start, end), settings, budget, degraded)
+            _parse_pages(cv, settings, budget, degraded)
+            if degraded or any(page.finalized for page in cv.pages):
+                stream = io.BytesIO()
+                _make_docx(cv, input_file, stream, degraded, budget, preserve_images)
+        except _BudgetAlarm:
+            raise budget.expired() from None
+        finally:
+            budget.stop()
+            cv.close()
+    return stream.getvalue() if stream else None, degraded, recorder.spans, recorder.started
+
+
+def _page_ranges(total_pages: int, parts: int) -> list[tuple[int, int]]:
+    """Split ``total_pages`` into at most ``parts`` contiguous ``(start, end)`` ranges."""
+    if total_pages <= 0:
+        return []
+    parts = max(1, min(parts, total_pages))
+    size, extra = divmod(total_pages, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+class _DocxMerger:
+    """Moves the bodies of .docx fragments into one document, re-homing what they reference.
+
+    Body elements are moved, not copied, ahead of the main document's section
+    properties. Everything they point at comes along: images are stored once
+    per distinct content (by SHA-256), hyperlinks and other relationships are
+    re-created, missing styles are moved over and list definitions are
+    renumbered, with identical ones shared. Shape ids stay unique across
+    fragments and images added through ``add_image``.
+    """
+
+    def __init__(self, main_doc: Any) -> None:
+        self.main_doc = main_doc
+        self.part = main_doc.part
+        self.sect_pr = main_doc.element.body.sectPr
+        self._images: dict[str, tuple[str, str, int, int]] = {}
+        self._external: dict[tuple[str, str], str] = {}
+        self._styles: set[str] | None = None
+        self._numbering: Any = None
+        self._nums: dict[bytes, str] = {}
+        self._next_num = self._next_abstract = 0
+        self._next_id: int | None = None
+        self._last_break: Any = None
+
+    def append(self, source: Any, sections: bool = False) -> None:
+        """Move the body of the .docx at ``source`` (a path or stream) into the main document.
+
+        The fragment's own section properties are skipped, so pages added as
+        text afterwards stay in order. With ``sections`` they come along as a
+        section break after the fragment instead (see ``close_sections``).
+        """
+        from docx import Document
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        from lxml import etree
+
+        fragment = Document(source)
+        body = fragment.element.body
+        elements = [element for element in body if element is not body.sectPr]
+        if sections and body.sectPr is not None:
+            # a section ends at a paragraph holding its properties, as in python-docx's add_section
+            p_pr = OxmlElement("w:pPr")
+            p_pr.append(body.sectPr)
+            self._last_break = OxmlElement("w:p")
+            self._last_break.append(p_pr)
+            elements.append(self._last_break)
+        rel_ids: dict[str, str] = {}
+        num_ids: dict[str, str] = {}
+        style_ids = set()
+        for element in elements:
+            for node in element.iter(etree.Element):
+                for key, value in list(node.attrib.items()):
+                    if key.startswith(f"{{{_NS_R}}}"):
+                        if value not in rel_ids:
+                            rel_ids[value] = self._relate(fragment.part.rels[value])
+                        node.set(key, rel_ids[value])
+                if node.tag == _WP_DOCPR:
+                    node.set("id", str(self.next_shape_id()))
+                elif node.tag in _STYLE_REFS:
+                    style_ids.add(node.get(qn("w:val")))
+                elif node.tag == _NUM_ID and node.get(qn("w:val"), "0") != "0":
+                    value = node.get(qn("w:val"))
+                    if value not in num_ids:
+                        num_ids[value] = self._num(fragment, value)
+                    node.set(qn("w:val"), num_ids[value])
+        self._add_styles(fragment, style_ids)
+        for element in elements:
+            self.sect_pr.addprevious(element)
+
+    def close_sections(self) -> None:
+        """Make the section break of the last fragment appended with ``sections`` the document's final section."""
+        last = self._last_break
+        if last is None or last.getnext() is not self.sect_pr:
+            return
+        sect_pr = last[0][0]
+        self.sect_pr.addprevious(sect_pr)
+        self.sect_pr.getparent().remove(self.sect_pr)
+        last.getparent().remove(last)
+        self.sect_pr = sect_pr
+        self._last_break = None
+
+    def add_image(self, blob: bytes) -> tuple[str, str, int, int]:
+        """Return ``(rId, filename, pixel width, pixel height)`` for an image, storing it on first use."""
+        digest = hashlib.sha256(blob).hexdigest()
+        image = self._images.get(digest)
+        if image is None:
+            rId, stored = self.part.get_or_add_image(io.BytesIO(blob))
+            image = (rId, stored.filename, stored.px_width, stored.px_height)
+            self._images[digest] = image
+            metrics.event("images_stored")
+        return image
+
+    def next_shape_id(self) -> int:
+        if self._next_id is None:
+            # part.next_id scans the whole document, so only ask once
+            self._next_id = self.part.next_id
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _relate(self, rel: Any) -> str:
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        if rel.is_external:
+            key = (rel.reltype, rel.target_ref)
+            if key not in self._external:
+                self._external[key] = self.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            return self._external[key]
+        if rel.reltype == RT.IMAGE:
+            return self.add_image(rel.target_part.blob)[0]
+        # headers, charts, ...: adopt the part under a partname free in this package
+        target = rel.target_part
+        template = re.sub(r"\d*(\.\w+)$", r"%d\1", target.partname)
+        target.partname = self.part.package.next_partname(template)
+        return self.part.relate_to(target, rel.reltype)
+
+    def _add_styles(self, fragment: Any, style_ids: set[str]) -> None:
+        from docx.oxml.ns import qn
+
+        styles = self.main_doc.styles.element
+        if self._styles is None:
+            self._styles = {style.get(qn("w:styleId")) for style in styles.iterchildren(qn("w:style"))}
+        pending = list(style_ids - self._styles)
+        while pending:
+            style = fragment.styles.element.get_by_id(pending.pop())
+            if style is None or style.get(qn("w:styleId")) in self._styles:
+                continue
+            styles.append(style)
+            self._styles.add(style.get(qn("w:styleId")))
+            for ref in ("w:basedOn", "w:next", "w:link"):
+                linked = style.find(qn(ref))
+                if linked is not None and linked.get(qn("w:val")) not in self._styles:
+                    pending.append(linked.get(qn("w:val")))
+
+    def _num(self, fragment: Any, num_id: str) -> str:
+        """Return the main document's numId for the fragment's list ``num_id``, adding it if new."""
+        from lxml import etree
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        from docx.oxml.ns import qn
+
+        try:
+            source = fragment.part.part_related_by(RT.NUMBERING).element
+        except KeyError:
+            return num_id
+        num = next(iter(source.xpath(f'w:num[@w:numId="{num_id}"]')), None)
+        if num is None:
+            return num_id
+        abstract_id = num.find(qn("w:abstractNumId")).get(qn("w:val"))
+        abstract = source.xpath(f'w:abstractNum[@w:abstractNumId="{abstract_id}"]')[0]
+        # identical list definitions (as every page of a pdf2docx document has) are shared
+        key = etree.tostring(abstract) + etree.tostring(num)
+        if key in self._nums:
+            return self._nums[key]
+        if self._numbering is None:
+            self._numbering = self.part.numbering_part.element
+            self._next_num = 1 + max(map(int, self._numbering.xpath("w:num/@w:numId")), default=0)
+            self._next_abstract = 1 + max(
+                map(int, self._numbering.xpath("w:abstractNum/@w:abstractNumId")), default=-1
+            )
+        abstract.set(qn("w:abstractNumId"), str(self._next_abstract))
+        num.set(qn("w:numId"), str(self._next_num))
+        num.find(qn("w:abstractNumId")).set(qn("w:val"), str(self._next_abstract))
+        # abstract definitions must precede every w:num
+        first_num = self._numbering.find(qn("w:num"))
+        if first_num is not None:
+            first_num.addprevious(abstract)
+        else:
+            self._numbering.append(abstract)
+        self._numbering.append(num)
+        self._nums[key] = str(self._next_num)
+        self._next_num += 1
+        self._next_abstract += 1
+        return self._nums[key]
+
+
+def _append_paragraphs(main_doc: Any, texts: list[str], page_break: bool = False) -> None:
+    """Append one plain paragraph per text to ``main_doc`` in bulk.
+
+    Elements are built directly: ``Document.add_paragraph`` searches the body
+    for its section properties on every call, which is quadratic on long
+    documents. Newlines inside a text become line breaks.
+    """
+    from docx.oxml.ns import qn
+
+    sect_pr = main_doc.element.body.sectPr
+    if page_break:
+        p = sect_pr.makeelement(qn("w:p"), {})
+        br = p.makeelement(qn("w:br"), {qn("w:type"): "page"})
+        r = p.makeelement(qn("w:r"), {})
+        r.append(br)
+        p.append(r)
+        sect_pr.addprevious(p)
+    for text in texts:
+        p = sect_pr.makeelement(qn("w:p"), {})
+        r = p.makeelement(qn("w:r"), {})
+        for i, line in enumerate(_XML_ILLEGAL.sub("", text).split("\n")):
+            if i:
+                r.append(r.makeelement(qn("w:br"), {}))
+            t = r.makeelement(qn("w:t"), {})
+            t.text = line
+            if line != line.strip():
+                t.set(qn("xml:space"), "preserve")
+            r.append(t)
+        p.append(r)
+        sect_pr.addprevious(p)
+
+
+def _import_fitz() -> Any:
+    """Return PyMuPDF, imported under its current name where available."""
+    try:
+        import pymupdf
+
+        return pymupdf
+    except ImportError:  # PyMuPDF < 1.24.3
+        import fitz
+
+        return fitz
+
+
+class _PageImages:
+    """Embeds the images of PDF pages into a .docx, storing each distinct image once.
+
+    Images are cached by PDF object (xref), and the merger stores them by a
+    SHA-256 of their bytes, so a logo or letterhead repeated on every page is
+    extracted, decoded and stored in the package once and then only
+    referenced again - also by pages merged in as converted fragments.
+    """
+
+    # formats Word displays as-is; anything else (JPX, JBIG2, CMYK, masked) is re-encoded as PNG
+    NATIVE = {"png", "jpeg", "jpg", "gif", "bmp", "tiff"}
+    MAX_WIDTH_PT = 468.0  # 6.5in, the text width of a Letter page with 1in margins
+
+    def __init__(self, merger: _DocxMerger, fitz_doc: Any) -> None:
+        self.merger = merger
+        self.fitz_doc = fitz_doc
+        self._by_xref: dict[int, tuple[str, str, int, int] | None] = {}
+
+    def append(self, index: int) -> int:
+        """Add the images of page ``index`` as paragraphs; return how many were added."""
+        page = self.fitz_doc[index]
+        added = 0
+        for info in page.get_images(full=True):
+            xref = info[0]
+            try:
+                image = self._image(xref)
+                if image is None:
+                    continue
+                rects = page.get_image_rects(xref)
+                width = rects[0].width if rects else None
+                self._add_inline(image, width)
+                added += 1
+            except Exception as img_exc:
+                logging.warning(f"Failed to extract image {xref} from page {index}: {img_exc}")
+        if added:
+            metrics.event("images_embedded", added)
+        return added
+
+    def _image(self, xref: int) -> tuple[str, str, int, int] | None:
+        """Return ``(rId, filename, pixel width, pixel height)`` for an image, storing it on first use."""
+        if xref in self._by_xref:
+            return self._by_xref[xref]
+        blob, ext = self._extract(xref)
+        image = self.merger.add_image(blob)
+        self._by_xref[xref] = image
+        return image
+
+    def _extract(self, xref: int) -> tuple[bytes, str]:
+        info = self.fitz_doc.extract_image(xref)
+        if info["ext"] in self.NATIVE and not info.get("smask") and info.get("cs-name", "DeviceRGB") != "DeviceCMYK":
+            return info["image"], info["ext"]
+        fitz = _import_fitz()
+        pix = fitz.Pixmap(self.fitz_doc, xref)
+        if info.get("smask"):
+            pix = fitz.Pixmap(pix, fitz.Pixmap(self.fitz_doc, info["smask"]))
+        if pix.colorspace and pix.colorspace.n > 3:
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        return pix.tobytes("png"), "png"
+
+    def _add_inline(self, image: tuple[str, str, int, int], width_pt: float | None) -> None:
+        from docx.oxml.ns import qn
+        from docx.oxml.shape import CT_Inline
+        from docx.shared import Pt
+
+        rId, filename, px_width, px_height = image
+        if not width_pt:
+            width_pt = px_width * 72 / 96
+        width_pt = min(width_pt, self.MAX_WIDTH_PT)
+        cx = int(Pt(width_pt))
+        cy = int(cx * px_height / px_width) if px_width else cx
+        inline = CT_Inline.new_pic_inline(self.merger.next_shape_id(), rId, filename, cx, cy)
+        sect_pr = self.merger.sect_pr
+        p = sect_pr.makeelement(qn("w:p"), {})
+        r = p.makeelement(qn("w:r"), {})
+        drawing = r.makeelement(qn("w:drawing"), {})
+        drawing.append(inline)
+        r.append(drawing)
+        p.append(r)
+        sect_pr.addprevious(p)
+
+
+def _append_page_text(
+    pdf: Any,
+    index: int,
+    main_doc: Any,
+    budget: _Budget,
+    images: _PageImages | None = None,
+) -> None:
+    """Add the plain text (and, with ``images``, the images) of page ``index`` to ``main_doc``."""
+    try:
+        with metrics.span("page_text", page=index + 1), budget.page(index):
+            text = pdf.pages[index].extract_text()
+    except ConversionTimeout:
+        raise
+    except PageTimeout as page_exc:
+        logging.warning(f"{page_exc}; leaving it empty.")
+        metrics.event("page_timeout")
+        text = None
+    except Exception as text_exc:
+        logging.error(f"Failed to extract text for page {index}: {text_exc}")
+        text = None
+    if text:
+        _append_paragraphs(main_doc, text.split("\n"))
+    if images:
+        images.append(index)
+
+
+def _make_docx(
+    cv: "Converter",
+    input_file: str,
+    output_file: str | io.BytesIO,
+    text_pages: list[int],
+    budget: _Budget,
+    preserve_images: bool = True,
+) -> None:
+    """Write the parsed pages to ``output_file``, with ``text_pages`` as plain text in page order."""
+    settings = cv.default_settings
+    if not text_pages:
+        with metrics.span("make_docx"):
+            cv.make_docx(output_file, **settings)
+        return
+    import pdfplumber
+    from docx import Document
+
+    main_doc = Document()
+    merger = _DocxMerger(main_doc)
+    images = _PageImages(merger, cv.fitz_doc) if preserve_images else None
+    finalized = {page.id: page.finalized for page in cv.pages}
+    pages = [page for page in cv.pages if page.finalized or page.id in text_pages]
+    try:
+        with pdfplumber.open(input_file) as pdf:
+            for as_text, run in itertools.groupby(pages, key=lambda page: page.id in text_pages):
+                run_ids = [page.id for page in run]
+                if as_text:
+                    for page_id in run_ids:
+                        _append_page_text(pdf, page_id, main_doc, budget, images)
+                    continue
+                # make_docx writes every finalized page, so hide the other runs
+                for page in cv.pages:
+                    page._finalized = finalized[page.id] and page.id in run_ids
+                stream = io.BytesIO()
+                with metrics.span("make_docx", first=run_ids[0] + 1, last=run_ids[-1] + 1):
+                    cv.make_docx(stream, **settings)
+                merger.append(stream)
+    finally:
+        for page in cv.pages:
+            page._finalized = finalized[page.id]
+    main_doc.save(output_file)
+
+
+def _convert_pages(
+    cv: "Converter",
+    input_file: str,
+    output_file: str,
+    budget: _Budget,
+    degraded: list[int],
+    progress: ProgressCallback | None = None,
+    preserve_images: bool = True,
+) -> None:
+    """Run pdf2docx's parse and make steps, reporting every parsed page."""
+    settings = cv.default_settings
+    with metrics.span("parse_document"):
+        _parse_document(cv.load_pages(), settings, budget, degraded)
+    _parse_pages(cv, settings, budget, degraded, progress)
+    _make_docx(cv, input_file, output_file, degraded, budget, preserve_images)
+
+
+def _convert_page_ranges(
+    cv: "Converter",
+    input_file: str,
+    output_file: str,
+    workers: int,
+    budget: _Budget,
+    degraded: list[int],
+    progress: ProgressCallback | None = None,
+    preserve_images: bool = True,
+) -> None:
+    """Convert page ranges to .docx fragments in a process pool and merge them in page order.
+
+    Parsing and writing both happen in the workers, leaving only the merge
+    to this process.
+    """
+    from docx import Document
+
+    total = len(cv.fitz_doc)
+    ranges = _page_ranges(total, workers)
+    logging.info(f"Converting {len(ranges)} page ranges with {workers} workers: {input_file}")
+    fragments: dict[int, bytes | None] = {}
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = {
+            pool.submit(
+                _convert_page_range_docx,
+                input_file, start, end, budget.page_timeout, budget.remaining(), preserve_images,
+            ): (start, end)
+            for start, end in ranges
+        }
+        done = 0
+        for future in as_completed(futures):
+            start, end = futures[future]
+            fragments[start], slow_pages, spans, started = future.result()
+            metrics.merge(spans, started)
+            degraded.extend(slow_pages)
+            done += end - start
+            if progress:
+                progress(done, total)
+    if not any(fragments.values()):
+        raise RuntimeError(f"No page of {input_file} could be converted")
+    merger = _DocxMerger(Document())
+    with metrics.span("merge_ranges"):
+        for start in sorted(fragments):
+            if fragments[start]:
+                merger.append(io.BytesIO(fragments[start]), sections=True)
+        merger.close_sections()
+        merger.main_doc.save(output_file)
+    degraded.sort()
+
+
+def _convert_page_range(
+    cv: "Converter",
+    pdf: Any,
+    start: int,
+    end: int,
+    merger: _DocxMerger,
+    settings: dict,
+    budget: _Budget,
+    degraded: list[int],
+    advance: Callable[[int], None] | None = None,
+    images: _PageImages | None = None,
+) -> None:
+    """Convert pages ``[start, end)`` into the merged document, halving the range on failure.
+
+    ``cv`` and ``pdf`` are already-open pdf2docx and pdfplumber handles, so the
+    file is never re-opened; a page that fails on its own, or runs over its
+    budget, is added as plain text (plus its ``images``) and recorded in
+    ``degraded``.
+    """
+    try:
+        with metrics.span("page_range", first=start + 1, last=end):
+            _parse_document(cv.load_pages(start, end), settings, budget)
+            for page in cv.pages:
+                if not page.skip_parsing:
+                    with metrics.span("page", page=page.id + 1), budget.page(page.id):
+                        page.parse(**settings)
+            stream = io.BytesIO()
+            cv.make_docx(stream, **settings)
+            merger.append(stream)
+        if advance:
+            advance(end - start)
+        return
+    except ConversionTimeout:
+        raise
+    except PageTimeout as page_exc:
+        # no bisecting around a slow page: it goes to text alone, its neighbours are retried
+        logging.warning(f"{page_exc}; extracting text for this page instead.")
+        metrics.event("page_timeout")
+        slow = page_exc.page
+        if start < slow:
+            _convert_page_range(cv, pdf, start, slow, merger, settings, budget, degraded, advance, images)
+        _append_page_text(pdf, slow, merger.main_doc, budget, images)
+        degraded.append(slow)
+        if advance:
+            advance(1)
+        if slow + 1 < end:
+            _convert_page_range(cv, pdf, slow + 1, end, merger, settings, budget, degraded, advance, images)
+        return
+    except Exception as range_exc:
+        if end - start > 1:
+            logging.warning(
+                f"Pages {start}-{end - 1} conversion failed: {range_exc}; splitting the range."
+            )
+        else:
+            logging.warning(
+                f"Page {start} conversion failed: {range_exc}; extracting text for this page instead."
+            )
+
+    if end - start > 1:
+        mid = (start + end) // 2
+        _convert_page_range(cv, pdf, start, mid, merger, settings, budget, degraded, advance, images)
+        _convert_page_range(cv, pdf, mid, end, merger, settings, budget, degraded, advance, images)
+        return
+
+    # fallback for this page: extract text and add as paragraphs
+    _append_page_text(pdf, start, merger.main_doc, budget, images)
+    degraded.append(start)
+    if advance:
+        advance(1)
+
+
+def _convert_per_page(
+    cv: "Converter",
+    input_file: str,
+    output_file: str,
+    budget: _Budget,
+    degraded: list[int],
+    progress: ProgressCallback | None = None,
+    preserve_images: bool = True,
+) -> None:
+    """Convert the PDF in two page ranges, bisecting failures, and merge them into one .docx."""
+    import pdfplumber
+    from docx import Document
+
+    settings = cv.default_settings
+    settings["raw_exceptions"] = True
+    main_doc = Document()
+    merger = _DocxMerger(main_doc)
+    images = _PageImages(merger, cv.fitz_doc) if preserve_images else None
+    total_pages = len(cv.fitz_doc)
+    pages_done = 0
+
+    def advance(pages: int) -> None:
+        nonlocal pages_done
+        pages_done += pages
+        if progress:
+            progress(pages_done, total_pages)
+
+    if progress:
+        progress(0, total_pages)
+    with pdfplumber.open(input_file) as pdf:
+        for start, end in _page_ranges(total_pages, 2):
+            _convert_page_range(
+                cv, pdf, start, end, merger, settings, budget, degraded, advance, images
+            )
+
+    # Save merged document
+    main_doc.save(output_file)
+
+
+def _convert_text_only(
+    input_file: str,
+    output_file: str,
+    budget: _Budget,
+    degraded: list[int],
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Write the text of every page, one paragraph per text block, with no layout analysis.
+
+    Pages are read one at a time with PyMuPDF's text extractor; a page over
+    its budget is left empty and recorded in ``degraded``.
+    """
+    from docx import Document
+
+    fitz = _import_fitz()
+    doc = Document()
+    with fitz.open(input_file) as pdf:
+        total = len(pdf)
+        for i, page in enumerate(pdf):
+            try:
+                with metrics.span("page_text", page=i + 1), budget.page(i):
+                    # (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+                    blocks = page.get_text("blocks", sort=True)
+            except PageTimeout as page_exc:
+                logging.warning(f"{page_exc}; leaving it empty.")
+                metrics.event("page_timeout")
+                degraded.append(i)
+                blocks = []
+            texts = [block[4].strip() for block in blocks if block[6] == 0 and block[4].strip()]
+            _append_paragraphs(doc, texts, page_break=i > 0)
+            if progress:
+                progress(i + 1, total)
+    with metrics.span("save"):
+        doc.save(output_file)
+
+
+def _report_degraded(input_file: str, degraded: list[int]) -> list[int]:
+    """Log and return the 1-based numbers of pages that were rendered as plain text."""
+    pages = sorted({page + 1 for page in degraded})
+    metrics.event("degraded_pages", len(pages))
+    if pages:
+        logging.warning(
+            f"Pages rendered as plain text in {input_file}: {', '.join(map(str, pages))}"
+        )
+    return pages
+
+
+# Pre-flight thresholds: a sampled page with fewer characters than this is
+# treated as having no text layer, and one whose images cover more than
+# SCANNED_COVERAGE of its area as a scan.
+PREFLIGHT_MIN_CHARS = 20
+SCANNED_COVERAGE = 0.6
+
+
+def _sample_pages(total: int, count: int) -> list[int]:
+    """Return up to ``count`` page indexes spread evenly from the first to the last page."""
+    if total <= count:
+        return list(range(total))
+    step = (total - 1) / (count - 1)
+    return sorted({round(i * step) for i in range(count)})
+
+
+def _ruling_lines(page: Any) -> int:
+    """Count horizontal and vertical strokes (lines and hairline rectangles) on ``page``."""
+    lines = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.x - p2.x) < 1 or abs(p1.y - p2.y) < 1:
+                    lines += 1
+            elif item[0] == "re" and min(item[1].width, item[1].height) < 2:
+                lines += 1
+    return lines
+
+
+def classify_pdf(input_file: str, sample_pages: int = 5) -> dict[str, Any]:
+    """Sample a few pages of a PDF and pick the conversion route for it.
+
+    Each sampled page is measured for text density, image coverage, ruling
+    lines (a hint of tables) and whether PyMuPDF can read it at all. The
+    ``route`` is ``"primary"`` (whole-document layout conversion),
+    ``"per_page"`` (layout conversion page range by page range, since some
+    pages are broken) or ``"text"`` (scans, empty or unreadable documents,
+    where layout analysis would only cost time); ``reasons`` explains it.
+    """
+    fitz = _import_fitz()
+    profile: dict[str, Any] = {"route": "primary", "reasons": [], "pages": 0, "sampled": [], "errors": []}
+    try:
+        doc = fitz.open(input_file)
+    except Exception as exc:
+        profile.update(route="text", reasons=[f"cannot be opened ({exc})"])
+        return profile
+    with doc:
+        profile["pages"] = len(doc)
+        chars, coverage, rulings = [], [], []
+        for index in _sample_pages(len(doc), max(1, sample_pages)):
+            profile["sampled"].append(index + 1)
+            try:
+                page = doc[index]
+                area = abs(page.rect) or 1.0
+                chars.append(len(page.get_text("text").strip()))
+                covered = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+                coverage.append(min(1.0, covered / area))
+                rulings.append(_ruling_lines(page))
+            except Exception as exc:
+                profile["errors"].append(index + 1)
+                logging.debug(f"Pre-flight could not read page {index + 1} of {input_file}: {exc}")
+
+    reasons = profile["reasons"]
+    if chars:
+        profile["text_chars"] = round(sum(chars) / len(chars), 1)
+        profile["image_coverage"] = round(sum(coverage) / len(coverage), 3)
+        profile["ruling_lines"] = round(sum(rulings) / len(rulings), 1)
+    if not profile["sampled"]:
+        profile["route"] = "text"
+        reasons.append("no pages")
+    elif not chars:
+        profile["route"] = "text"
+        reasons.append("no sampled page could be read")
+    elif profile["text_chars"] < PREFLIGHT_MIN_CHARS and profile["image_coverage"] > SCANNED_COVERAGE:
+        profile["route"] = "text"
+        reasons.append(f"looks scanned ({profile['image_coverage']:.0%} of the page is image, no text layer)")
+    else:
+        if profile["errors"]:
+            profile["route"] = "per_page"
+            reasons.append(f"pages {', '.join(map(str, profile['errors']))} failed to parse")
+        reasons.append(f"{profile['text_chars']:g} characters per page")
+        if profile["ruling_lines"]:
+            reasons.append(f"{profile['ruling_lines']:g} ruling lines per page (tables likely)")
+        if profile["image_coverage"]:
+            reasons.append(f"images cover {profile['image_coverage']:.0%} of the page")
+    return profile
+
+
 def pdf_to_word(
     input_file: str,
     output_file: str,
     preserve_images: bool = True,
     preserve_tables: bool = True,
     prefer_word: bool = False,
-) -> None:
+    workers: int = 1,
+    text_only: bool = False,
+    timeout: float | None = None,
+    page_timeout: float | None = None,
+    preflight: bool = True,
+    progress: ProgressCallback | None = None,
+) -> list[int]:
+    """Convert a PDF to .docx, degrading to plain text where layout conversion fails.
+
+    ``text_only`` skips layout reconstruction altogether and writes each
+    page's text blocks as paragraphs - many times faster when only searchable
+    text is needed. With ``preflight`` a few pages are sampled first (see
+    ``classify_pdf``) so scans go straight to text extraction and documents
+    with broken pages straight to per-page conversion. ``timeout`` caps the whole conversion (ConversionTimeout
+    is raised when it runs out) and ``page_timeout`` each page: a page over
+    budget is written as plain text instead. Returns the 1-based numbers of
+    the pages that had to fall back to plain text (or were left empty).
+    """
+    budget = _Budget(timeout, page_timeout)
+    degraded: list[int] = []
     try:
         if not input_file.lower().endswith(".pdf"):
             raise ValueError("Input file must be a .pdf file")
+        budget.start()
+        if text_only:
+            with metrics.span("text_only"):
+                _convert_text_only(input_file, output_file, budget, degraded, progress)
+            logging.info(f"Converted PDF to Word (text only): {input_file} -> {output_file}")
+            return _report_degraded(input_file, degraded)
+        from pdf2docx import Converter
+        import pdfplumber
+        from docx import Document
+
         # If user prefers Microsoft Word (Windows) and pywin32 is available, try it first
         if prefer_word:
             try:
@@ -42,17 +1038,20 @@ def pdf_to_word(
                         logging.info(
                             "Trying Microsoft Word COM conversion (preferred)..."
                         )
-                        word = win32com.client.Dispatch("Word.Application")
-                        word.Visible = False
-                        doc = word.Documents.Open(os.path.abspath(input_file))
-                        # 16 = wdFormatDocumentDefault (docx)
-                        doc.SaveAs(os.path.abspath(output_file), FileFormat=16)
-                        doc.Close(False)
-                        word.Quit()
+                        with metrics.span("com"):
+                            word = win32com.client.Dispatch("Word.Application")
+                            word.Visible = False
+                            doc = word.Documents.Open(os.path.abspath(input_file))
+                            # 16 = wdFormatDocumentDefault (docx)
+                            doc.SaveAs(os.path.abspath(output_file), FileFormat=16)
+                            doc.Close(False)
+                            word.Quit()
                         logging.info(
                             f"Microsoft Word conversion succeeded (preferred): {input_file} -> {output_file}"
                         )
-                        return
+                        if progress:
+                            progress(1, 1)
+                        return []
                     except Exception as word_exc:
                         logging.warning(
                             f"Preferred Microsoft Word conversion failed: {word_exc}"
@@ -60,77 +1059,69 @@ def pdf_to_word(
             except Exception:
                 # any import/platform error - ignore and continue
                 pass
-        cv = Converter(input_file)
-        # Try primary conversion using pdf2docx
-        try:
-            cv.convert(output_file, start=0, end=None)
-            cv.close()
-            logging.info(f"Converted PDF to Word: {input_file} -> {output_file}")
-            return
-        except Exception as primary_exc:
-            logging.warning(
-                f"Primary pdf2docx conversion failed, attempting per-page conversion: {primary_exc}"
+        route = "primary"
+        if preflight:
+            with metrics.span("preflight"):
+                profile = classify_pdf(input_file)
+            route = profile["route"]
+            logging.info(
+                f"Pre-flight for {input_file}: {route} ({'; '.join(profile['reasons'])})"
             )
-            try:
-                cv.close()
-            except Exception:
-                pass
+            metrics.event(f"route_{route}")
+            metrics.note(preflight=profile)
 
-            # Try per-page conversion and merge to preserve layout where possible.
+        if route != "text":
+            cv = Converter(input_file)
             try:
-                with pdfplumber.open(input_file) as pdf:
-                    total_pages = len(pdf.pages)
-
-                main_doc = Document()
-                for page_idx in range(total_pages):
-                    tmp = None
+                if route == "primary":
+                    # Try primary conversion using pdf2docx
                     try:
-                        # create a temp file for this single page conversion
-                        tmpf = tempfile.NamedTemporaryFile(suffix=".docx", delete=False)
-                        tmp = tmpf.name
-                        tmpf.close()
-
-                        cpage = Converter(input_file)
-                        cpage.convert(tmp, start=page_idx, end=page_idx)
-                        cpage.close()
-
-                        # append converted page docx content into main_doc
-                        tmp_doc = Document(tmp)
-                        for element in tmp_doc.element.body:
-                            main_doc.element.body.append(deepcopy(element))
-                    except Exception as page_exc:
+                        with metrics.span("primary"):
+                            if workers > 1 and len(cv.fitz_doc) > 1:
+                                _convert_page_ranges(
+                                    cv, input_file, output_file, workers, budget, degraded, progress,
+                                    preserve_images=preserve_images,
+                                )
+                            else:
+                                _convert_pages(
+                                    cv, input_file, output_file, budget, degraded, progress,
+                                    preserve_images=preserve_images,
+                                )
+                        logging.info(f"Converted PDF to Word: {input_file} -> {output_file}")
+                        return _report_degraded(input_file, degraded)
+                    except (ConversionTimeout, _BudgetAlarm):
+                        raise
+                    except Exception as primary_exc:
                         logging.warning(
-                            f"Page {page_idx} conversion failed: {page_exc}; extracting text for this page instead."
+                            f"Primary pdf2docx conversion failed, attempting per-page conversion: {primary_exc}"
                         )
-                        # fallback for this page: extract text and add as paragraphs
-                        try:
-                            with pdfplumber.open(input_file) as pdf:
-                                page = pdf.pages[page_idx]
-                                text = page.extract_text()
-                                if text:
-                                    for line in text.split("\n"):
-                                        main_doc.add_paragraph(line)
-                        except Exception as text_exc:
-                            logging.error(
-                                f"Failed to extract text for page {page_idx}: {text_exc}"
-                            )
-                    finally:
-                        if tmp:
-                            try:
-                                os.unlink(tmp)
-                            except Exception:
-                                pass
-
-                # Save merged document
-                main_doc.save(output_file)
-                logging.info(
-                    f"Per-page PDF->Word merge completed: {input_file} -> {output_file}"
-                )
-                return
-            except Exception as per_page_exc:
-                logging.warning(
-                    f"Per-page conversion failed, falling back to text-only extraction: {per_page_exc}"
-                )
+                        metrics.event("fallback_per_page")
+                        degraded.clear()
+
+                # Try per-page conversion and merge to preserve layout where possible.
+                # The PDF is opened once (the primary converter and one pdfplumber
+                # handle) and reused for every page range.
+                try:
+                    with metrics.span("per_page_merge"):
+                        _convert_per_page(
+                            cv, input_file, output_file, budget, degraded, progress, preserve_images
+                        )
+                    logging.info(
+                        f"Per-page PDF->Word merge completed: {input_file} -> {output_file}"
+                    )
+                    return _report_degraded(input_file, degraded)
+                except ConversionTimeout:
+                    raise
+                except Exception as per_page_exc:
+                    logging.warning(
+                        f"Per-page conversion failed, falling back to text-only extraction: {per_page_exc}"
+                    )
+                    degraded.clear()
+            finally:
+                try:
+                    cv.close()
+                except Exception:
+                    pass
 
             # Try Microsoft Word (Windows) conversion as a higher-fidelity fallback.
             # This requires Word to be installed and `pywin32` available in the Python env.
@@ -144,18 +1135,22 @@ def pdf_to_word(
                         logging.info(
                             "Trying Microsoft Word COM conversion as fallback..."
                         )
-                        word = win32com.client.Dispatch("Word.Application")
-                        word.Visible = False
-                        # Word can open a PDF and save it as a .docx (Word 2013+)
-                        doc = word.Documents.Open(os.path.abspath(input_file))
-                        # 16 = wdFormatDocumentDefault (docx)
-                        doc.SaveAs(os.path.abspath(output_file), FileFormat=16)
-                        doc.Close(False)
-                        word.Quit()
+                        metrics.event("fallback_com")
+                        with metrics.span("com"):
+                            word = win32com.client.Dispatch("Word.Application")
+                            word.Visible = False
+                            # Word can open a PDF and save it as a .docx (Word 2013+)
+                            doc = word.Documents.Open(os.path.abspath(input_file))
+                            # 16 = wdFormatDocumentDefault (docx)
+                            doc.SaveAs(os.path.abspath(output_file), FileFormat=16)
+                            doc.Close(False)
+                            word.Quit()
                         logging.info(
                             f"Microsoft Word conversion succeeded: {input_file} -> {output_file}"
                         )
-                        return
+                        if progress:
+                            progress(1, 1)
+                        return []
                     except Exception as word_exc:
                         logging.warning(
                             f"Microsoft Word conversion failed or not available: {word_exc}"
@@ -164,78 +1159,759 @@ def pdf_to_word(
                 # any import/platform error - ignore and continue to text fallback
                 pass
 
-            # Final fallback: extract text and images using pdfplumber and write to a .docx using python-docx
+        # Final fallback: extract text with pdfplumber and images with PyMuPDF, and write to a .docx using python-docx
+        metrics.event("fallback_text")
+        degraded.clear()
+        with metrics.span("text_fallback"), contextlib.ExitStack() as stack:
             doc = Document()
+            images = None
+            if preserve_images:
+                try:
+                    fitz_doc = stack.enter_context(_import_fitz().open(input_file))
+                    images = _PageImages(_DocxMerger(doc), fitz_doc)
+                except Exception as img_open_exc:
+                    logging.warning(f"Images cannot be extracted from {input_file}: {img_open_exc}")
             with pdfplumber.open(input_file) as pdf:
                 for i, page in enumerate(pdf.pages):
                     # Extract text
-                    text = page.extract_text()
+                    try:
+                        with budget.page(i):
+                            text = page.extract_text()
+                    except PageTimeout as page_exc:
+                        logging.warning(f"{page_exc}; leaving it empty.")
+                        metrics.event("page_timeout")
+                        degraded.append(i)
+                        text = None
                     if text:
-                        for line in text.split("\n"):
-                            doc.add_paragraph(line)
+                        _append_paragraphs(doc, text.split("\n"))
 
-                    # Extract and insert images from this page
-                    try:
-                        if hasattr(page, "images") and page.images:
-                            for img_idx, img_info in enumerate(page.images):
-                                try:
-                                    # pdfplumber provides image info; we need to extract the image bytes
-                                    # This is a best-effort extraction using the underlying page object
-                                    # Note: pdfplumber doesn't directly extract image bytes easily, so we use a workaround
-                                    # Use the page's underlying pdfminer object if available
-                                    if hasattr(page, "page_obj") and hasattr(
-                                        page.page_obj, "images"
-                                    ):
-                                        # Try to get image using page_obj (pdfminer.six structure)
-                                        # This is a simplified attempt; real extraction can be complex
-                                        pass  # Complex image extraction - skip for now to avoid errors
-
-                                    # Alternative: try using img_info to locate the image stream
-                                    # For now, we log that images exist but skip complex extraction
-                                    logging.info(
-                                        f"Image detected on page {i} but not extracted (complex)"
-                                    )
-                                except Exception as img_exc:
-                                    logging.warning(
-                                        f"Failed to extract image {img_idx} from page {i}: {img_exc}"
-                                    )
-                    except Exception as img_extract_exc:
-                        logging.warning(
-                            f"Image extraction failed for page {i}: {img_extract_exc}"
-                        )
+                    # Extract and insert images from this page (each distinct image stored once)
+                    if images:
+                        try:
+                            images.append(i)
+                        except Exception as img_extract_exc:
+                            logging.warning(
+                                f"Image extraction failed for page {i}: {img_extract_exc}"
+                            )
 
                     # don't add an extra page break after the last page
                     if i != len(pdf.pages) - 1:
-                        doc.add_page_break()
+                        _append_paragraphs(doc, [], page_break=True)
+                    if progress:
+                        progress(i + 1, len(pdf.pages))
+                page_count = len(pdf.pages)
             doc.save(output_file)
-            logging.info(
-                f"Fallback PDF->Word (text + attempted image extraction) completed: {input_file} -> {output_file}"
+        logging.info(
+            f"Fallback PDF->Word (text + images) completed: {input_file} -> {output_file}"
+        )
+        if degraded:
+            logging.warning(
+                f"Pages left empty in {input_file}: {', '.join(str(page + 1) for page in degraded)}"
             )
-            return
+        # every page is plain text now, the ones left empty included
+        return _report_degraded(input_file, degraded + list(range(page_count)))
+    except _BudgetAlarm:
+        error = budget.expired()
+        logging.error(f"Error converting PDF to Word: {error}")
+        raise error from None
     except Exception as e:
         logging.error(f"Error converting PDF to Word: {e}")
         raise
+    finally:
+        budget.stop()
 
 
-def xlsx_to_csv(input_file: str, output_file: str) -> None:
+def sheet_csv_path(output_file: str, sheet_name: str) -> str:
+    """Return the CSV path for ``sheet_name``: ``<output stem>_<sheet>.csv``."""
+    root, ext = os.path.splitext(output_file)
+    safe_name = re.sub(r'[<>:"/\\|?*\s]+', "_", sheet_name).strip("_") or "sheet"
+    return f"{root}_{safe_name}{ext or '.csv'}"
+
+
+def sheet_csv_paths(output_file: str, sheet_names: list[str]) -> dict[str, str]:
+    """Return the CSV path of every sheet of a workbook (all its sheets, in order).
+
+    Names are from :func:`sheet_csv_path`. Sheets whose names map to a file
+    already taken (e.g. "Q1 Sales" and "Q1_Sales", or names differing only in
+    case) get their 1-based position in the workbook appended, so the paths of
+    a workbook never depend on which of its sheets are exported.
+    """
+    paths: dict[str, str] = {}
+    taken: set[str] = set()
+    for index, name in enumerate(sheet_names, start=1):
+        path = sheet_csv_path(output_file, name)
+        while path.lower() in taken:
+            root, ext = os.path.splitext(path)
+            path = f"{root}_{index}{ext}"
+        taken.add(path.lower())
+        paths[name] = path
+    return paths
+
+
+XLSX_ENGINES = ("auto", "calamine", "openpyxl")
+_calamine: bool | None = None
+
+
+def _calamine_available() -> bool:
+    """Whether pandas can read workbooks with calamine (pandas >= 2.2 and python-calamine installed)."""
+    global _calamine
+    if _calamine is None:
+        try:
+            import pandas as pd
+            import python_calamine  # noqa: F401
+
+            _calamine = tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+        except (ImportError, ValueError):
+            _calamine = False
+    return _calamine
+
+
+def _xlsx_engine(engine: str = "auto") -> str:
+    """Return the ``pd.read_excel`` engine: calamine (Rust, many times faster) when usable, else openpyxl."""
+    if engine not in XLSX_ENGINES:
+        raise ValueError(f"Unknown XLSX engine: {engine} (expected one of {', '.join(XLSX_ENGINES)})")
+    if engine == "openpyxl":
+        return engine
+    if _calamine_available():
+        return "calamine"
+    if engine == "calamine":
+        logging.warning("python-calamine (with pandas >= 2.2) is not available; reading with openpyxl")
+    return "openpyxl"
+
+
+def xlsx_to_csv(
+    input_file: str,
+    output_file: str,
+    streaming: bool = False,
+    sheets: list[str] | None = None,
+    all_sheets: bool = False,
+    engine: str = "auto",
+    workers: int = 1,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Convert a workbook to CSV.
+
+    By default the first sheet is written to ``output_file``. With ``sheets``
+    or ``all_sheets`` every selected sheet is written to its own file, named
+    by :func:`sheet_csv_paths`, in a single pass over the workbook. With
+    ``workers`` > 1 the sheets are exported concurrently instead, one sheet
+    per task in that many processes. Each process holds one sheet at a time,
+    so peak memory grows with ``workers``, not with the number of sheets.
+
+    ``engine`` ``"auto"`` reads with calamine when it is installed and with
+    openpyxl otherwise; both give the same CSV. Streaming always uses
+    openpyxl's read-only mode, the one reader that keeps memory bounded.
+    """
     try:
         if not input_file.lower().endswith(".xlsx"):
             raise ValueError("Input file must be a .xlsx file")
-        df = pd.read_excel(input_file)
-        df.to_csv(output_file, index=False)
+        import pandas as pd
+
+        per_sheet = all_sheets or bool(sheets)
+        engine = _xlsx_engine(engine)
+        if per_sheet and workers > 1:
+            _xlsx_to_csv_parallel(input_file, output_file, sheets, all_sheets, workers, engine, streaming, progress)
+        elif streaming:
+            _xlsx_to_csv_streaming(input_file, output_file, sheets, all_sheets, progress)
+        elif per_sheet:
+            with metrics.span("read", engine=engine), pd.ExcelFile(input_file, engine=engine) as book:
+                paths = sheet_csv_paths(output_file, book.sheet_names)
+                frames = pd.read_excel(book, sheet_name=None if all_sheets else list(sheets))
+            total = sum(len(df) for df in frames.values())
+            done = 0
+            for sheet_name, df in frames.items():
+                with metrics.span("write", sheet=sheet_name):
+                    df.to_csv(paths[sheet_name], index=False)
+                done += len(df)
+                if progress:
+                    progress(done, total)
+        else:
+            with metrics.span("read", engine=engine):
+                df = pd.read_excel(input_file, engine=engine)
+            if progress:
+                progress(0, len(df))
+            with metrics.span("write"):
+                df.to_csv(output_file, index=False)
+            if progress:
+                progress(len(df), len(df))
         logging.info(f"Converted Excel to CSV: {input_file} -> {output_file}")
     except Exception as e:
         logging.error(f"Error converting Excel to CSV: {e}")
         raise
 
 
-def csv_to_xlsx(input_file: str, output_file: str) -> None:
+def _export_sheet(
+    input_file: str, csv_path: str, sheet_name: str, engine: str, streaming: bool
+) -> tuple[list[dict], float]:
+    """Worker: write one sheet to ``csv_path``; return the spans recorded."""
+    with metrics.recording("xlsx_to_csv") as recorder:
+        if streaming:
+            _xlsx_to_csv_streaming(input_file, csv_path, [sheet_name], False, paths={sheet_name: csv_path})
+        else:
+            import pandas as pd
+
+            with metrics.span("read", engine=engine, sheet=sheet_name):
+                df = pd.read_excel(input_file, sheet_name=sheet_name, engine=engine)
+            with metrics.span("write", sheet=sheet_name):
+                df.to_csv(csv_path, index=False)
+    return recorder.spans, recorder.started
+
+
+def _xlsx_to_csv_parallel(
+    input_file: str,
+    output_file: str,
+    sheets: list[str] | None,
+    all_sheets: bool,
+    workers: int,
+    engine: str,
+    streaming: bool,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Export the selected sheets in a process pool, one sheet per task.
+
+    The CSV paths are resolved here, over the whole workbook, so the files are
+    the ones a sequential export writes whichever worker finishes first.
+    """
+    import pandas as pd
+
+    with pd.ExcelFile(input_file, engine=engine) as book:
+        names = list(book.sheet_names)
+    paths = sheet_csv_paths(output_file, names)
+    if not all_sheets:
+        missing = [name for name in sheets if name not in names]
+        if missing:
+            raise ValueError(f"Worksheet(s) not found: {', '.join(missing)}")
+        names = list(dict.fromkeys(sheets))
+    logging.info(f"Exporting {len(names)} sheets with {min(workers, len(names))} workers: {input_file}")
+    with ProcessPoolExecutor(max_workers=min(workers, len(names))) as pool:
+        futures = [
+            pool.submit(_export_sheet, input_file, paths[name], name, engine, streaming) for name in names
+        ]
+        done = 0
+        for future in as_completed(futures):
+            spans, started = future.result()
+            metrics.merge(spans, started)
+            done += 1
+            if progress:
+                progress(done, len(names))
+
+
+def _xlsx_to_csv_streaming(
+    input_file: str,
+    output_file: str,
+    sheets: list[str] | None,
+    all_sheets: bool,
+    progress: ProgressCallback | None = None,
+    paths: dict[str, str] | None = None,
+) -> None:
+    """Iterate rows lazily from a read-only workbook and write CSV incrementally.
+
+    Sheets are written to ``paths`` when given, else to their :func:`sheet_csv_paths` files.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        if paths is None:
+            paths = sheet_csv_paths(output_file, wb.sheetnames)
+        if all_sheets:
+            targets = list(paths.items())
+        elif sheets:
+            missing = [name for name in sheets if name not in wb.sheetnames]
+            if missing:
+                raise ValueError(f"Worksheet(s) not found: {', '.join(missing)}")
+            targets = [(name, paths[name]) for name in sheets]
+        else:
+            targets = [(wb.sheetnames[0], output_file)]
+
+        # sheet dimensions give the row count up front when the workbook records them
+        max_rows = [wb[name].max_row for name, _ in targets]
+        total = sum(max_rows) if all(max_rows) else None
+        done = 0
+        for sheet_name, csv_path in targets:
+            ws = wb[sheet_name]
+            with metrics.span("stream", sheet=sheet_name), open(csv_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                width = None
+                for row in ws.iter_rows(values_only=True):
+                    if width is None:
+                        width = len(row)
+                    values = ["" if v is None else v for v in row]
+                    # read-only sheets may yield short rows; pad them to the header width
+                    if len(values) < width:
+                        values.extend([""] * (width - len(values)))
+                    writer.writerow(values)
+                    done += 1
+                    if progress and done % PROGRESS_ROWS == 0:
+                        progress(done, total)
+            logging.info(f"Streamed sheet '{sheet_name}' -> {csv_path}")
+        if progress:
+            progress(done, done)
+    finally:
+        wb.close()
+
+
+# rows of a CSV sampled to infer its schema
+SCHEMA_SAMPLE_ROWS = 10_000
+# an inferred text column is read as categorical when at most this share of its sampled values are distinct
+CATEGORY_MAX_RATIO = 0.5
+CSV_ENGINES = ("c", "python", "pyarrow")
+# rows in an Excel sheet, header included
+EXCEL_MAX_ROWS = 1_048_576
+SHARD_MODES = ("sheets", "files")
+
+
+def load_csv_schema(path: str) -> dict[str, str]:
+    """Read a schema file: a JSON object mapping column names to pandas dtypes."""
+    with open(path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    if not isinstance(schema, dict) or not all(isinstance(v, str) for v in schema.values()):
+        raise ValueError(f"Schema {path} must map column names to dtype names")
+    return schema
+
+
+def infer_csv_schema(input_file: str, sample_rows: int = SCHEMA_SAMPLE_ROWS) -> dict[str, str]:
+    """Infer column dtypes from the first ``sample_rows`` rows of a CSV.
+
+    Integer and boolean columns get nullable dtypes, so gaps further down do
+    not break them. Text columns with few distinct values are read as
+    categoricals.
+    """
+    import pandas as pd
+
+    sample = pd.read_csv(input_file, nrows=sample_rows)
+    schema = {}
+    for column in sample.columns:
+        values = sample[column]
+        kind = values.dtype.kind
+        if kind in "iu":
+            schema[column] = "Int64"
+        elif kind == "f":
+            schema[column] = "float64"
+        elif kind == "b":
+            schema[column] = "boolean"
+        elif kind == "O":
+            present = values.count()
+            unique = values.nunique()
+            schema[column] = "category" if present and unique <= present * CATEGORY_MAX_RATIO else "object"
+    return schema
+
+
+def _schema_cache_path(input_file: str) -> str:
+    """Cache file of the inferred schema for CSVs with the same header line as ``input_file``."""
+    with open(input_file, "rb") as f:
+        header = f.readline()
+    digest = hashlib.sha256(header.rstrip(b"\r\n")).hexdigest()
+    return os.path.join(cache.default_cache_dir(), "schemas", f"{digest}.json")
+
+
+def _csv_schema(
+    input_file: str, schema: str | dict[str, str] | None, infer_schema: bool
+) -> tuple[dict[str, str] | None, str | None]:
+    """Return the dtypes to read ``input_file`` with and, when they were inferred, their cache file."""
+    if schema is not None:
+        return (load_csv_schema(schema) if isinstance(schema, str) else dict(schema)), None
+    if not infer_schema:
+        return None, None
+    path = _schema_cache_path(input_file)
+    try:
+        dtypes = load_csv_schema(path)
+        metrics.event("schema_cache_hit")
+        return dtypes, path
+    except (OSError, ValueError):
+        pass
+    with metrics.span("infer_schema"):
+        dtypes = infer_csv_schema(input_file)
+    metrics.event("schema_inferred")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dtypes, f)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logging.warning(f"Could not cache the schema of {input_file}: {exc}")
+    return dtypes, path
+
+
+def _csv_engine(engine: str, streaming: bool = False) -> str:
+    """Return the pandas CSV engine to use, falling back to ``"c"`` where pyarrow cannot be."""
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine: {engine} (expected one of {', '.join(CSV_ENGINES)})")
+    if engine != "pyarrow":
+        return engine
+    if streaming:
+        # pandas cannot read in chunks with the pyarrow engine
+        logging.info("Streaming reads the CSV in chunks with the C engine")
+        return "c"
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logging.warning("pyarrow is not installed; parsing the CSV with the C engine")
+        return "c"
+    return engine
+
+
+def _read_options(dtypes: dict[str, str] | None) -> dict[str, Any]:
+    """``pd.read_csv`` keyword arguments for a schema; datetime columns are parsed, not cast."""
+    if not dtypes:
+        return {}
+    dates = [column for column, dtype in dtypes.items() if dtype.startswith("datetime")]
+    options: dict[str, Any] = {"dtype": {c: d for c, d in dtypes.items() if c not in dates}}
+    if dates:
+        options["parse_dates"] = dates
+    return options
+
+
+class _SchemaMismatch(ValueError):
+    """The CSV does not parse with the dtypes it was read with."""
+
+
+@contextlib.contextmanager
+def _schema_errors(dtypes: dict[str, str] | None) -> Iterator[None]:
+    """Raise parse failures under ``dtypes`` as ``_SchemaMismatch``."""
+    try:
+        yield
+    except (ValueError, TypeError) as exc:
+        if not dtypes:
+            raise
+        raise _SchemaMismatch(str(exc)) from exc
+
+
+def _csv_chunks(
+    source: Any, chunksize: int, dtypes: dict[str, str] | None, engine: str = "c"
+) -> Iterator[Any]:
+    """Yield ``pd.read_csv`` chunks of ``source``; only the parsing is checked against ``dtypes``."""
+    import pandas as pd
+
+    with _schema_errors(dtypes):
+        reader = pd.read_csv(source, chunksize=chunksize, engine=engine, **_read_options(dtypes))
+    with reader:
+        while True:
+            with _schema_errors(dtypes):
+                chunk = next(reader, None)
+            if chunk is None:
+                return
+            yield chunk
+
+
+def csv_to_xlsx(
+    input_file: str,
+    output_file: str,
+    streaming: bool = False,
+    chunksize: int = 50_000,
+    engine: str = "c",
+    schema: str | dict[str, str] | None = None,
+    infer_schema: bool = False,
+    shard: str | None = None,
+    shard_rows: int | None = None,
+    shard_mb: float | None = None,
+    workers: int = 1,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Convert a CSV to .xlsx.
+
+    ``engine`` picks the pandas parser; ``"pyarrow"`` parses on several
+    threads when pyarrow is installed (the C engine is used otherwise, and
+    when ``streaming`` or ``shard`` read in chunks, which pyarrow cannot). ``schema`` (a JSON file or dict of column
+    dtypes) skips type inference. With ``infer_schema`` the dtypes are
+    inferred from a sample once and cached per header line, so later files of
+    the same layout reuse them. Columns with few distinct values become
+    categoricals.
+
+    An Excel sheet holds 1,048,575 data rows. ``shard`` (``"sheets"`` or
+    ``"files"``) streams the rows into shards of at most that many, or
+    ``shard_rows``, rows and, with ``shard_mb``, about that much input each;
+    see :func:`_csv_to_xlsx_sharded`. File shards are written by ``workers``
+    processes at a time.
+    """
     try:
         if not input_file.lower().endswith(".csv"):
             raise ValueError("Input file must be a .csv file")
-        df = pd.read_csv(input_file)
-        df.to_excel(output_file, index=False)
+        if shard_rows is not None and shard_rows < 1:
+            raise ValueError(f"shard_rows must be at least 1, got {shard_rows}")
+        if shard_mb is not None and shard_mb <= 0:
+            raise ValueError(f"shard_mb must be positive, got {shard_mb:g}")
+        import pandas as pd
+
+        engine = _csv_engine(engine, streaming or bool(shard))
+        dtypes, cached = _csv_schema(input_file, schema, infer_schema)
+
+        def convert(dtypes: dict[str, str] | None) -> None:
+            if shard:
+                _csv_to_xlsx_sharded(
+                    input_file, output_file, shard, chunksize, shard_rows, shard_mb, workers, progress, dtypes,
+                    engine,
+                )
+                return
+            if streaming:
+                _csv_to_xlsx_streaming(input_file, output_file, chunksize, progress, dtypes, engine)
+                return
+            with metrics.span("read"), _schema_errors(dtypes):
+                df = pd.read_csv(input_file, engine=engine, **_read_options(dtypes))
+            if len(df) > EXCEL_MAX_ROWS - 1:
+                raise ValueError(
+                    f"{input_file} has {len(df):,} data rows, more than the {EXCEL_MAX_ROWS - 1:,} an Excel "
+                    "sheet holds; shard it across sheets or files"
+                )
+            if progress:
+                progress(0, len(df))
+            with metrics.span("write"):
+                df.to_excel(output_file, index=False)
+            if progress:
+                progress(len(df), len(df))
+
+        try:
+            convert(dtypes)
+        except _SchemaMismatch as schema_exc:
+            if cached is None:
+                raise
+            # the file no longer matches the layout its header promised
+            logging.warning(f"Cached schema does not fit {input_file} ({schema_exc}); inferring types instead")
+            metrics.event("schema_mismatch")
+            try:
+                os.unlink(cached)
+            except OSError:
+                pass
+            convert(None)
         logging.info(f"Converted CSV to Excel: {input_file} -> {output_file}")
     except Exception as e:
         logging.error(f"Error converting CSV to Excel: {e}")
         raise
+
+
+def _append_frame(ws: Any, frame: Any) -> None:
+    """Append the rows of a DataFrame to a write-only worksheet."""
+    # missing values become empty cells, as with DataFrame.to_excel
+    frame = frame.astype(object).where(frame.notna(), None)
+    for row in frame.itertuples(index=False, name=None):
+        ws.append(row)
+
+
+def _csv_to_xlsx_streaming(
+    input_file: str,
+    output_file: str,
+    chunksize: int,
+    progress: ProgressCallback | None = None,
+    dtypes: dict[str, str] | None = None,
+    engine: str = "c",
+) -> None:
+    """Write the CSV through a write-only workbook, ``chunksize`` rows at a time.
+
+    Only one chunk is held in memory; openpyxl spills written rows to disk.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    header_written = False
+    rows = 0
+    with metrics.span("stream"):
+        for chunk in _csv_chunks(input_file, chunksize, dtypes, engine):
+            if not header_written:
+                ws.append([str(col) for col in chunk.columns])
+                header_written = True
+            rows += len(chunk)
+            if rows > EXCEL_MAX_ROWS - 1:
+                # fail on the first chunk past the limit, not after reading the whole file
+                ws.close()
+                raise ValueError(
+                    f"{input_file} has more than {EXCEL_MAX_ROWS - 1:,} data rows, the most an Excel "
+                    "sheet holds; shard it across sheets or files"
+                )
+            _append_frame(ws, chunk)
+            if progress:
+                # the row count of a CSV is only known once it has been read
+                progress(rows, None)
+    with metrics.span("save"):
+        wb.save(output_file)
+    if progress:
+        progress(rows, rows)
+
+
+def shard_xlsx_path(output_file: str, number: int) -> str:
+    """Return the path of shard ``number`` (1-based) when sharding to files: ``<output stem>_part001.xlsx``."""
+    root, ext = os.path.splitext(output_file)
+    return f"{root}_part{number:03d}{ext or '.xlsx'}"
+
+
+def shard_manifest_path(output_file: str) -> str:
+    """Return the path of the JSON manifest listing the shard files: ``<output stem>_manifest.json``."""
+    return f"{os.path.splitext(output_file)[0]}_manifest.json"
+
+
+def _shard_pieces(
+    input_file: str,
+    chunksize: int,
+    dtypes: dict[str, str] | None,
+    max_rows: int,
+    max_bytes: int | None,
+    engine: str = "c",
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(shard number, rows)`` as the CSV streams in.
+
+    A shard closes at ``max_rows`` data rows, or at the first chunk boundary
+    after ``max_bytes`` of input went into it.
+    """
+    shard, rows_in_shard, shard_start, full = 1, 0, 0, False
+    with open(input_file, "rb") as f:
+        for chunk in _csv_chunks(f, chunksize, dtypes, engine):
+            start = 0
+            while start < len(chunk):
+                if full or rows_in_shard == max_rows:
+                    shard, rows_in_shard, full = shard + 1, 0, False
+                take = min(len(chunk) - start, max_rows - rows_in_shard)
+                yield shard, chunk.iloc[start : start + take]
+                rows_in_shard += take
+                start += take
+            # the parser reads ahead in blocks, so this is the input consumed to within a block
+            position = f.tell()
+            if max_bytes and position - shard_start >= max_bytes:
+                full, shard_start = True, position
+
+
+def _write_shard_file(spill: str, output_file: str, header: list[str]) -> None:
+    """Worker: write the frames pickled to ``spill`` to a workbook of their own, then delete the spill."""
+    import pickle
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(header)
+    try:
+        with open(spill, "rb") as f:
+            while True:
+                try:
+                    frame = pickle.load(f)
+                except EOFError:
+                    break
+                _append_frame(ws, frame)
+        wb.save(output_file)
+    finally:
+        os.unlink(spill)
+
+
+def _csv_to_xlsx_sharded(
+    input_file: str,
+    output_file: str,
+    shard: str,
+    chunksize: int,
+    shard_rows: int | None = None,
+    shard_mb: float | None = None,
+    workers: int = 1,
+    progress: ProgressCallback | None = None,
+    dtypes: dict[str, str] | None = None,
+    engine: str = "c",
+) -> None:
+    """Stream the CSV into shards of at most ``shard_rows`` rows (and about ``shard_mb`` MB of input).
+
+    ``shard="sheets"`` writes one workbook with an "Index" sheet followed by
+    Sheet1, Sheet2, ...; ``shard="files"`` writes ``shard_xlsx_path`` files,
+    ``workers`` of them at a time, a ``shard_manifest_path`` JSON manifest
+    and, last, a workbook at ``output_file`` whose "Index" sheet lists them.
+    """
+    import pickle
+    from openpyxl import Workbook
+
+    if shard not in SHARD_MODES:
+        raise ValueError(f"Unknown shard mode: {shard} (expected one of {', '.join(SHARD_MODES)})")
+    max_rows = min(shard_rows or EXCEL_MAX_ROWS - 1, EXCEL_MAX_ROWS - 1)
+    max_bytes = int(shard_mb * 1024 * 1024) if shard_mb else None
+    parallel = shard == "files" and workers > 1
+
+    shards: list[dict[str, Any]] = []
+    header: list[str] = []
+    wb = ws = spill = None
+    pool = ProcessPoolExecutor(max_workers=workers) if parallel else None
+    futures = []
+    spills: list[str] = []
+    if shard == "sheets":
+        wb = Workbook(write_only=True)
+        index = wb.create_sheet("Index")
+
+    def finish_shard() -> None:
+        nonlocal wb, spill
+        if shard == "files":
+            path = shard_xlsx_path(output_file, len(shards))
+            if parallel:
+                spill.close()
+                futures.append(pool.submit(_write_shard_file, spill.name, path, header))
+            else:
+                with metrics.span("save", shard=len(shards)):
+                    wb.save(path)
+                wb = None
+        spill = None
+
+    rows = 0
+    try:
+        with metrics.span("stream"):
+            for number, piece in _shard_pieces(input_file, chunksize, dtypes, max_rows, max_bytes, engine):
+                if number > len(shards):
+                    if shards:
+                        finish_shard()
+                    header = [str(col) for col in piece.columns]
+                    name = f"Sheet{number}" if shard == "sheets" else os.path.basename(shard_xlsx_path(output_file, number))
+                    shards.append({"name": name, "first_row": rows + 1, "last_row": rows, "rows": 0})
+                    if parallel:
+                        spill = tempfile.NamedTemporaryFile(
+                            dir=os.path.dirname(os.path.abspath(output_file)), suffix=".shard", delete=False
+                        )
+                        spills.append(spill.name)
+                    else:
+                        if shard == "files":
+                            wb = Workbook(write_only=True)
+                        ws = wb.create_sheet("Sheet1" if shard == "files" else name)
+                        ws.append(header)
+                if parallel:
+                    pickle.dump(piece, spill, protocol=pickle.HIGHEST_PROTOCOL)
+                else:
+                    _append_frame(ws, piece)
+                rows += len(piece)
+                shards[-1]["rows"] += len(piece)
+                shards[-1]["last_row"] = rows
+                if progress:
+                    progress(rows, None)
+            if shards:
+                finish_shard()
+        for future in as_completed(futures):
+            future.result()
+    except BaseException:
+        if spill is not None:
+            spill.close()
+        raise
+    finally:
+        if pool is not None:
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+            # workers delete the spills they wrote; the rest belong to shards that never ran
+            for name in spills:
+                if os.path.exists(name):
+                    os.unlink(name)
+
+    metrics.event("shards", len(shards))
+    if shard == "files":
+        manifest = {
+            "input": os.path.abspath(input_file),
+            "rows": rows,
+            "columns": header,
+            "shards": [
+                {"file": s["name"], "first_row": s["first_row"], "last_row": s["last_row"], "rows": s["rows"]}
+                for s in shards
+            ],
+        }
+        path = shard_manifest_path(output_file)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, path)
+        wb = Workbook(write_only=True)
+        index = wb.create_sheet("Index")
+    index.append(["Sheet" if shard == "sheets" else "File", "First row", "Last row", "Rows"])
+    for s in shards:
+        index.append([s["name"], s["first_row"], s["last_row"], s["rows"]])
+    with metrics.span("save"):
+        wb.save(output_file)
+    logging.info(f"Wrote {rows} rows in {len(shards)} shard(s) ({shard}): {input_file} -> {output_file}")
+    if progress:
+        progress(rows, rows)
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 from PyQt5 import QtWidgets, QtGui, QtCore
 import sys
 import os
-from . import converters
+import time
+from collections import deque
+from . import cache, cli, converters, jobs
 
 from typing import Callable
 from typing import Any
@@ -12,14 +16,22 @@ class ConverterGUI(QtWidgets.QWidget):
         super().__init__()
         self.init_ui()
         self.setAcceptDrops(True)
-        # placeholders for worker thread and progress timer
-        self._worker_thread: QtCore.QThread | None = None
-        self._progress_timer: QtCore.QTimer | None = None
+        # the single conversion started from the buttons, run in a child process
+        self._conversion: jobs.ChildConversion | None = None
+        self._cache: cache.ConversionCache | None = None
+        # queued jobs by id: the child conversion, its row items and progress bar
+        self._jobs: dict[int, dict[str, Any]] = {}
+        self._pending: deque[int] = deque()
+        self._next_job_id = 0
+        # children are polled for progress and results; polling never blocks the GUI
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(100)
+        self._poll_timer.timeout.connect(self.poll_jobs)
 
     def init_ui(self) -> None:
         self.setWindowTitle("Docify - File Converter")
         self.setWindowIcon(QtGui.QIcon())
-        self.setGeometry(100, 100, 650, 480)
+        self.setGeometry(100, 100, 760, 780)
         self.setStyleSheet(
             """
             QWidget {
@@ -106,6 +118,29 @@ class ConverterGUI(QtWidgets.QWidget):
         word_row.addStretch()
         layout.addLayout(word_row)
 
+        # Option: text-only PDF→DOCX (no layout reconstruction)
+        text_row = QtWidgets.QHBoxLayout()
+        self.text_only_checkbox = QtWidgets.QCheckBox("PDF → Word: text only (fast)")
+        self.text_only_checkbox.setToolTip(
+            "Extract searchable text without rebuilding the page layout, tables or images."
+        )
+        text_row.addWidget(self.text_only_checkbox)
+        text_row.addStretch()
+        layout.addLayout(text_row)
+
+        # Option: reuse outputs of identical earlier conversions
+        cache_row = QtWidgets.QHBoxLayout()
+        self.cache_checkbox = QtWidgets.QCheckBox("Use conversion cache")
+        self.cache_checkbox.setToolTip(
+            "Reuse the stored output when the same file is converted again with the same options."
+        )
+        cache_row.addWidget(self.cache_checkbox)
+        self.cache_label = QtWidgets.QLabel("")
+        self.cache_label.setStyleSheet("color: #353b48; font-size: 13px;")
+        cache_row.addWidget(self.cache_label)
+        cache_row.addStretch()
+        layout.addLayout(cache_row)
+
         self.status = QtWidgets.QLabel("")
         self.status.setAlignment(QtCore.Qt.AlignCenter)
         self.status.setStyleSheet("color: #353b48; margin: 16px; font-size: 15px;")
@@ -130,6 +165,12 @@ class ConverterGUI(QtWidgets.QWidget):
         self.percent_label.setVisible(False)
         progress_row.addWidget(self.percent_label)
 
+        self.btn_cancel = QtWidgets.QPushButton("Cancel")
+        self.btn_cancel.setStyleSheet(self.button_style(accent=True))
+        self.btn_cancel.clicked.connect(self.cancel_conversion)
+        self.btn_cancel.setVisible(False)
+        progress_row.addWidget(self.btn_cancel)
+
         layout.addLayout(progress_row)
 
         btns_layout = QtWidgets.QHBoxLayout()
@@ -144,17 +185,15 @@ class ConverterGUI(QtWidgets.QWidget):
 
         btn_pdf2word = QtWidgets.QPushButton("PDF → Word")
         btn_pdf2word.setStyleSheet(self.button_style(color="#0984e3"))
-        # Wrap pdf_to_word to pass preserve flags and set output ext to .docx
+        # Pass preserve flags to pdf_to_word and set output ext to .docx
         btn_pdf2word.clicked.connect(
             lambda: self.run_conversion(
-                lambda a, b: converters.pdf_to_word(
-                    a,
-                    b,
-                    preserve_images=True,
-                    preserve_tables=True,
-                    prefer_word=self.word_checkbox.isChecked(),
-                ),
+                converters.pdf_to_word,
                 ".docx",
+                preserve_images=True,
+                preserve_tables=True,
+                prefer_word=self.word_checkbox.isChecked(),
+                text_only=self.text_only_checkbox.isChecked(),
             )
         )
         btns_layout.addWidget(btn_pdf2word)
@@ -172,8 +211,51 @@ class ConverterGUI(QtWidgets.QWidget):
             lambda: self.run_conversion(converters.csv_to_xlsx, ".xlsx")
         )
         btns_layout.addWidget(btn_csv2xlsx)
+        self.conversion_buttons = [btn_word2pdf, btn_pdf2word, btn_xlsx2csv, btn_csv2xlsx]
 
         layout.addLayout(btns_layout)
+
+        # Job queue: dropped files and folders are converted on a bounded worker pool
+        queue_label = QtWidgets.QLabel("Queue — drop files or folders here")
+        queue_label.setStyleSheet("color: #1e272e; font-size: 15px; font-weight: 600;")
+        layout.addWidget(queue_label)
+
+        self.queue_table = QtWidgets.QTableWidget(0, 6)
+        self.queue_table.setHorizontalHeaderLabels(["File", "Conversion", "Status", "Progress", "Elapsed", ""])
+        self.queue_table.verticalHeader().setVisible(False)
+        self.queue_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.queue_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        header = self.queue_table.horizontalHeader()
+        header.setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        for column in range(1, 6):
+            header.setSectionResizeMode(column, QtWidgets.QHeaderView.ResizeToContents)
+        self.queue_table.setStyleSheet(
+            "QTableWidget { background: #f7f1e3; border-radius: 8px; font-size: 13px; }"
+        )
+        layout.addWidget(self.queue_table)
+
+        queue_row = QtWidgets.QHBoxLayout()
+        btn_add_files = QtWidgets.QPushButton("Add files")
+        btn_add_files.setStyleSheet(self.button_style(accent=True))
+        btn_add_files.clicked.connect(self.browse_queue_files)
+        queue_row.addWidget(btn_add_files)
+        btn_add_folder = QtWidgets.QPushButton("Add folder")
+        btn_add_folder.setStyleSheet(self.button_style(accent=True))
+        btn_add_folder.clicked.connect(self.browse_queue_folder)
+        queue_row.addWidget(btn_add_folder)
+        btn_clear = QtWidgets.QPushButton("Clear finished")
+        btn_clear.setStyleSheet(self.button_style(accent=True))
+        btn_clear.clicked.connect(self.clear_finished)
+        queue_row.addWidget(btn_clear)
+        queue_row.addStretch()
+        queue_row.addWidget(QtWidgets.QLabel("Parallel jobs:"))
+        self.jobs_spin = QtWidgets.QSpinBox()
+        self.jobs_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.jobs_spin.setValue(min(4, self.jobs_spin.maximum()))
+        self.jobs_spin.valueChanged.connect(lambda n: self.start_pending())
+        queue_row.addWidget(self.jobs_spin)
+        layout.addLayout(queue_row)
+
         self.setLayout(layout)
 
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent) -> None:
@@ -184,10 +266,8 @@ class ConverterGUI(QtWidgets.QWidget):
 
     def dropEvent(self, event: QtGui.QDropEvent) -> None:
         if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if urls:
-                file_path = urls[0].toLocalFile()
-                self.input_path.setText(file_path)
+            paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+            self.enqueue(paths)
             event.acceptProposedAction()
         else:
             event.ignore()
@@ -218,6 +298,194 @@ class ConverterGUI(QtWidgets.QWidget):
         if path:
             self.output_path.setText(path)
 
+    def browse_queue_files(self) -> None:
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "Add files to the queue")
+        self.enqueue(paths)
+
+    def browse_queue_folder(self) -> None:
+        path = QtWidgets.QFileDialog.getExistingDirectory(self, "Add a folder to the queue")
+        if path:
+            self.enqueue([path])
+
+    def enqueue(self, paths: list[str]) -> None:
+        """Queue every convertible file among ``paths`` (folders are searched recursively)."""
+        by_ext = {in_ext: (command, out_ext) for command, (_, in_ext, out_ext) in converters.CONVERSIONS.items()}
+        out = self.output_path.text()
+        # with a folder as output, results are mirrored under it; otherwise they go next to their input
+        output_dir = out if out and os.path.isdir(out) else None
+        added = skipped = 0
+        for path in paths:
+            if os.path.isdir(path):
+                found = ((f, path) for f in cli.scan_folder(path, tuple(by_ext), recursive=True))
+            else:
+                found = iter([(path, os.path.dirname(path))])
+            for inp, root in found:
+                ext = os.path.splitext(inp)[1].lower()
+                if ext not in by_ext:
+                    skipped += 1
+                    continue
+                command, out_ext = by_ext[ext]
+                self.add_job(command, inp, cli.output_path_for(inp, root, out_ext, output_dir))
+                added += 1
+        message = f"Queued {added} file(s)"
+        if skipped:
+            message += f", skipped {skipped} with an unsupported extension"
+        self.status.setText(message)
+        self.status.setStyleSheet("color: #353b48; margin: 16px; font-size: 15px;")
+
+    def job_options(self, command: str) -> dict[str, Any]:
+        """Options for a queued ``command``, taken from the checkboxes when it is queued."""
+        if command == "pdf2word":
+            return {
+                "preserve_images": True,
+                "preserve_tables": True,
+                "prefer_word": self.word_checkbox.isChecked(),
+                "text_only": self.text_only_checkbox.isChecked(),
+            }
+        return {}
+
+    def add_job(self, command: str, inp: str, out: str) -> None:
+        func: Callable[..., Any] = getattr(converters, converters.CONVERSIONS[command][0])
+        if self.cache_checkbox.isChecked():
+            func = self.conversion_cache().wrap(func)
+        job_id = self._next_job_id
+        self._next_job_id += 1
+
+        row = self.queue_table.rowCount()
+        self.queue_table.insertRow(row)
+        name_item = QtWidgets.QTableWidgetItem(os.path.basename(inp))
+        name_item.setToolTip(f"{inp} → {out}")
+        status_item = QtWidgets.QTableWidgetItem("Queued")
+        elapsed_item = QtWidgets.QTableWidgetItem("")
+        bar = QtWidgets.QProgressBar()
+        bar.setRange(0, 100)
+        bar.setValue(0)
+        bar.setFixedHeight(14)
+        btn_cancel = QtWidgets.QPushButton("Cancel")
+        btn_cancel.clicked.connect(lambda: self.cancel_job(job_id))
+        self.queue_table.setItem(row, 0, name_item)
+        self.queue_table.setItem(row, 1, QtWidgets.QTableWidgetItem(command))
+        self.queue_table.setItem(row, 2, status_item)
+        self.queue_table.setCellWidget(row, 3, bar)
+        self.queue_table.setItem(row, 4, elapsed_item)
+        self.queue_table.setCellWidget(row, 5, btn_cancel)
+        self._jobs[job_id] = {
+            "job": jobs.ChildConversion(func, inp, out, self.job_options(command)),
+            "item": name_item,
+            "status": status_item,
+            "elapsed": elapsed_item,
+            "bar": bar,
+            "cancel": btn_cancel,
+            "finished": False,
+        }
+        self._pending.append(job_id)
+        self.start_pending()
+
+    def start_pending(self) -> None:
+        """Start queued jobs while fewer than "Parallel jobs" are running."""
+        running = sum(1 for e in self._jobs.values() if e["job"].running)
+        while self._pending and running < self.jobs_spin.value():
+            entry = self._jobs[self._pending.popleft()]
+            try:
+                entry["job"].start()
+            except Exception as exc:  # noqa: BLE001 - shown in the queue view
+                self.finish_job(entry, False, f"Could not start conversion: {exc}")
+                continue
+            entry["status"].setText("Running")
+            running += 1
+        if running and not self._poll_timer.isActive():
+            self._poll_timer.start()
+
+    def poll_jobs(self) -> None:
+        """Apply progress and results streamed back by the running child processes."""
+        now = time.monotonic()
+        for entry in self._jobs.values():
+            job = entry["job"]
+            if not job.running:
+                continue
+            for message in job.poll():
+                if message[0] == "progress":
+                    self.show_job_progress(entry["bar"], message[1], message[2])
+                elif message[0] == "done":
+                    text = os.path.basename(job.output_file)
+                    if message[1]:
+                        text += f" (pages as plain text: {', '.join(map(str, message[1]))})"
+                    self.finish_job(entry, True, text)
+                else:
+                    self.finish_job(entry, False, message[1])
+            if job.running:
+                entry["elapsed"].setText(f"{now - job.started:.0f}s")
+        self.poll_conversion()
+        self.start_pending()
+        if self._conversion is None and not any(e["job"].running for e in self._jobs.values()):
+            self._poll_timer.stop()
+
+    def show_job_progress(self, bar: QtWidgets.QProgressBar, done: int, total: int | None) -> None:
+        if total:
+            bar.setRange(0, total)
+            bar.setValue(min(done, total))
+            bar.setFormat("%p%")
+        else:
+            # unknown total (e.g. streamed CSV rows): busy bar plus a running count
+            bar.setRange(0, 0)
+            bar.setFormat(f"{done:,}")
+
+    def finish_job(self, entry: dict[str, Any], success: bool, message: str, status: str | None = None) -> None:
+        entry["finished"] = True
+        job = entry["job"]
+        if job.started is not None:
+            entry["elapsed"].setText(f"{time.monotonic() - job.started:.1f}s")
+        bar = entry["bar"]
+        bar.setRange(0, 100)
+        bar.setValue(100 if success else 0)
+        entry["status"].setText(status or ("Done" if success else "Failed"))
+        entry["status"].setForeground(QtGui.QColor("#44bd32" if success else "#e84118"))
+        entry["status"].setToolTip(message)
+        entry["cancel"].setEnabled(False)
+        if self.cache_checkbox.isChecked():
+            self.update_cache_label()
+        if all(e["finished"] for e in self._jobs.values()):
+            done = sum(1 for e in self._jobs.values() if e["status"].text() == "Done")
+            self.status.setText(f"Queue finished: {done} done, {len(self._jobs) - done} failed or cancelled")
+
+    def cancel_job(self, job_id: int) -> None:
+        entry = self._jobs.get(job_id)
+        if entry is None or entry["finished"]:
+            return
+        if job_id in self._pending:
+            self._pending.remove(job_id)
+        entry["job"].cancel()
+        self.finish_job(entry, False, "Cancelled", status="Cancelled")
+        self.start_pending()
+
+    def clear_finished(self) -> None:
+        for job_id, entry in list(self._jobs.items()):
+            if entry["finished"]:
+                self.queue_table.removeRow(entry["item"].row())
+                del self._jobs[job_id]
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        # nothing outlives the window: queued jobs are dropped, running ones killed
+        self._pending.clear()
+        for entry in self._jobs.values():
+            entry["job"].cancel()
+        if self._conversion is not None:
+            self._conversion.cancel()
+        super().closeEvent(event)
+
+    def conversion_cache(self) -> cache.ConversionCache:
+        """Return the shared conversion cache, creating it on first use."""
+        if self._cache is None:
+            self._cache = cache.ConversionCache()
+        return self._cache
+
+    def update_cache_label(self) -> None:
+        stats = self.conversion_cache().stats()
+        self.cache_label.setText(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  "
+            f"({stats['bytes'] / (1024 * 1024):.1f} MB cached)"
+        )
+
     def install_pywin32(self) -> None:
         """Install pywin32 package via pip in a background thread."""
         reply = QtWidgets.QMessageBox.question(
@@ -286,7 +554,10 @@ class ConverterGUI(QtWidgets.QWidget):
         worker.start()
 
     def run_conversion(
-        self, func: Callable[[str, str], None], output_ext: str | None = None
+        self,
+        func: Callable[..., None],
+        output_ext: str | None = None,
+        **kwargs: Any,
     ) -> None:
         inp = self.input_path.text()
         out = self.output_path.text()
@@ -308,97 +579,106 @@ class ConverterGUI(QtWidgets.QWidget):
         # Prepare UI for conversion
         self.status.setText("Converting...")
         self.status.setStyleSheet("color: #353b48; font-size: 15px;")
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
         self.percent_label.setText("0%")
         self.percent_label.setVisible(True)
         QtCore.QCoreApplication.processEvents()
 
-        # Disable buttons while running
-        for btn in self.findChildren(QtWidgets.QPushButton):
+        # Disable the conversion buttons while running; the queue keeps working
+        for btn in self.conversion_buttons:
             btn.setEnabled(False)
 
-        # Worker thread to run the blocking conversion function
-        class ConversionWorker(QtCore.QThread):
-            finished_signal = QtCore.pyqtSignal(bool, str)
-
-            def __init__(self, fn: Any, a: str, b: str) -> None:
-                super().__init__()
-                self.fn = fn
-                self.a = a
-                self.b = b
-
-            def run(self) -> None:
-                try:
-                    self.fn(self.a, self.b)
-                    self.finished_signal.emit(True, os.path.basename(self.b))
-                except (
-                    Exception
-                ) as exc:  # noqa: BLE001 - keep broad catch to relay back to UI
-                    self.finished_signal.emit(False, str(exc))
-
-        # Create and start worker
-        worker = ConversionWorker(func, inp, out)
-        self._worker_thread = worker
-
-        # Timer to animate progress while worker is running
-        timer = QtCore.QTimer(self)
-        self._progress_timer = timer
-        timer.setInterval(60)
-
-        def advance_progress() -> None:
-            val = self.progress_bar.value()
-            if val < 95:
-                # gently step forward
-                self.progress_bar.setValue(val + 3)
-                self.percent_label.setText(f"{self.progress_bar.value()}%")
-
-        timer.timeout.connect(advance_progress)
+        if self.cache_checkbox.isChecked():
+            func = self.conversion_cache().wrap(func)
 
-        def on_finished(success: bool, message: str) -> None:
-            # stop timer and set progress to complete
-            if self._progress_timer and self._progress_timer.isActive():
-                self._progress_timer.stop()
-            self.progress_bar.setValue(100)
-            self.percent_label.setText("100%")
+        # Run the blocking conversion in a child process; poll_jobs relays its messages
+        self._conversion = jobs.ChildConversion(func, inp, out, kwargs)
+        try:
+            self._conversion.start()
+        except Exception as exc:  # noqa: BLE001 - shown to the user
+            self._conversion = None
+            self.conversion_finished(False, f"Could not start conversion: {exc}")
+            return
+        self.btn_cancel.setVisible(True)
+        self.btn_cancel.setEnabled(True)
+        self._poll_timer.start()
 
-            # Update status and font size on success or error
-            if success:
-                self.status.setText(f"Success: {message}")
-                # Make success message slightly larger and bold
-                self.status.setStyleSheet(
-                    "color: #44bd32; font-size: 17px; font-weight: 600; margin: 16px;"
-                )
-                QtWidgets.QMessageBox.information(
-                    self, "Conversion Complete", f"File saved as: {message}"
-                )
+    def poll_conversion(self) -> None:
+        conversion = self._conversion
+        if conversion is None:
+            return
+        for message in conversion.poll():
+            if message[0] == "progress":
+                self.show_conversion_progress(message[1], message[2])
+            elif message[0] == "done":
+                self._conversion = None
+                self.conversion_finished(True, os.path.basename(conversion.output_file))
             else:
-                self.status.setText(f"Error: {message}")
-                self.status.setStyleSheet(
-                    "color: #e84118; font-size: 15px; margin: 16px;"
-                )
-                QtWidgets.QMessageBox.critical(self, "Conversion Error", message)
+                self._conversion = None
+                self.conversion_finished(False, message[1])
+
+    def show_conversion_progress(self, done: int, total: int | None) -> None:
+        if total:
+            self.progress_bar.setRange(0, 100)
+            percent = min(100, done * 100 // total)
+            self.progress_bar.setValue(percent)
+            self.percent_label.setText(f"{percent}%")
+        else:
+            # unknown total (e.g. streamed CSV rows): busy bar plus a running count
+            self.progress_bar.setRange(0, 0)
+            self.percent_label.setText(f"{done:,}")
 
-            # Re-enable buttons
-            for btn in self.findChildren(QtWidgets.QPushButton):
-                btn.setEnabled(True)
+    def cancel_conversion(self) -> None:
+        if self._conversion is None:
+            return
+        self._conversion.cancel()
+        self._conversion = None
+        self.conversion_finished(False, "Cancelled", cancelled=True)
 
-            # hide progress after a short delay
-            QtCore.QTimer.singleShot(
-                900,
-                lambda: (
-                    self.progress_bar.setVisible(False),
-                    self.percent_label.setVisible(False),
-                ),
+    def conversion_finished(self, success: bool, message: str, cancelled: bool = False) -> None:
+        # set progress to complete
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100 if success else 0)
+        self.percent_label.setText("100%" if success else "")
+        self.btn_cancel.setVisible(False)
+
+        # Update status and font size on success or error
+        if success:
+            self.status.setText(f"Success: {message}")
+            # Make success message slightly larger and bold
+            self.status.setStyleSheet(
+                "color: #44bd32; font-size: 17px; font-weight: 600; margin: 16px;"
             )
-
-            # cleanup
-            self._worker_thread = None
-            self._progress_timer = None
-
-        worker.finished_signal.connect(on_finished)
-        timer.start()
-        worker.start()
+            QtWidgets.QMessageBox.information(
+                self, "Conversion Complete", f"File saved as: {message}"
+            )
+        elif cancelled:
+            self.status.setText("Conversion cancelled")
+            self.status.setStyleSheet("color: #353b48; font-size: 15px; margin: 16px;")
+        else:
+            self.status.setText(f"Error: {message}")
+            self.status.setStyleSheet(
+                "color: #e84118; font-size: 15px; margin: 16px;"
+            )
+            QtWidgets.QMessageBox.critical(self, "Conversion Error", message)
+
+        # Re-enable buttons
+        for btn in self.conversion_buttons:
+            btn.setEnabled(True)
+
+        if self.cache_checkbox.isChecked():
+            self.update_cache_label()
+
+        # hide progress after a short delay
+        QtCore.QTimer.singleShot(
+            900,
+            lambda: (
+                self.progress_bar.setVisible(False),
+                self.percent_label.setVisible(False),
+            ),
+        )
 
 
 def main() -> None:
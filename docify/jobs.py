@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Callable
+
+
+def _child(conn: Any, func: Callable[..., Any], input_file: str, output_file: str, options: dict[str, Any]) -> None:
+    """Run one conversion, sending ``("progress", done, total)`` messages, then ``("done", result)`` or ``("error", message)``."""
+    last = 0.0
+
+    def progress(done: int, total: int | None) -> None:
+        nonlocal last
+        # page and chunk callbacks can be frequent; a few updates a second is plenty for a progress bar
+        now = time.monotonic()
+        if now - last >= 0.05 or (total is not None and done >= total):
+            last = now
+            conn.send(("progress", done, total))
+
+    try:
+        result = func(input_file, output_file, progress=progress, **options)
+        conn.send(("done", result))
+    except BaseException as exc:
+        conn.send(("error", str(exc) or exc.__class__.__name__))
+    finally:
+        conn.close()
+
+
+class ChildConversion:
+    """One conversion running in its own process, with progress and its result streamed back over a pipe.
+
+    The process is spawned rather than forked, so it starts clean instead of
+    inheriting the caller's threads and memory. Whatever the backends leak is
+    given back to the OS when it exits. ``poll`` never blocks, so a GUI can
+    call it from a timer. ``cancel`` kills the process at once.
+    """
+
+    def __init__(self, func: Callable[..., Any], input_file: str, output_file: str, options: dict[str, Any] | None = None) -> None:
+        self.func = func
+        self.input_file = input_file
+        self.output_file = output_file
+        self.options = options or {}
+        self.started: float | None = None
+        self.finished = False
+        self._proc: Any = None
+        self._conn: Any = None
+        self._output_existed = False
+
+    def start(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe(duplex=False)
+        self._output_existed = os.path.exists(self.output_file)
+        self._proc = ctx.Process(
+            target=_child,
+            args=(child_conn, self.func, self.input_file, self.output_file, self.options),
+            name=f"docify-{getattr(self.func, '__name__', 'conversion')}",
+        )
+        self._proc.start()
+        child_conn.close()
+        self.started = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and not self.finished
+
+    def poll(self) -> list[tuple[Any, ...]]:
+        """Return the messages received since the last call without blocking.
+
+        The last message of a job is ``("done", result)`` or ``("error", message)``,
+        also when the process died without answering.
+        """
+        if not self.running:
+            return []
+        messages = []
+        try:
+            while self._conn.poll():
+                message = self._conn.recv()
+                messages.append(message)
+                if message[0] != "progress":
+                    self._close()
+                    return messages
+        except (EOFError, OSError):
+            self._proc.join()
+            messages.append(("error", f"Conversion process exited with code {self._proc.exitcode}"))
+            self._close()
+        return messages
+
+    def cancel(self) -> None:
+        """Kill the conversion and remove the partial output it created."""
+        if not self.running:
+            return
+        self._proc.kill()
+        self._close()
+        if not self._output_existed and os.path.exists(self.output_file):
+            try:
+                os.unlink(self.output_file)
+            except OSError as exc:
+                logging.warning(f"Could not remove partial output {self.output_file}: {exc}")
+        logging.info(f"Conversion cancelled: {self.input_file} -> {self.output_file}")
+
+    def _close(self) -> None:
+        self.finished = True
+        self._conn.close()
+        self._proc.join()
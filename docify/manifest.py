@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+
+from .cache import IGNORED_OPTIONS, file_digest
+
+
+MANIFEST_NAME = ".docify-manifest.json"
+
+
+def _normalise_options(options: dict[str, Any]) -> dict[str, Any]:
+    """Keep output-affecting options in a JSON-comparable form."""
+    relevant = {k: v for k, v in options.items() if k not in IGNORED_OPTIONS}
+    return json.loads(json.dumps(relevant, sort_keys=True, default=str))
+
+
+class BatchManifest:
+    """Per-folder record of converted inputs used by incremental batch runs.
+
+    Each entry stores the input's size, mtime and SHA-256, the conversion
+    name and options, and the output produced. An input is up to date when
+    its size and mtime are unchanged (or, if only the mtime moved, its hash
+    still matches) and the recorded output is still in place.
+    """
+
+    def __init__(self, folder: str, name: str = MANIFEST_NAME) -> None:
+        self.path = os.path.join(folder, name)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logging.warning(f"Ignoring unreadable batch manifest {self.path}: {exc}")
+
+    def is_up_to_date(
+        self, input_file: str, output_file: str, conversion: str, options: dict[str, Any]
+    ) -> bool:
+        """Return True if ``input_file`` was already converted to ``output_file`` this way."""
+        entry = self.entries.get(self._key(input_file))
+        if not entry:
+            return False
+        if entry.get("conversion") != conversion or entry.get("options") != _normalise_options(options):
+            return False
+        if entry.get("output") != os.path.basename(output_file):
+            return False
+        try:
+            st = os.stat(input_file)
+            out_st = os.stat(output_file)
+        except OSError:
+            return False
+        if out_st.st_size != entry.get("output_size"):
+            return False
+        if st.st_size != entry.get("size"):
+            return False
+        if st.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        # touched but maybe not modified: fall back to comparing content
+        if file_digest(input_file) != entry.get("sha256"):
+            return False
+        entry["mtime_ns"] = st.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def record(
+        self, input_file: str, output_file: str, conversion: str, options: dict[str, Any]
+    ) -> None:
+        """Remember a successful conversion of ``input_file``."""
+        st = os.stat(input_file)
+        out_st = os.stat(output_file)
+        self.entries[self._key(input_file)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": file_digest(input_file),
+            "conversion": conversion,
+            "options": _normalise_options(options),
+            "output": os.path.basename(output_file),
+            "output_size": out_st.st_size,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed."""
+        if not self._dirty:
+            return
+        folder = os.path.dirname(self.path) or "."
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "files": self.entries}, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._dirty = False
+
+    def _key(self, input_file: str) -> str:
+        folder = os.path.dirname(self.path) or "."
+        return os.path.relpath(input_file, folder).replace(os.sep, "/")
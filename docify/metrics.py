@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Callable, Iterator
+
+
+# The recorder of the conversion running in this thread/task, if any. Spans and
+# events outside a recording are dropped, so converters can be instrumented
+# unconditionally.
+_current: contextvars.ContextVar["Recorder | None"] = contextvars.ContextVar("docify_recorder", default=None)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _size(path: str) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class Recorder:
+    """Timing spans and event counts collected during one conversion."""
+
+    def __init__(self, conversion: str, input_file: str | None = None, output_file: str | None = None) -> None:
+        self.conversion = conversion
+        self.input_file = input_file
+        self.output_file = output_file
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self.events: dict[str, int] = defaultdict(int)
+        self.error: str | None = None
+        self.notes: dict[str, Any] = {}
+        self.seconds: float | None = None
+
+    def add_span(self, stage: str, start: float, seconds: float, **labels: Any) -> None:
+        """Record ``stage`` that began ``start`` seconds into the conversion."""
+        self.spans.append({"stage": stage, "start": round(start, 6), "seconds": round(seconds, 6), **labels})
+
+    def to_dict(self) -> dict[str, Any]:
+        record = {
+            "time": round(self.started, 3),
+            "conversion": self.conversion,
+            "input": self.input_file,
+            "output": self.output_file,
+            "ok": self.error is None,
+            "seconds": self.seconds,
+            "bytes_in": _size(self.input_file) if self.input_file else None,
+            "bytes_out": _size(self.output_file) if self.output_file and self.error is None else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "pid": os.getpid(),
+            "spans": self.spans,
+            "events": dict(self.events),
+        }
+        if self.notes:
+            record["notes"] = self.notes
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+
+@contextlib.contextmanager
+def span(stage: str, **labels: Any) -> Iterator[None]:
+    """Time the enclosed block as ``stage`` of the current conversion."""
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        labels["failed"] = True
+        raise
+    finally:
+        recorder.add_span(stage, t0 - recorder._t0, time.perf_counter() - t0, **labels)
+
+
+def event(name: str, amount: int = 1) -> None:
+    """Count ``amount`` occurrences of ``name`` (a fallback, a cache hit, ...) in the current conversion."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.events[name] += amount
+
+
+def note(**fields: Any) -> None:
+    """Attach JSON-serialisable ``fields`` (such as a routing decision) to the current conversion's record."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.notes.update(fields)
+
+
+def merge(spans: list[dict[str, Any]], started: float) -> None:
+    """Add spans recorded in another process (whose recording began at ``started``)."""
+    recorder = _current.get()
+    if recorder is None:
+        return
+    shift = started - recorder.started
+    for s in spans:
+        recorder.spans.append(dict(s, start=round(s["start"] + shift, 6)))
+
+
+@contextlib.contextmanager
+def recording(
+    conversion: str,
+    input_file: str | None = None,
+    output_file: str | None = None,
+    sink: str | None = None,
+) -> Iterator[Recorder]:
+    """Collect spans and events for one conversion; append the record to ``sink`` as a JSON line."""
+    recorder = Recorder(conversion, input_file, output_file)
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    except BaseException as exc:
+        recorder.error = str(exc) or exc.__class__.__name__
+        raise
+    finally:
+        _current.reset(token)
+        recorder.seconds = round(time.perf_counter() - recorder._t0, 6)
+        if sink:
+            append_record(sink, recorder.to_dict())
+
+
+def append_record(path: str, record: dict[str, Any]) -> None:
+    """Append one JSON line; a single O_APPEND write, so worker processes can share the file."""
+    data = (json.dumps(record) + "\n").encode("utf-8")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        logging.warning(f"Could not write conversion metrics to {path}: {exc}")
+
+
+class InstrumentedConversion:
+    """Picklable ``func(input_file, output_file, **options)`` wrapper that records every call."""
+
+    def __init__(self, func: Callable[..., Any], sink: str) -> None:
+        self.func = func
+        self.sink = sink
+        self.__name__ = getattr(func, "__name__", "conversion")
+        self.__doc__ = getattr(func, "__doc__", None)
+
+    def __call__(self, input_file: str, output_file: str, **options: Any) -> Any:
+        with recording(self.__name__, input_file, output_file, self.sink):
+            return self.func(input_file, output_file, **options)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsExporter:
+    """Write conversion records as JSON lines and/or a Prometheus textfile.
+
+    Conversions wrapped with ``wrap`` append their record to the JSON-lines
+    file from whichever process runs them; ``collect`` folds the records
+    written since the exporter was created into counters and rewrites the
+    textfile (atomically, for node_exporter's textfile collector). Without a
+    JSON-lines path a temporary spool file is used.
+    """
+
+    def __init__(self, jsonl: str | None = None, prom: str | None = None) -> None:
+        self.prom = prom
+        self._spool = not jsonl
+        if jsonl:
+            self.path = os.path.abspath(jsonl)
+        else:
+            fd, self.path = tempfile.mkstemp(prefix="docify-metrics-", suffix=".jsonl")
+            os.close(fd)
+        # only this run's records count towards the textfile
+        self._offset = _size(self.path) or 0
+        self.totals: dict[tuple[str, tuple[tuple[str, str], ...]], float] = defaultdict(float)
+        self.peaks: dict[str, float] = {}
+
+    def wrap(self, func: Callable[..., Any]) -> InstrumentedConversion:
+        return InstrumentedConversion(func, self.path)
+
+    def collect(self) -> None:
+        """Fold new records into the totals and rewrite the Prometheus textfile."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        # a partially written last line is picked up next time
+        complete = data[: data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                self.add(json.loads(line))
+            except ValueError:
+                continue
+        if self.prom:
+            self.write_prometheus(self.prom)
+
+    def add(self, record: dict[str, Any]) -> None:
+        conversion = record.get("conversion", "unknown")
+        status = "ok" if record.get("ok") else "error"
+        self._inc("docify_conversions_total", 1, conversion=conversion, status=status)
+        self._inc("docify_conversion_seconds_sum", record.get("seconds") or 0, conversion=conversion)
+        self._inc("docify_conversion_seconds_count", 1, conversion=conversion)
+        self._inc("docify_bytes_in_total", record.get("bytes_in") or 0, conversion=conversion)
+        self._inc("docify_bytes_out_total", record.get("bytes_out") or 0, conversion=conversion)
+        for s in record.get("spans", []):
+            self._inc("docify_stage_seconds_sum", s["seconds"], conversion=conversion, stage=s["stage"])
+            self._inc("docify_stage_seconds_count", 1, conversion=conversion, stage=s["stage"])
+        for name, amount in record.get("events", {}).items():
+            self._inc("docify_events_total", amount, conversion=conversion, event=name)
+        if record.get("peak_rss_bytes"):
+            self.peaks[conversion] = max(self.peaks.get(conversion, 0), record["peak_rss_bytes"])
+
+    def _inc(self, name: str, amount: float, **labels: str) -> None:
+        self.totals[(name, tuple(sorted(labels.items())))] += amount
+
+    def render_prometheus(self) -> str:
+        help_text = {
+            "docify_conversions_total": ("counter", "Conversions finished, by status."),
+            "docify_conversion_seconds": ("summary", "Wall-clock time per conversion."),
+            "docify_stage_seconds": ("summary", "Wall-clock time per conversion stage (pages are one 'page' stage each)."),
+            "docify_events_total": ("counter", "Fallbacks, cache hits and other conversion events."),
+            "docify_bytes_in_total": ("counter", "Input bytes converted."),
+            "docify_bytes_out_total": ("counter", "Output bytes written."),
+        }
+        lines = []
+        for family, (kind, text) in help_text.items():
+            samples = sorted(k for k in self.totals if k[0] == family or k[0].rsplit("_", 1)[0] == family)
+            if not samples:
+                continue
+            lines.append(f"# HELP {family} {text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for name, labels in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {self.totals[(name, labels)]:g}")
+        if self.peaks:
+            lines.append("# HELP docify_peak_rss_bytes Highest peak RSS of a process after a conversion.")
+            lines.append("# TYPE docify_peak_rss_bytes gauge")
+            for conversion, peak in sorted(self.peaks.items()):
+                lines.append(f'docify_peak_rss_bytes{{conversion="{_escape(conversion)}"}} {peak:g}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        folder = os.path.dirname(os.path.abspath(path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+        except OSError as exc:
+            logging.warning(f"Could not write Prometheus metrics to {path}: {exc}")
+
+    def close(self) -> None:
+        self.collect()
+        if self._spool:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
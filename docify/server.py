@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from . import converters, metrics
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Backends imported by each worker at start-up so the first job doesn't pay for them.
+WARM_MODULES = ["pandas", "openpyxl", "pdf2docx", "pdfplumber", "docx", "docx2pdf"]
+
+
+def _warm_worker() -> None:
+    """Process-pool initializer: import every conversion backend once."""
+    import importlib
+
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as exc:
+            logging.warning(f"Worker could not preload {name}: {exc}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_job(
+    command: str,
+    input_file: str,
+    output_file: str,
+    options: dict[str, Any],
+    metrics_sink: str | None = None,
+) -> tuple[float, Any]:
+    """Run one conversion in a worker process; return its duration in seconds and its result."""
+    func = getattr(converters, converters.CONVERSIONS[command][0])
+    if metrics_sink:
+        func = metrics.InstrumentedConversion(func, metrics_sink)
+    t0 = time.perf_counter()
+    result = func(input_file, output_file, **options)
+    return time.perf_counter() - t0, result
+
+
+class ConversionService:
+    """Warm process pool with bounded concurrency and queue depth.
+
+    ``workers`` conversions run at once; up to ``max_queue`` more may wait.
+    Further jobs are rejected immediately rather than piling up. A worker that
+    dies (segfault, OOM kill) breaks the pool; it is rebuilt and re-warmed and
+    the jobs it took down are retried once.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 16,
+        exporter: metrics.MetricsExporter | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.exporter = exporter
+        self.pool = self._new_pool()
+        self.pool_state = "ready"
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._pending: set[Any] = set()
+        self.stats = {
+            "accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_flight": 0, "pool_rebuilds": 0,
+        }
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+
+    def warm_up(self) -> None:
+        """Start every worker process now (each runs the backend preload)."""
+        futures = [self.pool.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def _rebuild(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken pool with a fresh, warmed one (once, however many jobs saw it break)."""
+        with self._pool_lock:
+            if self.pool is not broken:
+                return  # another job already rebuilt it
+            with self._lock:
+                self.pool_state = "rebuilding"
+            logging.warning("Worker process died; rebuilding the pool")
+            broken.shutdown(wait=False)
+            self.pool = self._new_pool()
+            try:
+                self.warm_up()
+            except BrokenProcessPool:
+                with self._lock:
+                    self.pool_state = "broken"
+                raise
+            with self._lock:
+                self.pool_state = "ready"
+                self.stats["pool_rebuilds"] += 1
+
+    def _run(self, *args: Any) -> tuple[float, Any]:
+        """Run ``_run_job`` in the pool, retrying once on a fresh pool if a worker dies."""
+        pool = self.pool
+        try:
+            return self._wait(pool.submit(_run_job, *args))
+        except BrokenProcessPool:
+            self._rebuild(pool)
+        pool = self.pool
+        try:
+            return self._wait(pool.submit(_run_job, *args))
+        except BrokenProcessPool:
+            self._rebuild(pool)
+            raise BrokenProcessPool("worker process crashed") from None
+
+    def _wait(self, future: Any) -> Any:
+        with self._lock:
+            self._pending.add(future)
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                self._pending.discard(future)
+
+    def submit(self, command: str, input_file: str, output_file: str, options: dict[str, Any]) -> dict[str, Any]:
+        """Run a job to completion; return a JSON-able result (``busy`` if the queue is full)."""
+        if command not in converters.CONVERSIONS:
+            return {"ok": False, "error": f"Unknown conversion: {command}"}
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            return {"ok": False, "busy": True, "error": "Server queue is full, retry later"}
+        self._count("accepted")
+        self._count("in_flight")
+        try:
+            sink = self.exporter.path if self.exporter else None
+            seconds, result = self._run(command, input_file, output_file, options, sink)
+            self._count("completed")
+            logging.info(f"Served {command}: {input_file} -> {output_file} ({seconds:.2f}s)")
+            reply = {"ok": True, "output": output_file, "seconds": round(seconds, 3)}
+            if result:
+                reply["degraded_pages"] = result
+            return reply
+        except Exception as exc:
+            self._count("failed")
+            logging.error(f"Served {command} failed: {input_file} -> {output_file} | Error: {exc}")
+            return {"ok": False, "error": str(exc) or exc.__class__.__name__}
+        finally:
+            self._count("in_flight", -1)
+            self._slots.release()
+            if self.exporter:
+                with self._lock:
+                    self.exporter.collect()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, workers=self.workers, max_queue=self.max_queue, pool=self.pool_state)
+
+    def metrics_text(self) -> str | None:
+        """Prometheus exposition of the jobs served so far (None without an exporter)."""
+        if not self.exporter:
+            return None
+        with self._lock:
+            return self.exporter.render_prometheus()
+
+    def shutdown(self) -> None:
+        # drop queued jobs (what cancel_futures does from Python 3.9 on)
+        with self._lock:
+            for future in self._pending:
+                future.cancel()
+        with self._pool_lock:
+            self.pool.shutdown(wait=True)
+        if self.exporter:
+            self.exporter.close()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+
+def make_handler(service: ConversionService) -> type:
+    class ConversionHandler(BaseHTTPRequestHandler):
+        server_version = "Docify"
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._reply(200, dict(service.snapshot(), ok=True))
+            elif self.path == "/metrics" and service.exporter:
+                data = (service.metrics_text() or "").encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._reply(404, {"ok": False, "error": "Not found"})
+
+        def do_POST(self) -> None:
+            if self.path != "/convert":
+                self._reply(404, {"ok": False, "error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                job = json.loads(self.rfile.read(length) or b"{}")
+                command = job["command"]
+                input_file = job["input"]
+                output_file = job["output"]
+                options = job.get("options") or {}
+            except (KeyError, ValueError) as exc:
+                self._reply(400, {"ok": False, "error": f"Bad request: {exc}"})
+                return
+            result = service.submit(command, input_file, output_file, options)
+            if result.get("busy"):
+                self._reply(503, result, retry_after=1)
+            else:
+                self._reply(200 if result["ok"] else 422, result)
+
+        def _reply(self, status: int, body: dict[str, Any], retry_after: int | None = None) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logging.info("serve: " + format % args)
+
+    return ConversionHandler
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 2,
+    max_queue: int = 16,
+    exporter: metrics.MetricsExporter | None = None,
+) -> None:
+    """Serve conversion jobs over HTTP until interrupted."""
+    service = ConversionService(workers, max_queue, exporter)
+    service.warm_up()
+    httpd = ThreadingHTTPServer((host, port), make_handler(service))
+    httpd.daemon_threads = True
+    print(f"🚀 Docify serving on http://{host}:{httpd.server_port} ({service.workers} workers, queue {service.max_queue})")
+    logging.info(f"Serving on {host}:{httpd.server_port} with {service.workers} workers")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.shutdown()
+
+
+def request_conversion(
+    url: str,
+    command: str,
+    input_file: str,
+    output_file: str,
+    options: dict[str, Any] | None = None,
+    timeout: float | None = None,
+    retries: int = 30,
+) -> dict[str, Any]:
+    """Send one job to a running server and return its JSON result.
+
+    Paths are made absolute since the server resolves them on its side.
+    A ``busy`` server is retried after its ``Retry-After`` delay.
+    """
+    payload = json.dumps({
+        "command": command,
+        "input": os.path.abspath(input_file),
+        "output": os.path.abspath(output_file),
+        "options": options or {},
+    }).encode("utf-8")
+    for _ in range(max(1, retries)):
+        req = urllib.request.Request(
+            url.rstrip("/") + "/convert",
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            try:
+                body = json.loads(exc.read() or b"{}")
+            except ValueError:
+                body = {"ok": False, "error": f"HTTP {exc.code}"}
+            if exc.code == 503:
+                time.sleep(float(exc.headers.get("Retry-After", 1)))
+                continue
+            return body
+    return {"ok": False, "error": "Server stayed busy"}
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from docify import aio, converters
+
+
+def make_csvs(tmp_path, count):
+    paths = []
+    for i in range(count):
+        csv = tmp_path / f'f{i}.csv'
+        pd.DataFrame({'a': [i]}).to_csv(csv, index=False)
+        paths.append(csv)
+    return paths
+
+
+def test_convert_many_async_yields_results_and_failures(tmp_path):
+    csvs = make_csvs(tmp_path, 3)
+    jobs = [('csv2xlsx', str(c), str(c.with_suffix('.xlsx'))) for c in csvs]
+    jobs.append({'conversion': 'csv_to_xlsx', 'input': str(tmp_path / 'bad.txt'), 'output': str(tmp_path / 'bad.xlsx')})
+
+    async def collect():
+        return [r async for r in aio.convert_many_async(jobs, concurrency=2)]
+
+    results = asyncio.run(collect())
+    assert sum(r['ok'] for r in results) == 3
+    assert [r['error'] for r in results if not r['ok']] == ['Input file must be a .csv file']
+    for c in csvs:
+        assert c.with_suffix('.xlsx').exists()
+
+
+def test_convert_async_raises_conversion_error(tmp_path):
+    with pytest.raises(ValueError):
+        asyncio.run(aio.convert_async(converters.csv_to_xlsx, 'x.txt', str(tmp_path / 'x.xlsx')))
+    with pytest.raises(ValueError):
+        asyncio.run(aio.convert_async('nope', 'x', 'y'))
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='needs a named pipe')
+def test_timeout_and_cancel_stop_the_process(tmp_path):
+    # reading a pipe nobody writes to blocks the (spawned) conversion until it is stopped
+    csv = tmp_path / 'blocked.csv'
+    os.mkfifo(csv)
+    out = tmp_path / 'out.xlsx'
+
+    async def cancel_soon():
+        task = asyncio.ensure_future(aio.convert_async('csv2xlsx', str(csv), str(out)))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    t0 = time.perf_counter()
+    asyncio.run(cancel_soon())
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(aio.convert_async('csv2xlsx', str(csv), str(out), job_timeout=0.5))
+    assert time.perf_counter() - t0 < 10
+    assert not out.exists()
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='needs a named pipe')
+def test_jobs_do_not_need_the_default_executor(tmp_path):
+    # every default-executor thread is busy, yet blocked jobs still time out and stop
+    blocked = []
+    for i in range(2):
+        blocked.append(tmp_path / f'blocked{i}.csv')
+        os.mkfifo(blocked[-1])
+    jobs = [('csv2xlsx', str(csv), str(csv.with_suffix('.xlsx'))) for csv in blocked]
+    release = threading.Event()
+
+    async def collect():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(1))
+        loop.run_in_executor(None, release.wait)
+        try:
+            return [r async for r in aio.convert_many_async(jobs, concurrency=2, job_timeout=0.5)]
+        finally:
+            release.set()
+
+    results = asyncio.run(asyncio.wait_for(collect(), 30))
+    assert [r['error'] for r in results] == ['Timed out after 0.5s'] * 2
+
+
+def test_converter_timeout_option_reaches_pdf_to_word(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    pdf = tmp_path / 'in.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1}', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+    jobs = [
+        ('pdf2word', str(pdf), str(tmp_path / 'ok.docx'), {'timeout': 60}),
+        ('pdf2word', str(pdf), str(tmp_path / 'late.docx'), {'timeout': 1e-6}),
+    ]
+
+    async def collect():
+        return [r async for r in aio.convert_many_async(jobs, concurrency=1, job_timeout=60)]
+
+    ok, late = asyncio.run(collect())
+    assert ok['ok'] and (tmp_path / 'ok.docx').exists()
+    assert not late['ok'] and 'exceeded its 1e-06s budget' in late['error']
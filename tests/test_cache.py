@@ -0,0 +1,103 @@
+import os
+import pandas as pd
+from docify import converters
+from docify.cache import ConversionCache
+
+
+def make_csv(path, rows=3):
+    pd.DataFrame({'a': list(range(rows)), 'b': ['x'] * rows}).to_csv(path, index=False)
+
+
+def test_cache_hit_skips_conversion(tmp_path):
+    csv = tmp_path / 'in.csv'
+    make_csv(csv)
+    calls = []
+
+    def convert(inp, out, **options):
+        calls.append(options)
+        converters.csv_to_xlsx(inp, out, **options)
+
+    cache = ConversionCache(str(tmp_path / 'cache'))
+    cache.run(convert, str(csv), str(tmp_path / 'a.xlsx'))
+    cache.run(convert, str(csv), str(tmp_path / 'b.xlsx'))
+    assert len(calls) == 1
+    assert pd.read_excel(tmp_path / 'b.xlsx').equals(pd.read_csv(csv))
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+    # output-affecting options are part of the key, execution-only ones are not
+    cache.run(convert, str(csv), str(tmp_path / 'c.xlsx'), streaming=True, chunksize=1)
+    cache.run(convert, str(csv), str(tmp_path / 'd.xlsx'), streaming=True, chunksize=2)
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ConversionCache(str(tmp_path / 'cache'))
+    keys = []
+    for i in range(3):
+        src = tmp_path / f'out{i}.bin'
+        src.write_bytes(b'x' * 100)
+        key = f'{i:02d}' + 'k' * 62
+        cache.put(key, str(src))
+        # spread the entries out in time: 0 oldest, 2 newest
+        os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+        keys.append(key)
+    # reading entry 0 makes it the most recently used
+    assert cache.get(keys[0], str(tmp_path / 'restored.bin'))
+    cache.max_bytes = 200
+    assert cache.evict() == 1
+    assert not cache.get(keys[1], str(tmp_path / 'gone.bin'))
+    assert cache.get(keys[0], str(tmp_path / 'kept.bin'))
+    assert cache.get(keys[2], str(tmp_path / 'kept2.bin'))
+
+
+def test_wrapped_conversion_keeps_signature(tmp_path):
+    csv = tmp_path / 'in.csv'
+    make_csv(csv)
+    cached = ConversionCache(str(tmp_path / 'cache'), link=True).wrap(converters.csv_to_xlsx)
+    out = tmp_path / 'out.xlsx'
+    cached(str(csv), str(out))
+    out.unlink()
+    cached(str(csv), str(out))
+    assert os.path.exists(out)
+    assert cached.__name__ == 'csv_to_xlsx'
+
+
+def test_cache_returns_stored_result_and_walks_only_over_budget(tmp_path, monkeypatch):
+    cache = ConversionCache(str(tmp_path / 'cache'), max_bytes=250)
+    walks = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, '_entries', lambda: walks.append(1) or entries())
+
+    def convert(inp, out, **options):
+        with open(out, 'wb') as f:
+            f.write(b'x' * 100)
+        return [2, 5]
+
+    for i in range(2):
+        src = tmp_path / f'in{i}.pdf'
+        src.write_bytes(bytes([i]))
+        assert cache.run(convert, str(src), str(tmp_path / f'out{i}.docx')) == [2, 5]
+    # the first store counts the (empty) cache once; later ones only update the total
+    assert len(walks) == 1
+    assert cache.run(lambda inp, out: None, str(tmp_path / 'in0.pdf'), str(tmp_path / 'hit.docx')) is None
+    assert cache.run(convert, str(tmp_path / 'in0.pdf'), str(tmp_path / 'hit.docx')) == [2, 5]
+
+    src = tmp_path / 'in2.pdf'
+    src.write_bytes(b'\x02')
+    cache.run(convert, str(src), str(tmp_path / 'out2.docx'))
+    assert len(walks) == 2
+    stats = cache.stats()
+    assert (stats['evictions'], stats['entries'], stats['bytes']) == (1, 2, 200)
+    assert len(list((tmp_path / 'cache').rglob('*.json'))) == 3  # stats.json and the two kept results
+
+
+def test_file_shards_bypass_the_cache(tmp_path):
+    csv = tmp_path / 'in.csv'
+    make_csv(csv, rows=10)
+    cache = ConversionCache(str(tmp_path / 'cache'))
+    for _ in range(2):
+        cache.run(converters.csv_to_xlsx, str(csv), str(tmp_path / 'out.xlsx'), shard='files', shard_rows=4)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (0, 0, 0)
+    assert (tmp_path / 'out_part003.xlsx').exists()
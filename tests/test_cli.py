@@ -0,0 +1,122 @@
+import io
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from docify import cli, converters
+
+
+def test_parallel_batch_isolates_failures(tmp_path, monkeypatch, capsys):
+    for i in range(4):
+        pd.DataFrame({'a': [i]}).to_csv(tmp_path / f'f{i}.csv', index=False)
+    (tmp_path / 'empty.csv').write_text('')
+    monkeypatch.setattr('builtins.input', lambda prompt='': str(tmp_path))
+    cli.batch_convert('CSV → Excel', '.csv', '.xlsx', converters.csv_to_xlsx, jobs=2)
+    for i in range(4):
+        assert pd.read_excel(tmp_path / f'f{i}.xlsx')['a'].tolist() == [i]
+    assert not os.path.exists(tmp_path / 'empty.xlsx')
+    out = capsys.readouterr().out
+    assert 'empty.csv' in out and 'Some files failed' in out
+
+
+
+def convert_or_crash(inp, out, **options):
+    if 'crash' in os.path.basename(inp):
+        os._exit(1)  # stands in for a segfault or an OOM kill
+    converters.csv_to_xlsx(inp, out, **options)
+
+
+def test_parallel_batch_survives_worker_crash(tmp_path, monkeypatch, capsys):
+    for i in range(6):
+        pd.DataFrame({'a': [i]}).to_csv(tmp_path / f'f{i}.csv', index=False)
+    pd.DataFrame({'a': [9]}).to_csv(tmp_path / 'crash.csv', index=False)
+    monkeypatch.setattr('builtins.input', lambda prompt='': str(tmp_path))
+    cli.batch_convert('CSV → Excel', '.csv', '.xlsx', convert_or_crash, jobs=2)
+    for i in range(6):
+        assert pd.read_excel(tmp_path / f'f{i}.xlsx')['a'].tolist() == [i]
+    out = capsys.readouterr().out
+    assert 'crash.csv: worker process crashed' in out
+    assert out.count('worker process crashed') == 1
+
+def make_tree(root):
+    (root / 'sub' / 'deep').mkdir(parents=True)
+    for rel in ['a.csv', 'sub/b.csv', 'sub/deep/c.csv']:
+        pd.DataFrame({'x': [1]}).to_csv(root / rel, index=False)
+    (root / 'notes.txt').write_text('skip me')
+
+
+def run_main(monkeypatch, argv):
+    monkeypatch.setattr('sys.argv', ['docify'] + argv)
+    monkeypatch.setattr('builtins.input', lambda prompt='': pytest.fail('prompted'))
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    return exc.value.code
+
+
+def test_scan_folder_is_lazy_and_recursive(tmp_path):
+    make_tree(tmp_path)
+    found = cli.scan_folder(str(tmp_path), '.csv', recursive=True)
+    assert next(found).endswith('a.csv')
+    assert sorted(os.path.relpath(f, tmp_path) for f in found) == [
+        os.path.join('sub', 'b.csv'), os.path.join('sub', 'deep', 'c.csv')]
+    assert [os.path.basename(f) for f in cli.scan_folder(str(tmp_path), '.csv')] == ['a.csv']
+
+
+def test_non_interactive_recursive_output_dir(tmp_path, monkeypatch):
+    src, dst = tmp_path / 'src', tmp_path / 'dst'
+    src.mkdir()
+    make_tree(src)
+    monkeypatch.chdir(tmp_path)
+    assert run_main(monkeypatch, ['csv2xlsx', str(src), '--recursive', '--output-dir', str(dst)]) == 0
+    for rel in ['a.xlsx', 'sub/b.xlsx', 'sub/deep/c.xlsx']:
+        assert (dst / rel).exists()
+
+
+
+def test_glob_with_output_dir_mirrors_sub_folders(tmp_path, monkeypatch):
+    src, dst = tmp_path / 'in', tmp_path / 'out'
+    for i, sub in enumerate(['a', 'b']):
+        (src / sub).mkdir(parents=True)
+        pd.DataFrame({'x': [i]}).to_csv(src / sub / 'data.csv', index=False)
+    monkeypatch.chdir(tmp_path)
+    assert run_main(monkeypatch, ['csv2xlsx', str(src / '*' / '*.csv'), '--output-dir', str(dst)]) == 0
+    for i, sub in enumerate(['a', 'b']):
+        assert pd.read_excel(dst / sub / 'data.xlsx')['x'].tolist() == [i]
+
+    # two inputs that map to one output: the second fails instead of overwriting
+    pd.DataFrame({'x': [7]}).to_csv(tmp_path / 'data.csv', index=False)
+    argv = ['csv2xlsx', str(src / 'a' / 'data.csv'), str(tmp_path / 'data.csv'), '--output-dir', str(dst / 'flat')]
+    assert run_main(monkeypatch, argv) == 1
+    assert pd.read_excel(dst / 'flat' / 'data.xlsx')['x'].tolist() == [0]
+
+def test_non_interactive_glob_and_stdin(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    assert run_main(monkeypatch, ['csv2xlsx', str(tmp_path / '*.csv')]) == 0
+    assert (tmp_path / 'a.xlsx').exists() and not (tmp_path / 'sub' / 'b.xlsx').exists()
+
+    monkeypatch.setattr('sys.stdin', io.StringIO(str(tmp_path / 'sub' / 'b.csv') + '\n'))
+    assert run_main(monkeypatch, ['csv2xlsx', '-']) == 0
+    assert (tmp_path / 'sub' / 'b.xlsx').exists()
+
+    (tmp_path / 'bad.csv').write_text('')
+    assert run_main(monkeypatch, ['csv2xlsx', str(tmp_path / 'bad.csv')]) == 1
+
+
+@pytest.mark.parametrize('option', [['--shard-rows', '0'], ['--shard-rows', '-3'], ['--shard-mb', '0']])
+def test_csv2xlsx_rejects_non_positive_shard_sizes(tmp_path, monkeypatch, capsys, option):
+    make_tree(tmp_path)
+    argv = ['csv2xlsx', str(tmp_path / 'a.csv'), '--shard', 'sheets'] + option
+    assert run_main(monkeypatch, argv) == 2
+    assert option[0] in capsys.readouterr().err
+    assert not (tmp_path / 'a.xlsx').exists()
+
+
+def test_cli_startup_does_not_import_backends():
+    code = ("import sys, docify.cli; "
+            "print(','.join(m for m in ('pandas', 'pdf2docx', 'pdfplumber', 'docx', 'docx2pdf', 'openpyxl', 'fitz') "
+            "if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
@@ -1,6 +1,6 @@
 import os
 import pytest
-from p2w_convertor import converters
+from docify import converters
 import pandas as pd
 
 def test_word_to_pdf(tmp_path):
@@ -32,3 +32,639 @@ def test_csv_to_xlsx(tmp_path):
     assert os.path.exists(xlsx)
     df2 = pd.read_excel(xlsx)
     assert df2.equals(df)
+
+def test_pdf_to_word_workers_matches_single(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    from docx import Document
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+    single = tmp_path / 'single.docx'
+    parallel = tmp_path / 'parallel.docx'
+    converters.pdf_to_word(str(pdf), str(single))
+    converters.pdf_to_word(str(pdf), str(parallel), workers=2)
+    texts = lambda p: [para.text for para in Document(str(p)).paragraphs if para.text]
+    assert texts(parallel) == texts(single)
+    assert 'Page 4 text' in texts(parallel)
+
+def test_pdf_to_word_fallback_bisects_failing_page(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    from docx import Document
+    from pdf2docx import Converter
+    from pdf2docx.page.Page import Page
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(6):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+
+    def failing_convert(*args, **kwargs):
+        raise RuntimeError('primary failed')
+
+    original_parse = Page.parse
+    parsed = []
+
+    def flaky_parse(self, **settings):
+        parsed.append(self.id)
+        if self.id == 4:
+            raise RuntimeError('bad page')
+        return original_parse(self, **settings)
+
+    opened = []
+    original_init = Converter.__init__
+
+    def counting_init(self, *args, **kwargs):
+        opened.append(args)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(converters, '_convert_pages', failing_convert)
+    monkeypatch.setattr(Converter, '__init__', counting_init)
+    monkeypatch.setattr(Page, 'parse', flaky_parse)
+    out = tmp_path / 'out.docx'
+    converters.pdf_to_word(str(pdf), str(out))
+    texts = [p.text for p in Document(str(out)).paragraphs if p.text]
+    assert [t for t in texts if t.startswith('Page')] == [f'Page {i + 1} text' for i in range(6)]
+    assert len(opened) == 1
+    # the healthy half is parsed once; only the failing half is split
+    assert parsed.count(0) == 1
+
+def test_csv_to_xlsx_streaming_matches_default(tmp_path):
+    df = pd.DataFrame({
+        'a': [1, 2, 3, 4, 5],
+        'b': [1.5, None, 2.5, 3.0, 4.25],
+        'c': ['x', 'y', None, 'w', 'v'],
+        'd': [True, False, True, True, False],
+    })
+    csv = tmp_path / 'test.csv'
+    df.to_csv(csv, index=False)
+    default = tmp_path / 'default.xlsx'
+    streamed = tmp_path / 'streamed.xlsx'
+    converters.csv_to_xlsx(str(csv), str(default))
+    converters.csv_to_xlsx(str(csv), str(streamed), streaming=True, chunksize=2)
+    from openpyxl import load_workbook
+    rows = lambda p: [[(c.value, c.data_type if c.value is not None else None) for c in r]
+                      for r in load_workbook(p).active.iter_rows()]
+    assert rows(streamed) == rows(default)
+
+def test_xlsx_to_csv_streaming_all_sheets(tmp_path):
+    xlsx = tmp_path / 'book.xlsx'
+    first = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    second = pd.DataFrame({'c': [3.5, 4.5]})
+    with pd.ExcelWriter(xlsx) as writer:
+        first.to_excel(writer, sheet_name='First', index=False)
+        second.to_excel(writer, sheet_name='Q1 Sales', index=False)
+    csv = tmp_path / 'book.csv'
+    converters.xlsx_to_csv(str(xlsx), str(csv), streaming=True, all_sheets=True)
+    assert pd.read_csv(tmp_path / 'book_First.csv').equals(first)
+    assert pd.read_csv(tmp_path / 'book_Q1_Sales.csv').equals(second)
+
+    converters.xlsx_to_csv(str(xlsx), str(csv), streaming=True)
+    assert pd.read_csv(csv).equals(first)
+
+    with pytest.raises(ValueError):
+        converters.xlsx_to_csv(str(xlsx), str(csv), streaming=True, sheets=['Missing'])
+
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_xlsx_to_csv_sheet_names_sanitising_alike_get_own_files(tmp_path, streaming):
+    xlsx = tmp_path / 'book.xlsx'
+    frames = {name: pd.DataFrame({'n': [i, i + 1]}) for i, name in enumerate(['Q1 Sales', 'Q1_Sales', 'Q1 | Sales'])}
+    with pd.ExcelWriter(xlsx) as writer:
+        for name, df in frames.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    paths = converters.sheet_csv_paths(str(tmp_path / 'book.csv'), list(frames))
+    assert [os.path.basename(p) for p in paths.values()] == ['book_Q1_Sales.csv', 'book_Q1_Sales_2.csv', 'book_Q1_Sales_3.csv']
+    converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'book.csv'), all_sheets=True, streaming=streaming)
+    for name, df in frames.items():
+        assert pd.read_csv(paths[name]).equals(df)
+    # a subset gets the same names as a full export
+    converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'sub.csv'), sheets=['Q1_Sales'], streaming=streaming)
+    assert (tmp_path / 'sub_Q1_Sales_2.csv').exists()
+
+def test_pdf_to_word_reports_page_progress(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1}', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+    updates = []
+    converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx'), progress=lambda d, t: updates.append((d, t)))
+    assert updates == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_csv_to_xlsx_streaming_reports_rows(tmp_path):
+    csv = tmp_path / 'test.csv'
+    pd.DataFrame({'a': range(5)}).to_csv(csv, index=False)
+    updates = []
+    converters.csv_to_xlsx(str(csv), str(tmp_path / 'out.xlsx'), streaming=True, chunksize=2,
+                           progress=lambda d, t: updates.append((d, t)))
+    assert updates == [(2, None), (4, None), (5, None), (5, 5)]
+
+def test_pdf_to_word_page_timeout_degrades_only_slow_page(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import time
+    from docx import Document
+    from pdf2docx.page.Page import Page
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+
+    original_parse = Page.parse
+
+    def slow_parse(self, **settings):
+        if self.id == 2:
+            time.sleep(30)
+        return original_parse(self, **settings)
+
+    monkeypatch.setattr(Page, 'parse', slow_parse)
+    out = tmp_path / 'out.docx'
+    t0 = time.monotonic()
+    degraded = converters.pdf_to_word(str(pdf), str(out), page_timeout=1)
+    assert time.monotonic() - t0 < 20
+    assert degraded == [3]
+    texts = [p.text for p in Document(str(out)).paragraphs if p.text]
+    assert [t for t in texts if t.startswith('Page')] == [f'Page {i + 1} text' for i in range(4)]
+
+def test_pdf_to_word_page_timeout_covers_raw_extraction(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import time
+    from docx import Document
+    from pdf2docx.page.RawPageFitz import RawPageFitz
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+
+    original_restore = RawPageFitz.restore
+
+    def stalled_restore(self, **settings):
+        if self.page_engine.number == 1:
+            time.sleep(30)
+        return original_restore(self, **settings)
+
+    monkeypatch.setattr(RawPageFitz, 'restore', stalled_restore)
+    out = tmp_path / 'out.docx'
+    t0 = time.monotonic()
+    degraded = converters.pdf_to_word(str(pdf), str(out), page_timeout=1)
+    assert time.monotonic() - t0 < 20
+    assert degraded == [2]
+    texts = [p.text for p in Document(str(out)).paragraphs if p.text]
+    assert [t for t in texts if t.startswith('Page')] == [f'Page {i + 1} text' for i in range(3)]
+
+def test_pdf_to_word_job_timeout_raises(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import time
+    from pdf2docx.page.Page import Page
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), 'text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+    monkeypatch.setattr(Page, 'parse', lambda self, **settings: time.sleep(30))
+    with pytest.raises(converters.ConversionTimeout):
+        converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx'), timeout=1)
+
+def test_pdf_to_word_text_only_skips_layout(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import pdf2docx
+    from docx import Document
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+        page.insert_text((72, 400), f'Footer {i + 1}', fontsize=9)
+    doc.save(str(pdf))
+    doc.close()
+
+    def no_layout(*args, **kwargs):
+        raise AssertionError('layout analysis should be skipped')
+
+    monkeypatch.setattr(pdf2docx, 'Converter', no_layout)
+    out = tmp_path / 'out.docx'
+    progress = []
+    assert converters.pdf_to_word(str(pdf), str(out), text_only=True, progress=lambda d, t: progress.append((d, t))) == []
+    texts = [p.text for p in Document(str(out)).paragraphs if p.text.strip()]
+    assert texts == [t for i in range(3) for t in (f'Page {i + 1} text', f'Footer {i + 1}')]
+    assert progress[-1] == (3, 3)
+
+def test_text_fallback_embeds_images_once(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import zipfile
+    from docx import Document
+    pdf = tmp_path / 'images.pdf'
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 60, 20), False)
+    logo.clear_with(90)
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+        # the same logo bytes inserted separately on each page, plus one figure per page
+        page.insert_image(fitz.Rect(400, 30, 520, 70), stream=logo.tobytes('png'))
+        figure = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 40), False)
+        figure.clear_with(40 * (i + 1))
+        page.insert_image(fitz.Rect(72, 100, 172, 200), pixmap=figure)
+    doc.save(str(pdf))
+    doc.close()
+
+    def failing(*args, **kwargs):
+        raise RuntimeError('layout failed')
+
+    monkeypatch.setattr(converters, '_convert_pages', failing)
+    monkeypatch.setattr(converters, '_convert_page_range', failing)
+    out = tmp_path / 'out.docx'
+    assert converters.pdf_to_word(str(pdf), str(out)) == [1, 2, 3]
+    media = [n for n in zipfile.ZipFile(out).namelist() if n.startswith('word/media/')]
+    assert len(media) == 4
+    result = Document(str(out))
+    assert len(result.inline_shapes) == 6
+    assert [p.text for p in result.paragraphs if p.text] == [f'Page {i + 1} text' for i in range(3)]
+
+    converters.pdf_to_word(str(pdf), str(out), preserve_images=False)
+    assert len(Document(str(out)).inline_shapes) == 0
+
+
+def test_text_fallback_records_page_timeouts(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import time
+    from pdfplumber.page import Page
+    from docify import metrics
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+
+    def failing(*args, **kwargs):
+        raise RuntimeError('layout failed')
+
+    original = Page.extract_text
+
+    def slow_extract(self, **kwargs):
+        if self.page_number == 2:
+            time.sleep(30)
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(converters, '_convert_pages', failing)
+    monkeypatch.setattr(converters, '_convert_page_range', failing)
+    monkeypatch.setattr(Page, 'extract_text', slow_extract)
+    with metrics.recording('pdf_to_word') as recorder:
+        degraded = converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx'), page_timeout=1)
+    assert degraded == [1, 2, 3]
+    assert recorder.events['page_timeout'] == 1
+
+
+def test_preflight_routes_scans_to_text(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import pdf2docx
+    pdf = tmp_path / 'scan.pdf'
+    scan = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 85, 110), False)
+    scan.clear_with(200)
+    doc = fitz.open()
+    for i in range(8):
+        page = doc.new_page()
+        page.insert_image(page.rect, pixmap=scan)
+    doc.save(str(pdf))
+    doc.close()
+
+    profile = converters.classify_pdf(str(pdf))
+    assert profile['route'] == 'text' and profile['sampled'] == [1, 3, 5, 6, 8]
+    assert 'looks scanned' in profile['reasons'][0]
+
+    def no_layout(*args, **kwargs):
+        raise AssertionError('layout analysis should be skipped')
+
+    monkeypatch.setattr(pdf2docx, 'Converter', no_layout)
+    assert converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx')) == list(range(1, 9))
+
+
+def test_preflight_routes_unreadable_pages_to_per_page(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    pdf = tmp_path / 'table.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} has a ruled table below it', fontsize=12)
+        for r in range(4):
+            page.draw_line((72, 100 + r * 20), (400, 100 + r * 20))
+    doc.save(str(pdf))
+    doc.close()
+
+    profile = converters.classify_pdf(str(pdf))
+    assert profile['route'] == 'primary' and profile['ruling_lines'] == 4
+    assert any('tables likely' in reason for reason in profile['reasons'])
+
+    original = fitz.Page.get_drawings
+
+    def broken(self, *args, **kwargs):
+        if self.number == 1:
+            raise RuntimeError('syntax error in content stream')
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, 'get_drawings', broken)
+    profile = converters.classify_pdf(str(pdf))
+    assert profile['route'] == 'per_page' and profile['errors'] == [2]
+
+    def no_primary(*args, **kwargs):
+        raise AssertionError('primary conversion should be skipped')
+
+    monkeypatch.setattr(converters, '_convert_pages', no_primary)
+    assert converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx')) == []
+
+
+def test_docx_merger_rehomes_images_styles_and_lists(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    import io
+    import zipfile
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml.ns import qn
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 30, 30), False)
+    logo.clear_with(80)
+
+    def fragment(i):
+        doc = Document()
+        doc.styles.add_style('Fancy', WD_STYLE_TYPE.PARAGRAPH)
+        p = doc.add_paragraph(f'Item {i}', style='Fancy')
+        num_pr = p._p.get_or_add_pPr().get_or_add_numPr()
+        num_pr.get_or_add_ilvl().val = 0
+        num_pr.get_or_add_numId().val = 3
+        rId = doc.part.relate_to(f'https://example.com/{i}', RT.HYPERLINK, is_external=True)
+        link = p._p.makeelement(qn('w:hyperlink'), {qn('r:id'): rId})
+        p._p.append(link)
+        doc.add_picture(io.BytesIO(logo.tobytes('png')))
+        stream = io.BytesIO()
+        doc.save(stream)
+        return stream
+
+    main = Document()
+    merger = converters._DocxMerger(main)
+    for i in range(3):
+        merger.append(fragment(i))
+    out = tmp_path / 'merged.docx'
+    main.save(str(out))
+
+    result = Document(str(out))
+    items = [p for p in result.paragraphs if p.text]
+    assert [(p.text, p.style.name) for p in items] == [(f'Item {i}', 'Fancy') for i in range(3)]
+    num_ids = {p._p.pPr.numPr.numId.val for p in items}
+    assert len(num_ids) == 1 and result.part.numbering_part.element.num_having_numId(num_ids.pop()) is not None
+    links = [result.part.rels[p._p.find(qn('w:hyperlink')).get(qn('r:id'))].target_ref for p in items]
+    assert links == [f'https://example.com/{i}' for i in range(3)]
+    assert len(result.inline_shapes) == 3
+    assert len({shape._inline.docPr.id for shape in result.inline_shapes}) == 3
+    assert [n for n in zipfile.ZipFile(out).namelist() if n.startswith('word/media/')] == ['word/media/image1.png']
+
+
+def test_per_page_merge_keeps_images(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    import zipfile
+    from docx import Document
+    pdf = tmp_path / 'images.pdf'
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 60, 20), False)
+    logo.clear_with(90)
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+        page.insert_image(fitz.Rect(400, 30, 520, 70), stream=logo.tobytes('png'))
+    doc.save(str(pdf))
+    doc.close()
+
+    def failing(*args, **kwargs):
+        raise RuntimeError('primary failed')
+
+    monkeypatch.setattr(converters, '_convert_pages', failing)
+    out = tmp_path / 'out.docx'
+    assert converters.pdf_to_word(str(pdf), str(out)) == []
+    result = Document(str(out))
+    assert len(result.inline_shapes) == 4
+    assert len([n for n in zipfile.ZipFile(out).namelist() if n.startswith('word/media/')]) == 1
+
+
+def test_csv_to_xlsx_inferred_schema_is_cached_and_matches_default(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+    from docify import metrics
+    monkeypatch.setenv('DOCIFY_CACHE_DIR', str(tmp_path / 'cache'))
+    df = pd.DataFrame({
+        'id': range(40),
+        'amount': [i * 1.5 for i in range(40)],
+        'region': ['north', 'south', 'east', 'west'] * 10,
+        'note': [f'note {i}' for i in range(40)],
+        'flag': [i % 2 == 0 for i in range(40)],
+    })
+    csv = tmp_path / 'feed.csv'
+    df.to_csv(csv, index=False)
+    assert converters.infer_csv_schema(str(csv)) == {
+        'id': 'Int64', 'amount': 'float64', 'region': 'category', 'note': 'object', 'flag': 'boolean',
+    }
+
+    default = tmp_path / 'default.xlsx'
+    converters.csv_to_xlsx(str(csv), str(default))
+    rows = lambda p: [[c.value for c in r] for r in load_workbook(p).active.iter_rows()]
+    events = []
+    for name in ('first', 'second'):
+        with metrics.recording('csv_to_xlsx') as recorder:
+            converters.csv_to_xlsx(str(csv), str(tmp_path / f'{name}.xlsx'), infer_schema=True, engine='pyarrow')
+        events.append(dict(recorder.events))
+        assert rows(tmp_path / f'{name}.xlsx') == rows(default)
+    assert events == [{'schema_inferred': 1}, {'schema_cache_hit': 1}]
+
+    # a later feed with the same header but text where numbers used to be
+    df['id'] = df['id'].astype(object)
+    df.loc[5, 'id'] = 'unknown'
+    df.to_csv(csv, index=False)
+    with metrics.recording('csv_to_xlsx') as recorder:
+        converters.csv_to_xlsx(str(csv), str(tmp_path / 'changed.xlsx'), infer_schema=True, streaming=True, chunksize=7)
+    assert recorder.events == {'schema_cache_hit': 1, 'schema_mismatch': 1}
+    assert rows(tmp_path / 'changed.xlsx')[6][0] == 'unknown'
+
+
+def test_csv_to_xlsx_row_limit_keeps_cached_schema(tmp_path, monkeypatch):
+    from docify import metrics
+    monkeypatch.setenv('DOCIFY_CACHE_DIR', str(tmp_path / 'cache'))
+    csv = tmp_path / 'feed.csv'
+    pd.DataFrame({'id': range(10), 'v': [i / 2 for i in range(10)]}).to_csv(csv, index=False)
+    converters.csv_to_xlsx(str(csv), str(tmp_path / 'ok.xlsx'), infer_schema=True)
+    cached = list((tmp_path / 'cache' / 'schemas').iterdir())
+    assert len(cached) == 1
+
+    monkeypatch.setattr(converters, 'EXCEL_MAX_ROWS', 6)
+    for streaming in (False, True):
+        with metrics.recording('csv_to_xlsx') as recorder:
+            with pytest.raises(ValueError, match='shard'):
+                converters.csv_to_xlsx(str(csv), str(tmp_path / 'big.xlsx'), infer_schema=True, streaming=streaming, chunksize=4)
+        assert recorder.events == {'schema_cache_hit': 1}
+    assert cached[0].exists()
+
+
+def test_csv_to_xlsx_schema_file(tmp_path):
+    import json
+    from openpyxl import load_workbook
+    csv = tmp_path / 'dates.csv'
+    pd.DataFrame({'day': ['2024-01-02', '2024-03-04'], 'code': ['007', '012']}).to_csv(csv, index=False)
+    schema = tmp_path / 'schema.json'
+    schema.write_text(json.dumps({'day': 'datetime64[ns]', 'code': 'string'}))
+    out = tmp_path / 'out.xlsx'
+    converters.csv_to_xlsx(str(csv), str(out), schema=str(schema))
+    values = [[c.value for c in r] for r in load_workbook(out).active.iter_rows(min_row=2)]
+    assert [v[1] for v in values] == ['007', '012']
+    assert values[0][0].year == 2024 and values[0][0].month == 1
+
+    with pytest.raises(ValueError):
+        converters.csv_to_xlsx(str(csv), str(out), engine='fast')
+
+
+@pytest.mark.parametrize('options', [{'streaming': True}, {'shard': 'sheets', 'shard_rows': 2}])
+def test_csv_to_xlsx_chunked_reads_keep_the_engine(tmp_path, monkeypatch, options):
+    csv = tmp_path / 'in.csv'
+    pd.DataFrame({'a': range(5)}).to_csv(csv, index=False)
+    engines = []
+    original = pd.read_csv
+
+    def spy(*args, **kwargs):
+        engines.append(kwargs.get('engine'))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', spy)
+    out = tmp_path / 'out.xlsx'
+    converters.csv_to_xlsx(str(csv), str(out), engine='python', chunksize=2, **options)
+    assert engines == ['python']
+    sheet = 'Sheet1' if options.get('streaming') else 'Sheet3'
+    assert pd.read_excel(out, sheet_name=sheet)['a'].tolist()[-1] == 4
+
+
+@pytest.mark.parametrize('options', [{'shard_rows': 0}, {'shard_rows': -5}, {'shard_mb': 0}, {'shard_mb': -1.5}])
+def test_csv_to_xlsx_rejects_non_positive_shard_sizes(tmp_path, options):
+    csv = tmp_path / 'in.csv'
+    pd.DataFrame({'a': range(3)}).to_csv(csv, index=False)
+    with pytest.raises(ValueError, match='shard_'):
+        converters.csv_to_xlsx(str(csv), str(tmp_path / 'out.xlsx'), shard='sheets', **options)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_csv_to_xlsx_shards_files_with_manifest(tmp_path, workers):
+    import json
+    df = pd.DataFrame({'id': range(20), 'name': [f'n{i}' if i % 3 else None for i in range(20)]})
+    csv = tmp_path / 'big.csv'
+    df.to_csv(csv, index=False)
+    out = tmp_path / 'big.xlsx'
+    converters.csv_to_xlsx(str(csv), str(out), chunksize=4, shard='files', shard_rows=7, workers=workers)
+    assert pd.read_excel(out, sheet_name='Index')['File'].tolist() == [f'big_part00{i}.xlsx' for i in (1, 2, 3)]
+    manifest = json.loads((tmp_path / 'big_manifest.json').read_text())
+    assert manifest['rows'] == 20 and manifest['columns'] == ['id', 'name']
+    assert [(s['file'], s['first_row'], s['last_row']) for s in manifest['shards']] == [
+        ('big_part001.xlsx', 1, 7), ('big_part002.xlsx', 8, 14), ('big_part003.xlsx', 15, 20),
+    ]
+    parts = [pd.read_excel(tmp_path / s['file']) for s in manifest['shards']]
+    assert pd.concat(parts, ignore_index=True).equals(df)
+    assert not list(tmp_path.glob('*.shard'))
+
+
+def test_csv_to_xlsx_failed_file_shard_leaves_no_spills(tmp_path):
+    csv = tmp_path / 'big.csv'
+    pd.DataFrame({'id': range(40)}).to_csv(csv, index=False)
+    out = tmp_path / 'big.xlsx'
+    # a folder in the way of the second shard makes its worker fail
+    (tmp_path / 'big_part002.xlsx').mkdir()
+    with pytest.raises(OSError):
+        converters.csv_to_xlsx(str(csv), str(out), chunksize=5, shard='files', shard_rows=5, workers=2)
+    assert not list(tmp_path.glob('*.shard'))
+    assert not out.exists()
+
+
+def test_csv_to_xlsx_shards_sheets_with_index(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+    df = pd.DataFrame({'id': range(10), 'v': [i / 2 for i in range(10)]})
+    csv = tmp_path / 'big.csv'
+    df.to_csv(csv, index=False)
+
+    # without sharding the conversion stops at the first chunk past the sheet limit
+    monkeypatch.setattr(converters, 'EXCEL_MAX_ROWS', 6)
+    for streaming in (False, True):
+        with pytest.raises(ValueError, match='shard'):
+            converters.csv_to_xlsx(str(csv), str(tmp_path / 'x.xlsx'), streaming=streaming, chunksize=3)
+
+    out = tmp_path / 'big.xlsx'
+    converters.csv_to_xlsx(str(csv), str(out), chunksize=3, shard='sheets')
+    wb = load_workbook(out)
+    assert wb.sheetnames == ['Index', 'Sheet1', 'Sheet2']
+    assert [[c.value for c in r] for r in wb['Index'].iter_rows()] == [
+        ['Sheet', 'First row', 'Last row', 'Rows'], ['Sheet1', 1, 5, 5], ['Sheet2', 6, 10, 5],
+    ]
+    sheets = pd.read_excel(out, sheet_name=['Sheet1', 'Sheet2'])
+    assert pd.concat(sheets.values(), ignore_index=True).equals(df)
+
+
+def test_xlsx_to_csv_engines_write_identical_csv(tmp_path, monkeypatch, caplog):
+    import datetime
+    df = pd.DataFrame({
+        'id': [1, 2, 3],
+        'amount': [1.5, None, -2.25],
+        'name': ['a', None, 'c'],
+        'day': [datetime.datetime(2024, 1, d) for d in (1, 2, 3)],
+        'flag': [True, False, True],
+    })
+    xlsx = tmp_path / 'book.xlsx'
+    df.to_excel(xlsx, index=False)
+    converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'openpyxl.csv'), engine='openpyxl')
+
+    monkeypatch.setattr(converters, '_calamine', False)
+    converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'fallback.csv'), engine='calamine')
+    assert 'reading with openpyxl' in caplog.text
+    assert (tmp_path / 'fallback.csv').read_bytes() == (tmp_path / 'openpyxl.csv').read_bytes()
+    with pytest.raises(ValueError):
+        converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'x.csv'), engine='fast')
+
+    monkeypatch.setattr(converters, '_calamine', None)
+    if not converters._calamine_available():
+        pytest.skip('python-calamine is not installed')
+    converters.xlsx_to_csv(str(xlsx), str(tmp_path / 'calamine.csv'), engine='calamine')
+    assert (tmp_path / 'calamine.csv').read_bytes() == (tmp_path / 'openpyxl.csv').read_bytes()
+
+
+def test_xlsx_to_csv_parallel_sheets_match_sequential(tmp_path):
+    xlsx = tmp_path / 'book.xlsx'
+    frames = {f'Sheet {i}': pd.DataFrame({'n': range(i * 10), 'label': [f'r{j}' for j in range(i * 10)]}) for i in range(1, 5)}
+    frames['Sheet_1'] = pd.DataFrame({'n': [-1], 'label': ['clash']})  # same file name as 'Sheet 1'
+    with pd.ExcelWriter(xlsx) as writer:
+        for name, df in frames.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    seq, par = tmp_path / 'seq' / 'book.csv', tmp_path / 'par' / 'book.csv'
+    seq.parent.mkdir()
+    par.parent.mkdir()
+    converters.xlsx_to_csv(str(xlsx), str(seq), all_sheets=True)
+    progress = []
+    converters.xlsx_to_csv(str(xlsx), str(par), all_sheets=True, workers=3, progress=lambda d, t: progress.append((d, t)))
+    assert progress[-1] == (5, 5)
+    assert sorted(os.listdir(par.parent)) == sorted(os.listdir(seq.parent)) and len(os.listdir(seq.parent)) == 5
+    for name in os.listdir(seq.parent):
+        assert (par.parent / name).read_bytes() == (seq.parent / name).read_bytes()
+    paths = converters.sheet_csv_paths(str(par), list(frames))
+    assert pd.read_csv(paths['Sheet_1'])['label'].tolist() == ['clash']
+
+    streamed = tmp_path / 'streamed.csv'
+    converters.xlsx_to_csv(str(xlsx), str(streamed), sheets=['Sheet 4', 'Sheet_1'], streaming=True, workers=2)
+    assert pd.read_csv(converters.sheet_csv_path(str(streamed), 'Sheet 4')).equals(frames['Sheet 4'])
+    assert pd.read_csv(converters.sheet_csv_paths(str(streamed), list(frames))['Sheet_1']).equals(frames['Sheet_1'])
+    assert not os.path.exists(converters.sheet_csv_path(str(streamed), 'Sheet 1'))
+
+    with pytest.raises(ValueError):
+        converters.xlsx_to_csv(str(xlsx), str(streamed), sheets=['Missing'], workers=2)
@@ -0,0 +1,50 @@
+import time
+
+import pandas as pd
+from docify import converters, jobs
+
+
+def slow_conversion(input_file, output_file, progress=None, **options):
+    open(output_file, 'w').close()
+    for done in range(600):
+        progress(done, 600)
+        time.sleep(0.05)
+
+
+def wait_for_result(job, timeout=60):
+    messages = []
+    deadline = time.monotonic() + timeout
+    while job.running and time.monotonic() < deadline:
+        messages += job.poll()
+        time.sleep(0.02)
+    return messages
+
+
+def test_child_conversion_streams_progress_and_result(tmp_path):
+    csv = tmp_path / 'data.csv'
+    pd.DataFrame({'a': range(100)}).to_csv(csv, index=False)
+    job = jobs.ChildConversion(converters.csv_to_xlsx, str(csv), str(tmp_path / 'data.xlsx'))
+    job.start()
+    messages = wait_for_result(job)
+    assert messages[-1] == ('done', None)
+    assert all(m[0] == 'progress' for m in messages[:-1])
+    assert (tmp_path / 'data.xlsx').exists()
+
+    bad = jobs.ChildConversion(converters.csv_to_xlsx, str(tmp_path / 'x.txt'), str(tmp_path / 'x.xlsx'))
+    bad.start()
+    assert wait_for_result(bad)[-1] == ('error', 'Input file must be a .csv file')
+
+
+def test_child_conversion_cancel_kills_process_and_partial_output(tmp_path):
+    out = tmp_path / 'out.docx'
+    job = jobs.ChildConversion(slow_conversion, 'in.pdf', str(out))
+    job.start()
+    deadline = time.monotonic() + 60
+    while not any(m[0] == 'progress' for m in job.poll()) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    t0 = time.monotonic()
+    job.cancel()
+    assert time.monotonic() - t0 < 2
+    assert not job.running and job._proc.exitcode is not None
+    assert not out.exists()
+    assert job.poll() == []
@@ -0,0 +1,51 @@
+import os
+import pandas as pd
+from docify import cli
+from docify.manifest import BatchManifest
+
+
+def make_folder(tmp_path, count=3):
+    for i in range(count):
+        pd.DataFrame({'a': [i, i + 1]}).to_csv(tmp_path / f'f{i}.csv', index=False)
+
+
+def run_batch(monkeypatch, tmp_path, calls):
+    def convert(inp, out, **options):
+        calls.append(os.path.basename(inp))
+        pd.read_csv(inp).to_excel(out, index=False)
+
+    monkeypatch.setattr('builtins.input', lambda prompt='': str(tmp_path))
+    cli.batch_convert('CSV → Excel', '.csv', '.xlsx', convert, incremental=True, streaming=False)
+
+
+def test_incremental_batch_skips_unchanged(tmp_path, monkeypatch):
+    make_folder(tmp_path)
+    calls = []
+    run_batch(monkeypatch, tmp_path, calls)
+    assert sorted(calls) == ['f0.csv', 'f1.csv', 'f2.csv']
+    assert os.path.exists(tmp_path / '.docify-manifest.json')
+
+    calls.clear()
+    run_batch(monkeypatch, tmp_path, calls)
+    assert calls == []
+
+    # content change, removed output and a mere touch
+    pd.DataFrame({'a': [9]}).to_csv(tmp_path / 'f0.csv', index=False)
+    os.unlink(tmp_path / 'f1.xlsx')
+    st = os.stat(tmp_path / 'f2.csv')
+    os.utime(tmp_path / 'f2.csv', ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    run_batch(monkeypatch, tmp_path, calls)
+    assert sorted(calls) == ['f0.csv', 'f1.csv']
+
+
+def test_manifest_options_change_invalidates(tmp_path):
+    make_folder(tmp_path, count=1)
+    inp, out = str(tmp_path / 'f0.csv'), str(tmp_path / 'f0.xlsx')
+    pd.read_csv(inp).to_excel(out, index=False)
+    m = BatchManifest(str(tmp_path))
+    m.record(inp, out, 'csv_to_xlsx', {'streaming': False, 'chunksize': 10})
+    m.save()
+    m = BatchManifest(str(tmp_path))
+    assert m.is_up_to_date(inp, out, 'csv_to_xlsx', {'streaming': False, 'chunksize': 99})
+    assert not m.is_up_to_date(inp, out, 'csv_to_xlsx', {'streaming': True})
+    assert not m.is_up_to_date(inp, out, 'xlsx_to_csv', {'streaming': False})
@@ -0,0 +1,69 @@
+import json
+import pandas as pd
+import pytest
+from docify import cli, converters, metrics
+
+
+def test_exporter_writes_json_lines_and_prometheus(tmp_path):
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv(tmp_path / 'in.csv', index=False)
+    (tmp_path / 'bad.csv').write_text('')
+    exporter = metrics.MetricsExporter(str(tmp_path / 'm.jsonl'), str(tmp_path / 'm.prom'))
+    convert = exporter.wrap(converters.csv_to_xlsx)
+    assert convert.__name__ == 'csv_to_xlsx'
+    convert(str(tmp_path / 'in.csv'), str(tmp_path / 'out.xlsx'), streaming=True)
+    with pytest.raises(Exception):
+        convert(str(tmp_path / 'bad.csv'), str(tmp_path / 'bad.xlsx'))
+    exporter.close()
+
+    ok, failed = [json.loads(line) for line in open(tmp_path / 'm.jsonl')]
+    assert ok['ok'] and not failed['ok'] and failed['error']
+    assert [s['stage'] for s in ok['spans']] == ['stream', 'save']
+    assert ok['bytes_in'] > 0 and ok['bytes_out'] > 0
+    prom = (tmp_path / 'm.prom').read_text()
+    assert 'docify_conversions_total{conversion="csv_to_xlsx",status="ok"} 1' in prom
+    assert 'docify_conversions_total{conversion="csv_to_xlsx",status="error"} 1' in prom
+    assert 'docify_stage_seconds_count{conversion="csv_to_xlsx",stage="stream"} 1' in prom
+
+
+def test_pdf_stages_and_fallbacks_are_recorded(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    from pdf2docx.page.Page import Page
+    pdf = tmp_path / 'pages.pdf'
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1} text', fontsize=12)
+    doc.save(str(pdf))
+    doc.close()
+    original_parse = Page.parse
+
+    def failing_convert(*args, **kwargs):
+        raise RuntimeError('primary failed')
+
+    def flaky_parse(self, **settings):
+        if self.id == 1:
+            raise RuntimeError('bad page')
+        return original_parse(self, **settings)
+
+    monkeypatch.setattr(converters, '_convert_pages', failing_convert)
+    monkeypatch.setattr(Page, 'parse', flaky_parse)
+    with metrics.recording('pdf_to_word') as recorder:
+        converters.pdf_to_word(str(pdf), str(tmp_path / 'out.docx'))
+    stages = [s['stage'] for s in recorder.spans]
+    assert stages[-1] == 'per_page_merge' and 'primary' in stages
+    assert [s['page'] for s in recorder.spans if s['stage'] == 'page_text'] == [2]
+    assert recorder.events == {'route_primary': 1, 'fallback_per_page': 1, 'degraded_pages': 1}
+    assert recorder.notes['preflight']['route'] == 'primary'
+
+
+def test_cli_metrics_flags_cover_parallel_batch(tmp_path, monkeypatch):
+    for i in range(3):
+        pd.DataFrame({'a': [i]}).to_csv(tmp_path / f'f{i}.csv', index=False)
+    monkeypatch.setattr('sys.argv', [
+        'docify', 'csv2xlsx', str(tmp_path), '--jobs', '2',
+        '--metrics', str(tmp_path / 'm.jsonl'), '--metrics-prom', str(tmp_path / 'm.prom'),
+    ])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 0
+    assert len(open(tmp_path / 'm.jsonl').readlines()) == 3
+    assert 'docify_conversions_total{conversion="csv_to_xlsx",status="ok"} 3' in (tmp_path / 'm.prom').read_text()
@@ -0,0 +1,63 @@
+import json
+import os
+import signal
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+from docify import server
+
+
+@pytest.fixture
+def running_server():
+    service = server.ConversionService(workers=1, max_queue=0)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), server.make_handler(service))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+    service.shutdown()
+
+
+def test_server_converts_and_reports(tmp_path, running_server):
+    service, url = running_server
+    csv = tmp_path / 'in.csv'
+    pd.DataFrame({'a': [1, 2]}).to_csv(csv, index=False)
+    out = tmp_path / 'out.xlsx'
+    result = server.request_conversion(url, 'csv2xlsx', str(csv), str(out), {'streaming': True})
+    assert result['ok'] and pd.read_excel(out)['a'].tolist() == [1, 2]
+
+    failed = server.request_conversion(url, 'csv2xlsx', str(tmp_path / 'x.txt'), str(out))
+    assert not failed['ok'] and 'must be a .csv' in failed['error']
+
+    with urllib.request.urlopen(url + '/health') as resp:
+        health = json.loads(resp.read())
+    assert (health['completed'], health['failed'], health['in_flight']) == (1, 1, 0)
+
+
+def test_service_rejects_when_queue_full(tmp_path):
+    service = server.ConversionService(workers=1, max_queue=0)
+    try:
+        assert service._slots.acquire(blocking=False)
+        result = service.submit('csv2xlsx', 'a.csv', 'a.xlsx', {})
+        assert result['busy'] and service.snapshot()['rejected'] == 1
+        service._slots.release()
+        assert not service.submit('nope', 'a', 'b', {})['ok']
+    finally:
+        service.shutdown()
+
+
+def test_service_rebuilds_pool_after_worker_dies(tmp_path, running_server):
+    service, url = running_server
+    os.kill(service.pool.submit(server._ping).result(), signal.SIGKILL)
+    csv = tmp_path / 'in.csv'
+    pd.DataFrame({'a': [1]}).to_csv(csv, index=False)
+    result = server.request_conversion(url, 'csv2xlsx', str(csv), str(tmp_path / 'out.xlsx'))
+    assert result['ok'] and pd.read_excel(tmp_path / 'out.xlsx')['a'].tolist() == [1]
+
+    with urllib.request.urlopen(url + '/health') as resp:
+        health = json.loads(resp.read())
+    assert (health['pool'], health['pool_rebuilds'], health['completed']) == ('ready', 1, 1)